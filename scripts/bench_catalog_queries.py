@@ -0,0 +1,72 @@
+"""Client CPU and latency per request for the hot catalog GETs.
+
+Runs the real app in-process against the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables) with the catalog cache disabled, so
+every request builds, compiles and executes its statements. CPU is this
+process's CPU time (statement construction, compilation, driver and
+response encoding), not the database's.
+
+Compare psycopg prepare thresholds by setting
+LAKEBASE_AGENT_DEMO_DB_PREPARE_THRESHOLD (e.g. "0", "5", or "" to disable
+server-side prepared statements).
+
+Usage:
+
+    uv run python scripts/bench_catalog_queries.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ["LAKEBASE_AGENT_DEMO_CATALOG_CACHE_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+
+from lakebase_agent_demo.backend.app import app  # noqa: E402
+
+PATHS = [
+    "/api/categories",
+    "/api/products?limit=50",
+    "/api/products?limit=50&category_id=1",
+    "/api/products/1",
+    "/api/products:batch?ids=1&ids=2&ids=3",
+    "/api/products/search?q=data",
+]
+
+
+async def _bench(client: httpx.AsyncClient, path: str, requests: int) -> tuple[list[float], float]:
+    timings = []
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return timings, (time.process_time() - cpu_started) / requests
+
+
+async def main(requests: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{'path':40} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'cpu ms':>8}")
+            for path in PATHS:
+                # Warm up pools, statement caches and prepared statements
+                await _bench(client, path, 50)
+                timings, cpu = await _bench(client, path, requests)
+                timings.sort()
+                print(
+                    f"{path:40} {statistics.fmean(timings) * 1000:8.3f}"
+                    f" {timings[len(timings) // 2] * 1000:8.3f}"
+                    f" {timings[int(len(timings) * 0.95)] * 1000:8.3f}"
+                    f" {cpu * 1000:8.3f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per path")
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,128 @@
+"""Concurrent checkouts on a few hot products: throughput, oversell and notifications.
+
+Runs the real app in-process against the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables). Sets the stock of --products products
+to --stock, then has --workers clients POST /api/checkout for random carts
+of them until --checkouts have been attempted, while a separate connection
+LISTENs on the catalog change channel. Reports checkouts per second and
+catalog notifications per successful checkout.
+
+Exits non-zero if any product was oversold (stock went down by more or less
+than the orders reserved, or below zero) or a checkout failed with anything
+but 409. Stock of the products used is left as the run ends.
+
+Usage:
+
+    uv run python scripts/bench_checkout.py [--checkouts 4000] [--workers 32]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+import httpx
+from sqlalchemy import text
+
+from lakebase_agent_demo.backend.app import app
+from lakebase_agent_demo.backend.catalog_cache import CATALOG_CHANNEL, _connect
+
+PRODUCT_IDS = text("SELECT product_id FROM inventory ORDER BY product_id LIMIT :n")
+RESTOCK = text("UPDATE inventory SET quantity = :stock WHERE product_id = ANY(:ids)")
+STOCK = text("SELECT product_id, quantity FROM inventory WHERE product_id = ANY(:ids)")
+LAST_ITEM = text("SELECT coalesce(max(id), 0) FROM order_items")
+RESERVED = text(
+    "SELECT product_id, sum(quantity_reserved) FROM order_items"
+    " WHERE id > :after GROUP BY product_id"
+)
+
+
+async def _count_notifications(counts: dict[str, int], listening: asyncio.Event) -> None:
+    async with await _connect(app.state.config) as connection:
+        await connection.execute(f"LISTEN {CATALOG_CHANNEL}")
+        listening.set()
+        async for notify in connection.notifies():
+            counts["notifications"] += 1
+            counts["ids"] += len(notify.payload.partition(":")[2].split(","))
+
+
+async def main(args: argparse.Namespace) -> int:
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        runtime = app.state.runtime
+        async with runtime.engine.begin() as connection:
+            ids = list((await connection.scalars(PRODUCT_IDS, {"n": args.products})).all())
+            await connection.execute(RESTOCK, {"stock": args.stock, "ids": ids})
+            before = dict((await connection.execute(STOCK, {"ids": ids})).all())
+            after_item = await connection.scalar(LAST_ITEM)
+
+        counts = {"notifications": 0, "ids": 0}
+        listening = asyncio.Event()
+        listener = asyncio.create_task(_count_notifications(counts, listening))
+        await listening.wait()
+        # The restock above was notified per row; count from here on
+        await asyncio.sleep(0.5)
+        counts.update(notifications=0, ids=0)
+
+        statuses: dict[int, int] = {}
+        remaining = args.checkouts
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                cart = [
+                    {"product_id": product_id, "quantity": random.randint(1, 3)}
+                    for product_id in random.sample(ids, random.randint(1, min(4, len(ids))))
+                ]
+                mode = random.choice(["all_or_nothing", "partial"])
+                response = await client.post(
+                    "/api/checkout", json={"items": cart, "mode": mode}
+                )
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(args.workers)))
+            elapsed = time.perf_counter() - started
+            # Let the notifier's last flush arrive
+            await runtime.catalog_notifier.flush()
+            await asyncio.sleep(0.5)
+        listener.cancel()
+
+        async with runtime.engine.connect() as connection:
+            after = dict((await connection.execute(STOCK, {"ids": ids})).all())
+            reserved = dict((await connection.execute(RESERVED, {"after": after_item})).all())
+
+    placed = statuses.get(201, 0)
+    print(
+        f"{args.checkouts} checkouts on {len(ids)} products, {args.workers} workers:"
+        f" {args.checkouts / elapsed:.0f}/s, statuses {dict(sorted(statuses.items()))}"
+    )
+    print(
+        f"  {counts['notifications']} catalog notifications"
+        f" ({counts['notifications'] / max(placed, 1):.3f} per order,"
+        f" {counts['ids']} product ids)"
+    )
+
+    oversold = [
+        product_id
+        for product_id in ids
+        if after[product_id] < 0
+        or before[product_id] - after[product_id] != reserved.get(product_id, 0)
+    ]
+    failed = sum(count for status, count in statuses.items() if status not in (201, 409))
+    if oversold or failed:
+        print(f"FAIL: oversold {oversold}, {failed} failed checkouts")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checkouts", type=int, default=4000)
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--products", type=int, default=5, help="Hot products in the carts")
+    parser.add_argument("--stock", type=int, default=2000, help="Starting stock of each")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,129 @@
+"""Rows per second of POST /api/products/import.
+
+Runs the real app in-process against the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables). Generates a CSV of --rows synthetic
+products (in a scratch "Bench Import" category) and imports it three times:
+
+- insert:    all new products
+- update:    the same products with new prices and stock
+- unchanged: the update file again, so the merge writes nothing
+
+Each run reports two rates: end to end, from the request to the committed
+response, and of the COPY stage alone (reading, validating and streaming
+the file into staging, the import's copy_seconds). Rows that are written
+cost far more than rows streamed: each product insert or update recomputes
+the stored search_vector, updates its GIN index and checks the category
+foreign key, so the insert and update runs are bounded by the products
+table, not by COPY. The scratch products are removed afterwards.
+
+Exits non-zero when the COPY stage of any run is below --min-rows-per-second.
+
+Usage:
+
+    uv run python scripts/bench_import.py [--rows 500000]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import sys
+import time
+
+import httpx
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy import text
+
+from lakebase_agent_demo.backend.app import app
+from lakebase_agent_demo.backend.catalog_import import COLUMNS
+
+CATEGORY = "Bench Import"
+# (label, prices and stock variant of the file)
+RUNS = [("insert", 0), ("update", 1), ("unchanged", 1)]
+DROP_PRODUCTS = [
+    # Per-row catalog notifications are suppressed (migration 008)
+    text("SET LOCAL app.suppress_catalog_notify = on"),
+    text(
+        "DELETE FROM inventory WHERE product_id IN (SELECT p.id FROM products p"
+        " JOIN categories c ON c.id = p.category_id WHERE c.name = :category)"
+    ),
+    text(
+        "DELETE FROM products WHERE category_id IN"
+        " (SELECT id FROM categories WHERE name = :category)"
+    ),
+    text("DELETE FROM categories WHERE name = :category"),
+    text("SELECT pg_notify('catalog_changes', 'bench_import')"),
+]
+
+
+def _catalog_csv(rows: int, run: int) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for i in range(rows):
+        writer.writerow(
+            (
+                CATEGORY,
+                f"Bench Import Product {i:08d}",
+                f"Synthetic product {i}, a description of about average length",
+                f"{(i + run) % 1000}.{i % 100:02d}",
+                f"https://example.com/images/{i}.png" if i % 3 else "",
+                (i * 7 + run) % 500 if i % 10 else "",
+            )
+        )
+    return buffer.getvalue().encode()
+
+
+def _drop(url: str) -> None:
+    engine = create_sync_engine(url)
+    try:
+        with engine.begin() as connection:
+            for statement in DROP_PRODUCTS:
+                connection.execute(statement, {"category": CATEGORY})
+    finally:
+        engine.dispose()
+
+
+async def main(args: argparse.Namespace) -> int:
+    transport = httpx.ASGITransport(app=app)
+    slow = []
+    async with app.router.lifespan_context(app):
+        url = app.state.config.database_url_sync
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=None
+            ) as client:
+                for label, run in RUNS:
+                    body = _catalog_csv(args.rows, run)
+                    started = time.perf_counter()
+                    response = await client.post(
+                        "/api/products/import",
+                        content=body,
+                        headers={"Content-Type": "text/csv"},
+                    )
+                    elapsed = time.perf_counter() - started
+                    response.raise_for_status()
+                    result = response.json()
+                    copy_rate = args.rows / result["copy_seconds"]
+                    print(
+                        f"{label:9} {args.rows} rows ({len(body) / 2**20:.0f} MiB) in"
+                        f" {elapsed:.2f}s: {args.rows / elapsed:,.0f} rows/s, COPY"
+                        f" {copy_rate:,.0f} rows/s  (created {result['products_created']},"
+                        f" updated {result['products_updated']},"
+                        f" inventory {result['inventory_rows']})"
+                    )
+                    if copy_rate < args.min_rows_per_second:
+                        slow.append(label)
+        finally:
+            await asyncio.to_thread(_drop, url)
+    if slow:
+        print(f"FAIL: {', '.join(slow)} COPY below {args.min_rows_per_second:,.0f} rows/s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--min-rows-per-second", type=float, default=100_000)
+    sys.exit(asyncio.run(main(parser.parse_args())))
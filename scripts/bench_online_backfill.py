@@ -0,0 +1,177 @@
+"""Storefront latency while online_migrations.backfill rewrites a large table.
+
+Against the configured database (.env or LAKEBASE_AGENT_DEMO_DB_* variables),
+creates a scratch table (bench_backfill) with --rows rows and runs a
+storefront-like load on it: point reads plus single-row stock updates, as
+checkout does. Latency of that load is recorded in each phase:
+
+- idle:     load only, the baseline
+- batched:  backfill() of a new column, as a migration would run it
+- naive:    (--compare-naive) the same UPDATE as one statement and transaction,
+            which holds every row's lock until it commits
+
+Exits non-zero when the load's p99 during the batched backfill is above
+--max-p99-ms, so it can gate changes to the helpers. The scratch table is
+dropped afterwards.
+
+Usage:
+
+    uv run python scripts/bench_online_backfill.py [--rows 200000] [--compare-naive]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy import text
+
+from lakebase_agent_demo.backend.config import AppConfig
+from lakebase_agent_demo.backend.database import create_engine
+from lakebase_agent_demo.backend.online_migrations import backfill
+
+TABLE = "bench_backfill"
+SETUP = [
+    f"DROP TABLE IF EXISTS {TABLE}",
+    f"""CREATE TABLE {TABLE} (
+        id bigserial PRIMARY KEY,
+        price numeric(10, 2) NOT NULL,
+        quantity integer NOT NULL,
+        price_cents bigint
+    )""",
+    f"""INSERT INTO {TABLE} (price, quantity)
+        SELECT round((random() * 100)::numeric, 2), 1000000
+        FROM generate_series(1, :rows)""",
+    f"ANALYZE {TABLE}",
+]
+ASSIGNMENTS = "price_cents = (price * 100)::bigint"
+PENDING = "price_cents IS NULL"
+READ = text(f"SELECT id, price, quantity FROM {TABLE} WHERE id = :id")
+WRITE = text(f"UPDATE {TABLE} SET quantity = quantity - 1 WHERE id = :id")
+
+
+def _run_backfill(url: str, batch_size: int, pause_seconds: float) -> int:
+    engine = create_sync_engine(url)
+    try:
+        with engine.connect() as connection:
+            with Operations.context(MigrationContext.configure(connection)):
+                return backfill(
+                    "bench_online_backfill",
+                    TABLE,
+                    ASSIGNMENTS,
+                    PENDING,
+                    batch_size=batch_size,
+                    pause_seconds=pause_seconds,
+                )
+    finally:
+        engine.dispose()
+
+
+def _run_naive(url: str) -> None:
+    engine = create_sync_engine(url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(f"UPDATE {TABLE} SET {ASSIGNMENTS} WHERE {PENDING}"))
+    finally:
+        engine.dispose()
+
+
+def _reset(url: str) -> None:
+    engine = create_sync_engine(url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(f"UPDATE {TABLE} SET price_cents = NULL"))
+    finally:
+        engine.dispose()
+
+
+def _p99(timings: list[float]) -> float:
+    return statistics.quantiles(timings, n=100)[98]
+
+
+def _summary(timings: list[float]) -> str:
+    p50 = statistics.median(timings) * 1000
+    return (
+        f"{len(timings):7d} ops  p50 {p50:7.2f} ms  p99 {_p99(timings) * 1000:8.2f} ms"
+        f"  max {max(timings) * 1000:8.2f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> int:
+    config = AppConfig()
+    url = config.database_url_sync
+    setup = create_sync_engine(url)
+    with setup.begin() as connection:
+        for statement in SETUP:
+            connection.execute(text(statement), {"rows": args.rows})
+    setup.dispose()
+
+    engine = create_engine(config)
+    phase = "idle"
+    timings: dict[str, list[float]] = {}
+    stop = asyncio.Event()
+
+    async def storefront() -> None:
+        while not stop.is_set():
+            statement = WRITE if random.random() < args.write_fraction else READ
+            started = time.perf_counter()
+            async with engine.begin() as connection:
+                await connection.execute(statement, {"id": random.randint(1, args.rows)})
+            timings.setdefault(phase, []).append(time.perf_counter() - started)
+
+    workers = [asyncio.create_task(storefront()) for _ in range(args.workers)]
+    try:
+        await asyncio.sleep(args.idle_seconds)
+
+        phase = "batched"
+        started = time.perf_counter()
+        rows = await asyncio.to_thread(
+            _run_backfill, url, args.batch_size, args.pause_seconds
+        )
+        batched_seconds = time.perf_counter() - started
+
+        if args.compare_naive:
+            phase = "reset"
+            await asyncio.to_thread(_reset, url)
+            phase = "naive"
+            started = time.perf_counter()
+            await asyncio.to_thread(_run_naive, url)
+            naive_seconds = time.perf_counter() - started
+    finally:
+        stop.set()
+        await asyncio.gather(*workers)
+        await engine.dispose()
+        cleanup = create_sync_engine(url)
+        with cleanup.begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        cleanup.dispose()
+
+    print(f"{args.rows} rows, {args.workers} workers, {args.write_fraction:.0%} writes")
+    print(f"  idle      {_summary(timings['idle'])}")
+    print(f"  batched   {_summary(timings['batched'])}  ({rows} rows in {batched_seconds:.1f}s)")
+    if args.compare_naive:
+        print(f"  naive     {_summary(timings['naive'])}  (in {naive_seconds:.1f}s)")
+
+    p99_ms = _p99(timings["batched"]) * 1000
+    if p99_ms > args.max_p99_ms:
+        print(f"FAIL: p99 {p99_ms:.1f} ms during the backfill, over {args.max_p99_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause-seconds", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent storefront clients")
+    parser.add_argument("--write-fraction", type=float, default=0.2)
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    parser.add_argument("--max-p99-ms", type=float, default=100.0)
+    parser.add_argument("--compare-naive", action="store_true")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,79 @@
+"""Per-request latency of catalog GETs: transactional vs read-only sessions.
+
+Runs the real app in-process against the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables) with the catalog cache disabled, so
+every request reaches the database, and times the same requests with:
+
+- transactional: get_db_session (BEGIN ... COMMIT around every request)
+- read-only:     get_read_db_session (autocommit, no COMMIT)
+
+Usage:
+
+    uv run python scripts/bench_read_sessions.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ["LAKEBASE_AGENT_DEMO_CATALOG_CACHE_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+
+from lakebase_agent_demo.backend.app import app  # noqa: E402
+from lakebase_agent_demo.backend.dependencies import (  # noqa: E402
+    get_db_session,
+    get_read_db_session,
+)
+
+PATHS = ["/api/categories", "/api/products?limit=50", "/api/products/1"]
+
+
+async def _time_requests(client: httpx.AsyncClient, path: str, requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return timings
+
+
+def _summary(timings: list[float]) -> str:
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1000
+    p95 = timings[int(len(timings) * 0.95)] * 1000
+    return f"mean {statistics.fmean(timings) * 1000:6.3f} ms  p50 {p50:6.3f} ms  p95 {p95:6.3f} ms"
+
+
+async def main(requests: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in PATHS:
+                # Warm up pools and statement caches for both modes
+                for override in (get_db_session, None):
+                    app.dependency_overrides[get_read_db_session] = override or get_read_db_session
+                    await _time_requests(client, path, 50)
+
+                app.dependency_overrides[get_read_db_session] = get_db_session
+                transactional = await _time_requests(client, path, requests)
+                app.dependency_overrides.clear()
+                read_only = await _time_requests(client, path, requests)
+
+                saved = statistics.fmean(transactional) - statistics.fmean(read_only)
+                print(path)
+                print(f"  transactional  {_summary(transactional)}")
+                print(f"  read-only      {_summary(read_only)}")
+                print(
+                    f"  saved          {saved * 1000:6.3f} ms per request "
+                    f"({saved / statistics.fmean(transactional):.0%})"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per path and mode")
+    asyncio.run(main(parser.parse_args().requests))
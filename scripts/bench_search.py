@@ -0,0 +1,172 @@
+"""Latency of /api/products/search as the catalog grows.
+
+Runs the real app in-process against the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables) with the catalog cache disabled. The
+catalog is grown in steps to each of --sizes products by adding synthetic
+products (in a scratch "Bench Search" category, removed afterwards), and
+at each size the same searches are timed:
+
+- rare:   terms only the seeded catalog uses, so the matches stay the same
+          as the catalog grows; the GIN index lookup should keep this flat
+- common: a term in 1% of the synthetic products, so the matches grow with
+          the catalog; ranking scores every match, so this grows with them
+
+Usage:
+
+    uv run python scripts/bench_search.py [--sizes 10000,100000,1000000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ["LAKEBASE_AGENT_DEMO_CATALOG_CACHE_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine as create_sync_engine  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from lakebase_agent_demo.backend.app import app  # noqa: E402
+
+CATEGORY = "Bench Search"
+SEARCHES = {
+    "rare": ["premium", "bricks", "lake"],
+    "common": ["benchmarkable"],
+}
+# Synthetic names and descriptions draw on these; none match the searches
+# above except "benchmarkable", put in 1% of the rows
+WORDS = [
+    "amber", "basalt", "cobalt", "delta", "ember", "fjord", "granite", "harbor",
+    "indigo", "juniper", "kestrel", "lantern", "meadow", "nimbus", "obsidian",
+    "prairie", "quartz", "river", "sierra", "tundra", "umber", "valley", "willow",
+    "xenon", "yarrow", "zephyr",
+]
+
+CREATE_CATEGORY = text(
+    "INSERT INTO categories (name, description) VALUES (:name, 'Synthetic products')"
+    " ON CONFLICT (name) DO UPDATE SET description = excluded.description RETURNING id"
+)
+COUNT = text("SELECT count(*) FROM products")
+# As the search endpoint matches (queries.py); its approximate_total is the
+# planner's estimate
+MATCHES = text(
+    "SELECT count(*) FROM products"
+    " WHERE search_vector @@ websearch_to_tsquery('english', :q)"
+)
+# Per-row catalog notifications are suppressed (migration 008), as a bulk
+# import would
+SUPPRESS_NOTIFY = text("SET LOCAL app.suppress_catalog_notify = on")
+ADD_PRODUCTS = text(
+    """
+    INSERT INTO products (name, description, price, category_id)
+    SELECT
+        initcap(w[1 + i % 26] || ' ' || w[1 + (i / 26) % 26]),
+        w[1 + (i / 7) % 26] || ' ' || w[1 + (i / 11) % 26] || ' ' || w[1 + (i / 13) % 26]
+            || CASE WHEN i % 100 = 0 THEN ' benchmarkable' ELSE '' END,
+        (1 + i % 500)::numeric,
+        :category_id
+    FROM generate_series(CAST(:first AS integer), CAST(:last AS integer)) AS i,
+        (SELECT CAST(:words AS text[]) AS w) AS words
+    """
+)
+DROP_PRODUCTS = [
+    text(
+        "DELETE FROM inventory WHERE product_id IN"
+        " (SELECT id FROM products WHERE category_id = :category_id)"
+    ),
+    text("DELETE FROM products WHERE category_id = :category_id"),
+    text("DELETE FROM categories WHERE id = :category_id"),
+]
+
+
+def _grow_to(url: str, category_id: int, size: int) -> int:
+    engine = create_sync_engine(url)
+    try:
+        with engine.begin() as connection:
+            current = connection.scalar(COUNT)
+            if current < size:
+                connection.execute(SUPPRESS_NOTIFY)
+                connection.execute(
+                    ADD_PRODUCTS,
+                    {
+                        "category_id": category_id,
+                        "first": current,
+                        "last": size - 1,
+                        "words": WORDS,
+                    },
+                )
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("ANALYZE products"))
+            return connection.scalar(COUNT)
+    finally:
+        engine.dispose()
+
+
+def _matches(url: str, q: str) -> int:
+    engine = create_sync_engine(url)
+    try:
+        with engine.connect() as connection:
+            return connection.scalar(MATCHES, {"q": q})
+    finally:
+        engine.dispose()
+
+
+def _drop(url: str, category_id: int) -> None:
+    engine = create_sync_engine(url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(SUPPRESS_NOTIFY)
+            for statement in DROP_PRODUCTS:
+                connection.execute(statement, {"category_id": category_id})
+            connection.execute(text("SELECT pg_notify('catalog_changes', 'bench_search')"))
+    finally:
+        engine.dispose()
+
+
+async def _time_search(client: httpx.AsyncClient, q: str, requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/api/products/search", params={"q": q, "limit": 20})
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return timings
+
+
+async def main(args: argparse.Namespace) -> None:
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        url = app.state.config.database_url_sync
+        setup = create_sync_engine(url)
+        with setup.begin() as connection:
+            category_id = connection.scalar(CREATE_CATEGORY, {"name": CATEGORY})
+        setup.dispose()
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                print(f"{'products':>10} {'search':8} {'q':14} {'matches':>8} {'p50 ms':>8} {'p95 ms':>8}")
+                for size in sizes:
+                    products = await asyncio.to_thread(_grow_to, url, category_id, size)
+                    for kind, queries in SEARCHES.items():
+                        for q in queries:
+                            await _time_search(client, q, 10)
+                            timings = sorted(await _time_search(client, q, args.requests))
+                            matches = await asyncio.to_thread(_matches, url, q)
+                            print(
+                                f"{products:>10} {kind:8} {q:14} {matches:>8}"
+                                f" {statistics.median(timings) * 1000:8.2f}"
+                                f" {timings[int(len(timings) * 0.95)] * 1000:8.2f}"
+                            )
+        finally:
+            await asyncio.to_thread(_drop, url, category_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="10000,100000,1000000", help="Comma-separated catalog sizes"
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Requests per search")
+    asyncio.run(main(parser.parse_args()))
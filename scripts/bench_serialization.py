@@ -0,0 +1,116 @@
+"""Encoding a product page: response models vs the serialization.py fast path.
+
+A CPU micro-benchmark; no database is needed. Builds --sizes synthetic
+product list rows (real SQLAlchemy Row objects, shaped like the list query's)
+and times encoding them as one ProductPageOut body two ways:
+
+- models:    a ProductListOut per row and a ProductPageOut, then FastAPI's
+             response_model validation and serialization (serialize_response,
+             with the same dump_json fast path FastAPI takes for getProducts)
+- fast path: serialization.encode_product_page, straight from the rows
+
+Both must produce the same bytes. Reports the best of --repeat runs.
+
+Usage:
+
+    uv run python scripts/bench_serialization.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from decimal import Decimal
+
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import Row
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from lakebase_agent_demo.backend.models import ProductListOut, ProductPageOut
+from lakebase_agent_demo.backend.router import api
+from lakebase_agent_demo.backend.serialization import encode_product_page
+
+NEXT_CURSOR = "eyJpZCI6MTIzfQ"
+
+
+def _rows(count: int) -> list[Row]:
+    keys = list(ProductListOut.model_fields)
+    values = (
+        (
+            i,
+            f"Product {i}",
+            f"Description of product {i}, with a few more words in it",
+            Decimal(f"{i % 500}.99"),
+            f"https://example.com/images/{i}.png" if i % 3 else None,
+            1 + i % 4,
+            f"Category {1 + i % 4}",
+            i % 100 if i % 7 else None,
+        )
+        for i in range(count)
+    )
+    return IteratorResult(SimpleResultMetaData(keys), values).all()
+
+
+def _response_field():
+    for route in api.routes:
+        if isinstance(route, APIRoute) and route.operation_id == "getProducts":
+            return route.response_field
+    raise LookupError("getProducts route not found")
+
+
+async def _encode_with_models(rows: list[Row], field) -> bytes:
+    page = ProductPageOut(
+        items=[
+            ProductListOut(
+                id=row.id,
+                name=row.name,
+                description=row.description,
+                price=row.price,
+                image_url=row.image_url,
+                category_id=row.category_id,
+                category_name=row.category_name,
+                quantity=row.quantity,
+            )
+            for row in rows
+        ],
+        next_cursor=NEXT_CURSOR,
+        approximate_total=len(rows),
+    )
+    return await serialize_response(field=field, response_content=page, dump_json=True)
+
+
+async def _encode_fast(rows: list[Row], field) -> bytes:
+    return encode_product_page(rows, NEXT_CURSOR, len(rows))
+
+
+async def _best_of(encode, rows: list[Row], field, repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await encode(rows, field)
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+async def main(args: argparse.Namespace) -> int:
+    field = _response_field()
+    print(f"{'rows':>8} {'models ms':>10} {'fast ms':>10} {'speedup':>8} {'bytes':>10}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        rows = _rows(size)
+        models, expected = await _best_of(_encode_with_models, rows, field, args.repeat)
+        fast, body = await _best_of(_encode_fast, rows, field, args.repeat)
+        if body != expected:
+            print(f"FAIL: {size} rows: fast path output differs from the models'")
+            return 1
+        print(
+            f"{size:>8} {models * 1000:10.2f} {fast * 1000:10.2f}"
+            f" {models / fast:7.1f}x {len(body):>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated row counts")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size; the best is reported")
+    sys.exit(asyncio.run(main(parser.parse_args())))
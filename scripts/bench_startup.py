@@ -0,0 +1,113 @@
+"""Cold start: import time of the app, and time to its first response.
+
+Each run is a fresh interpreter, so nothing is cached in-process:
+
+- import: `python -X importtime -c "import <app>"`, the app's cumulative
+  import time and the slowest top-level imports it pulls in
+- first request: wall time from launching a process to its first
+  /api/categories response, through the real lifespan (migration check,
+  pool, warm-up) against the configured database (.env or
+  LAKEBASE_AGENT_DEMO_DB_* variables)
+
+With --max-import-ms, exits non-zero when the median import time is over
+budget, so a heavy import slipping back into the startup path is caught.
+
+Usage:
+
+    uv run python scripts/bench_startup.py [--runs 5] [--max-import-ms 1000]
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+APP_MODULE = "lakebase_agent_demo.backend.app"
+
+# Run in the child: everything from interpreter start to the first response
+FIRST_REQUEST = f"""
+import asyncio, time
+started = time.perf_counter()
+import httpx
+from {APP_MODULE} import app
+imported = time.perf_counter()
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        lifespan = time.perf_counter()
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get("/api/categories")).raise_for_status()
+        done = time.perf_counter()
+    print(imported - started, lifespan - imported, done - lifespan)
+
+asyncio.run(main())
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def _import_times() -> tuple[float, list[tuple[float, str]]]:
+    """The app's cumulative import time, and the slowest top-level packages it imports, in ms."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {APP_MODULE}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    top_level = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative, module = int(match[2]) / 1000, match[3]
+        if module == APP_MODULE:
+            total = cumulative
+        elif "." not in module:
+            top_level.append((cumulative, module))
+    return total, sorted(top_level, reverse=True)[:8]
+
+
+def _first_request() -> tuple[float, float, float, float]:
+    """Process wall time to first response, and its import/lifespan/request parts."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST], capture_output=True, text=True, check=True
+    )
+    wall = time.perf_counter() - started
+    imported, lifespan, request = map(float, result.stdout.split())
+    return wall, imported, lifespan, request
+
+
+def main(runs: int, max_import_ms: float | None) -> int:
+    imports = []
+    for _ in range(runs):
+        total, top_level = _import_times()
+        imports.append(total)
+    import_ms = statistics.median(imports)
+    print(f"import {APP_MODULE}: median {import_ms:.0f} ms over {runs} runs")
+    for cumulative, module in top_level:
+        print(f"  {module:30} {cumulative:8.1f} ms")
+
+    samples = [_first_request() for _ in range(runs)]
+    print("time to first response (median ms):")
+    for label, column in zip(
+        ("process wall", "app import", "lifespan", "first request"), zip(*samples)
+    ):
+        print(f"  {label:30} {statistics.median(column) * 1000:8.1f}")
+
+    if max_import_ms is not None and import_ms > max_import_ms:
+        print(f"FAIL: import takes {import_ms:.0f} ms, over the {max_import_ms:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--max-import-ms", type=float, help="Fail above this median import time")
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.max_import_ms))
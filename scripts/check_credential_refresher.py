@@ -0,0 +1,176 @@
+"""Check that database connections survive a token provider that hangs or fails.
+
+Opens connections to the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables) through database.create_engine with
+OAuth mode switched on, but with the CredentialRefresher minting short-lived
+tokens from a fake provider instead of the workspace. The password each new
+connection is given is recorded (and swapped for the real one, since the
+local database doesn't know the fake tokens). Checks that:
+
+1. while a renewal is blocked in the provider, new connections open at once
+   with the last good token, and pick up the new one once it returns
+2. while renewals raise, new connections keep the last good token, the
+   refresher backs off, and it recovers when the provider does
+3. once the last good token has expired, a connection fails with the
+   provider's error rather than using it
+
+Exits non-zero on the first failure.
+
+Usage:
+
+    uv run python scripts/check_credential_refresher.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from sqlalchemy import event, text
+
+from lakebase_agent_demo.backend import lakebase_credentials
+from lakebase_agent_demo.backend.config import AppConfig
+from lakebase_agent_demo.backend.database import create_engine
+from lakebase_agent_demo.backend.lakebase_credentials import (
+    CredentialRefresher,
+    DatabaseToken,
+)
+
+TOKEN_LIFETIME_SECONDS = 2.0
+# Well under the time to the next renewal, so any wait on the provider shows
+MAX_CONNECT_SECONDS = 0.5
+
+
+class FakeProvider:
+    """Mints token-1, token-2, ...; can be made to block or raise."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.minted = 0
+        self.failing = False
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+        self.blocked = threading.Event()
+
+    def __call__(self) -> DatabaseToken:
+        self.calls += 1
+        if not self.unblocked.is_set():
+            self.blocked.set()
+            self.unblocked.wait()
+        if self.failing:
+            raise ConnectionError("workspace unreachable")
+        self.minted += 1
+        return DatabaseToken(
+            f"token-{self.minted}", time.time() + TOKEN_LIFETIME_SECONDS
+        )
+
+
+class Failed(Exception):
+    pass
+
+
+def _expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise Failed(message)
+    print(f"ok: {message}")
+
+
+async def _wait_for(condition, timeout: float) -> bool:
+    give_up_at = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= give_up_at:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+async def main() -> int:
+    config = AppConfig()
+    # OAuth mode is decided per engine; the config above keeps the real user
+    os.environ.setdefault("DATABRICKS_CLIENT_ID", "check-client")
+    os.environ.setdefault("DATABRICKS_CLIENT_SECRET", "check-secret")
+    provider = FakeProvider()
+    refresher = CredentialRefresher(
+        provider, jitter_fraction=0, refresh_fraction=0.5, min_backoff=0.2, max_backoff=0.4
+    )
+    lakebase_credentials._refresher = refresher
+
+    engine = create_engine(config)
+    passwords: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def record_password(dialect, conn_rec, cargs, cparams) -> None:
+        passwords.append(cparams["password"])
+        cparams["password"] = config.db_password
+
+    async def connect() -> tuple[str, float]:
+        """A new connection (not from the pool): the password it got, and how long it took."""
+        await engine.dispose()
+        started = time.perf_counter()
+        async with engine.connect() as connection:
+            await connection.scalar(text("SELECT 1"))
+        return passwords[-1], time.perf_counter() - started
+
+    try:
+        password, _ = await connect()
+        _expect(password == "token-1", f"first connection uses {password}")
+
+        # 1. The renewal hangs in the provider
+        provider.unblocked.clear()
+        _expect(
+            await _wait_for(provider.blocked.is_set, TOKEN_LIFETIME_SECONDS),
+            "renewal started and is blocked in the provider",
+        )
+        password, seconds = await connect()
+        _expect(
+            password == "token-1" and seconds < MAX_CONNECT_SECONDS,
+            f"connection during the blocked renewal uses {password} ({seconds * 1000:.0f} ms)",
+        )
+        provider.unblocked.set()
+        await _wait_for(lambda: provider.minted == 2, 1.0)
+        password, _ = await connect()
+        _expect(password == "token-2", f"connection after the renewal returned uses {password}")
+
+        # 2. Renewals raise
+        provider.failing = True
+        failures_before = refresher.failures
+        _expect(
+            await _wait_for(
+                lambda: refresher.failures >= failures_before + 2, TOKEN_LIFETIME_SECONDS
+            ),
+            f"renewals fail and are retried ({refresher.failures - failures_before} failures)",
+        )
+        password, seconds = await connect()
+        _expect(
+            password == "token-2" and seconds < MAX_CONNECT_SECONDS,
+            f"connection while renewals fail uses {password} ({seconds * 1000:.0f} ms)",
+        )
+        provider.failing = False
+        _expect(
+            await _wait_for(lambda: provider.minted == 3, refresher.max_backoff + 0.5),
+            "refresher recovers once the provider does",
+        )
+        password, _ = await connect()
+        _expect(password == "token-3", f"connection after recovery uses {password}")
+
+        # 3. Renewals keep failing until the last good token expires
+        provider.failing = True
+        await asyncio.sleep(TOKEN_LIFETIME_SECONDS)
+        try:
+            password, _ = await connect()
+        except ConnectionError as e:
+            _expect(True, f"connection with only an expired token fails: {e}")
+        else:
+            _expect(False, f"connection with only an expired token used {password}")
+    except Failed as e:
+        print(f"FAIL: {e}")
+        return 1
+    finally:
+        refresher.stop()
+        await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
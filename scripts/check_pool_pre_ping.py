@@ -0,0 +1,80 @@
+"""Check that idle pre-ping leaves connections usable by autocommit read sessions.
+
+Runs the real app in-process against the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables) with db_pool_pre_ping="idle" and an idle
+threshold of 0, so every reused connection is pinged before checkout, and
+the catalog cache off, so every request reaches the database:
+
+1. the catalog GETs (read sessions, autocommit) succeed on pinged connections
+2. after the server terminates the pool's connections, the next requests
+   still succeed, and the pool counts the stale connections it dropped
+
+Exits non-zero on the first failure.
+
+Usage:
+
+    uv run python scripts/check_pool_pre_ping.py
+"""
+
+import asyncio
+import os
+import sys
+
+os.environ["LAKEBASE_AGENT_DEMO_CATALOG_CACHE_ENABLED"] = "false"
+os.environ["LAKEBASE_AGENT_DEMO_DB_POOL_PRE_PING"] = "idle"
+os.environ["LAKEBASE_AGENT_DEMO_DB_POOL_PRE_PING_IDLE_SECONDS"] = "0"
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from lakebase_agent_demo.backend.app import app  # noqa: E402
+
+PATHS = ["/api/categories", "/api/products?limit=5", "/api/products/1"]
+
+TERMINATE_OTHERS = text(
+    "SELECT count(pg_terminate_backend(pid)) FROM pg_stat_activity"
+    " WHERE datname = current_database() AND pid <> pg_backend_pid()"
+    " AND backend_type = 'client backend'"
+)
+
+
+async def _get_all(client: httpx.AsyncClient, rounds: int) -> list[str]:
+    failures = []
+    for _ in range(rounds):
+        for path in PATHS:
+            response = await client.get(path)
+            if response.status_code != 200:
+                failures.append(f"{path}: {response.status_code} {response.text[:200]}")
+    return failures
+
+
+async def main() -> int:
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            # Several rounds, so pooled connections are reused (and pinged)
+            failures = await _get_all(client, 5)
+            pings = sum(pool["pre_pings"] for pool in (await client.get("/api/metrics/pools")).json())
+            if failures or not pings:
+                print("FAIL: requests on pinged connections", *failures, sep="\n  ")
+                return 1
+            print(f"ok: {len(PATHS) * 5} requests on pinged connections ({pings} pings)")
+
+            admin = create_engine(app.state.config.database_url_sync)
+            with admin.connect() as connection:
+                terminated = connection.scalar(TERMINATE_OTHERS)
+            admin.dispose()
+
+            failures = await _get_all(client, 2)
+            stale = sum(
+                pool["stale_connections"] for pool in (await client.get("/api/metrics/pools")).json()
+            )
+            if failures or not stale:
+                print(f"FAIL: after terminating {terminated} connections", *failures, sep="\n  ")
+                return 1
+            print(f"ok: {terminated} terminated connections detected by ping ({stale} dropped)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,78 @@
+"""Check that paging through /api/products/search visits every match exactly once.
+
+Runs the real app in-process against the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables) with the catalog cache off. For each
+query, pages through the results with small page sizes, following
+next_cursor, and compares with one unpaged request: the same ids, in the
+same order, with no repeats. Several seeded products tie on rank for these
+queries, so the (rank, id) cursor has to compare ranks exactly.
+
+Exits non-zero on the first mismatch.
+
+Usage:
+
+    uv run python scripts/check_search_pagination.py [--q data --q bricks ...]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+os.environ["LAKEBASE_AGENT_DEMO_CATALOG_CACHE_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+
+from lakebase_agent_demo.backend.app import app  # noqa: E402
+
+QUERIES = ["data", "bricks", "dataset", "premium", "lake"]
+PAGE_SIZES = [1, 2, 3]
+MAX_PAGES = 1000
+
+
+async def _paged_ids(
+    client: httpx.AsyncClient, q: str, limit: int, category_id: int | None
+) -> list[int]:
+    params: dict[str, str | int] = {"q": q, "limit": limit}
+    if category_id is not None:
+        params["category_id"] = category_id
+    ids: list[int] = []
+    for _ in range(MAX_PAGES):
+        page = (await client.get("/api/products/search", params=params)).raise_for_status().json()
+        ids.extend(item["id"] for item in page["items"])
+        if page["next_cursor"] is None:
+            return ids
+        params["after"] = page["next_cursor"]
+    raise AssertionError(f"q={q!r} limit={limit}: still paging after {MAX_PAGES} pages")
+
+
+async def main(queries: list[str]) -> int:
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            categories = [c["id"] for c in (await client.get("/api/categories")).json()]
+            for q in queries:
+                total = len(await _paged_ids(client, q, 200, None))
+                for category_id in [None, *categories]:
+                    expected = await _paged_ids(client, q, 200, category_id)
+                    for limit in PAGE_SIZES:
+                        try:
+                            ids = await _paged_ids(client, q, limit, category_id)
+                        except AssertionError as e:
+                            ids = None
+                            problem = str(e)
+                        else:
+                            problem = f"got {ids}, expected {expected}"
+                        if ids != expected:
+                            failures += 1
+                            print(f"FAIL q={q!r} category_id={category_id} limit={limit}: {problem}")
+                print(f"checked q={q!r}: {total} matches overall")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--q", action="append", help="Search text (repeatable)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.q or QUERIES)))
@@ -0,0 +1,99 @@
+"""Check that catalog endpoints stay within their SQL statement budgets.
+
+Runs the real app in-process against the configured database (.env or
+LAKEBASE_AGENT_DEMO_DB_* variables) and counts the statements each request
+runs with statement_count.count_statements. Requests run twice: with the
+catalog cache off, where every request reaches the database, and with it
+on and warm, where a repeat request should run none. Conditional requests
+whose ETag still matches should cost only the version token.
+
+A new N+1 (a lazy load per row, a query per category) shows up as a count
+over budget. Exits non-zero if any request is over budget.
+
+Usage:
+
+    uv run python scripts/check_statement_budget.py
+"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+
+from lakebase_agent_demo.backend.app import app
+from lakebase_agent_demo.backend.statement_count import count_statements
+
+# (path, statements with the cache off), whatever the page size or includes.
+# Product pages are the ETag version token, the page and its approximate
+# total; a product is the version token and the row with its relations.
+BUDGETS = [
+    ("/api/categories", 1),
+    ("/api/categories?include=products", 2),
+    ("/api/products", 3),
+    ("/api/products?limit=100", 3),
+    ("/api/products?category_id=1&limit=100", 3),
+    ("/api/products?fields=id,name,price", 3),
+    ("/api/products/1", 2),
+    ("/api/products/1?include=category&include=inventory", 2),
+]
+# An If-None-Match that still matches skips the data query
+NOT_MODIFIED_BUDGET = 1
+
+
+async def _count(client: httpx.AsyncClient, path: str, **kw) -> tuple[httpx.Response, int]:
+    with count_statements() as statements:
+        response = await client.get(path, **kw)
+    return response, statements.count
+
+
+async def _check(cache_enabled: bool) -> list[str]:
+    # Read when the app starts, so each mode gets its own lifespan
+    os.environ["LAKEBASE_AGENT_DEMO_CATALOG_CACHE_ENABLED"] = str(cache_enabled).lower()
+    failures = []
+    mode = "cache on" if cache_enabled else "cache off"
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            while (await client.get("/api/ready")).status_code != 200:
+                await asyncio.sleep(0.1)
+            # The catalog listener clears the cache when it connects
+            await asyncio.sleep(1)
+            for path, budget in BUDGETS:
+                # Warm pools and, with the cache on, the cache itself
+                first, _ = await _count(client, path)
+                first.raise_for_status()
+                response, count = await _count(client, path)
+                expected = 0 if cache_enabled else budget
+                line = f"{mode:9}  {path:55} {count} statement(s), budget {expected}"
+                if count > expected:
+                    failures.append(line)
+                    print(f"FAIL {line}")
+                else:
+                    print(f"ok   {line}")
+
+                etag = response.headers.get("etag")
+                if etag and not cache_enabled:
+                    response, count = await _count(
+                        client, path, headers={"If-None-Match": etag}
+                    )
+                    line = (
+                        f"{mode:9}  {path + ' (304)':55} {count} statement(s),"
+                        f" budget {NOT_MODIFIED_BUDGET}"
+                    )
+                    if response.status_code != 304 or count > NOT_MODIFIED_BUDGET:
+                        failures.append(line)
+                        print(f"FAIL {line} [{response.status_code}]")
+                    else:
+                        print(f"ok   {line}")
+    return failures
+
+
+async def main() -> int:
+    failures = await _check(cache_enabled=False)
+    failures += await _check(cache_enabled=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,46 +1,36 @@
 from contextlib import asynccontextmanager
-from importlib import resources
 
-from alembic import command
-from alembic.config import Config
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from .._metadata import app_name, app_slug, dist_dir
+from .._metadata import app_name, dist_dir
 from .config import AppConfig
+from .deadlines import DeadlineMiddleware
+from .migrate import migrate
 from .router import api
 from .runtime import Runtime
+from .statement_count import StatementCountMiddleware
 from .utils import add_not_found_handler
 from .logger import logger
 
 
-def _run_migrations(config: AppConfig) -> None:
-    """Run Alembic migrations to head when DB is configured."""
-    if not config.database_url_sync:
-        return
-    script_location = str(
-        resources.files(app_slug).joinpath("backend", "migrations")
-    )
-    alembic_cfg = Config()
-    alembic_cfg.set_main_option("script_location", script_location)
-    try:
-        command.upgrade(alembic_cfg, "head")
-        logger.info("Alembic migrations applied successfully")
-    except Exception as e:
-        logger.exception("Alembic upgrade failed: %s", e)
-        raise
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize config and runtime, store in app.state for dependency injection
     config = AppConfig()
     logger.info(f"Starting app with configuration:\n{config}")
 
-    _run_migrations(config)
-
     runtime = Runtime(config)
     runtime.init_database()
+    # Uses the pool to check the schema version, so after init_database
+    if runtime.engine is not None and config.run_migrations_on_startup:
+        await migrate(config, runtime.engine)
+    # Warm-up runs in the background: /api/ready stays 503 until it's done
+    runtime.start_prewarm()
+    runtime.start_catalog_listener()
+    runtime.start_catalog_notifier()
+    runtime.start_replica_monitor()
+    runtime.start_inventory_ingest()
 
     # Store in app.state for access via dependencies
     app.state.config = config
@@ -49,10 +39,21 @@ async def lifespan(app: FastAPI):
     yield
 
     # Cleanup
+    await runtime.stop_prewarm()
+    await runtime.stop_inventory_ingest()
+    await runtime.stop_catalog_notifier()
+    await runtime.stop_replica_monitor()
+    await runtime.stop_catalog_listener()
     await runtime.close_database()
 
 
 app = FastAPI(title=f"{app_name}", lifespan=lifespan)
+
+
+app.add_middleware(StatementCountMiddleware)
+# Added last, so it wraps everything: deadlines count from the first byte in
+app.add_middleware(DeadlineMiddleware, routes=api.routes)
+
 ui = StaticFiles(directory=dist_dir, html=True)
 
 # note the order of includes and mounts!
@@ -0,0 +1,182 @@
+"""In-process TTL + LRU cache with tag-based invalidation."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    expires_at: float
+    tags: frozenset[str] = field(default_factory=frozenset)
+
+
+class TTLCache:
+    """
+    Bounded cache where entries expire after `ttl` seconds and the least
+    recently used entry is evicted once `maxsize` is reached.
+
+    Entries can carry tags so that groups of keys can be evicted together
+    (e.g. every cached product list when any product changes).
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._keys_by_tag: dict[str, set[Hashable]] = {}
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+        # So that a load which raced with an invalidation of one of its own
+        # tags isn't cached: per tag, the loads in flight carrying it and how
+        # often it has been invalidated since the first of them started. Only
+        # tags being loaded are tracked, so this stays as small as _inflight.
+        self._loading_tags: dict[str, int] = {}
+        self._tag_generations: dict[str, int] = {}
+        # Bumped by clear(), which invalidates every load
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(value, self._clock() + self.ttl, frozenset(tags))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def invalidate(self, *tags: str) -> int:
+        """Evict every entry carrying any of the given tags. Returns the count evicted."""
+        keys = set()
+        for tag in tags:
+            keys |= self._keys_by_tag.get(tag, set())
+        for key in keys:
+            self._remove(key)
+        for tag in tags:
+            if tag in self._loading_tags:
+                self._tag_generations[tag] = self._tag_generations.get(tag, 0) + 1
+        return len(keys)
+
+    def clear(self) -> None:
+        """Evict everything."""
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._generation += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Read-through lookup: return the cached value or await `load()` and cache it.
+
+        Concurrent misses for the same key share a single `load()` call. A
+        value is returned but not cached if one of its tags was invalidated
+        (or the cache cleared) while it loaded, since it may predate the change.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The request doing the load was cancelled, not us: load it ourselves
+                return await self.get_or_load(key, load, tags)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        tags = frozenset(tags)
+        started = self._start_load(tags)
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved so an unawaited future doesn't warn
+            future.exception()
+            raise
+        else:
+            if self._load_is_current(tags, started):
+                self.set(key, value, tags)
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+            self._end_load(tags)
+
+    def _start_load(self, tags: frozenset[str]) -> tuple[int, dict[str, int]]:
+        for tag in tags:
+            self._loading_tags[tag] = self._loading_tags.get(tag, 0) + 1
+        return self._generation, {tag: self._tag_generations.get(tag, 0) for tag in tags}
+
+    def _load_is_current(
+        self, tags: frozenset[str], started: tuple[int, dict[str, int]]
+    ) -> bool:
+        generation, tag_generations = started
+        return generation == self._generation and all(
+            self._tag_generations.get(tag, 0) == tag_generations[tag] for tag in tags
+        )
+
+    def _end_load(self, tags: frozenset[str]) -> None:
+        for tag in tags:
+            remaining = self._loading_tags[tag] - 1
+            if remaining:
+                self._loading_tags[tag] = remaining
+            else:
+                del self._loading_tags[tag]
+                self._tag_generations.pop(tag, None)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
@@ -0,0 +1,254 @@
+"""Catalog read cache invalidated by Postgres LISTEN/NOTIFY.
+
+Migration 004 installs triggers on categories, products and inventory that
+`pg_notify` the CATALOG_CHANNEL with a `<table>:<id>` payload. A background
+listener evicts the cache entries affected by each change, so the TTL only
+matters if notifications are lost.
+
+Hot write paths (checkout, the inventory feed) suppress the per-row
+notifications (see migration 008) and report the rows they changed to a
+CatalogChangeNotifier instead, which sends them as `<table>:<id>,<id>,...`
+a few times a second. Every NOTIFY takes a database-wide lock at commit and
+wakes every listener, so one per checkout would serialize checkouts on it.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Iterable
+
+import psycopg
+from psycopg.conninfo import make_conninfo
+from sqlalchemy import ARRAY, Text, bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .cache import TTLCache
+from .config import AppConfig
+from .lakebase_credentials import _is_oauth_mode, get_password_for_connection
+from .logger import logger
+
+CATALOG_CHANNEL = "catalog_changes"
+
+# Cache tags
+CATEGORIES_TAG = "categories"
+PRODUCT_LISTS_TAG = "product-lists"
+
+_MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+# NOTIFY payloads must be shorter than 8000 bytes
+_MAX_PAYLOAD_BYTES = 7900
+
+_payload_rows = (
+    func.unnest(bindparam("payloads", type_=ARRAY(Text)))
+    .table_valued("payload")
+    .render_derived(name="payloads")
+)
+_NOTIFY_ALL = select(
+    func.count(func.pg_notify(CATALOG_CHANNEL, _payload_rows.c.payload))
+).select_from(_payload_rows)
+
+
+def product_tag(product_id: int | str) -> str:
+    return f"product:{product_id}"
+
+
+def invalidate_for_change(cache: TTLCache, payload: str) -> None:
+    """Evict the cache entries affected by one catalog change notification."""
+    table, _, row_ids = payload.partition(":")
+    if table == "categories":
+        # Category names are denormalized into product lists and details
+        cache.invalidate(CATEGORIES_TAG, PRODUCT_LISTS_TAG)
+    elif table in ("products", "inventory") and row_ids:
+        # One id from the triggers, several from CatalogChangeNotifier
+        cache.invalidate(
+            *(product_tag(row_id) for row_id in row_ids.split(",")), PRODUCT_LISTS_TAG
+        )
+    else:
+        cache.clear()
+
+
+def _payloads(table: str, row_ids: Iterable[int]) -> list[str]:
+    """`<table>:<id>,<id>,...` payloads, split to stay under the NOTIFY size limit."""
+    payloads, ids, size = [], [], len(table) + 1
+    for row_id in sorted(row_ids):
+        id_ = str(row_id)
+        if ids and size + len(id_) + 1 > _MAX_PAYLOAD_BYTES:
+            payloads.append(f"{table}:{','.join(ids)}")
+            ids, size = [], len(table) + 1
+        ids.append(id_)
+        size += len(id_) + 1
+    if ids:
+        payloads.append(f"{table}:{','.join(ids)}")
+    return payloads
+
+
+class CatalogChangeNotifier:
+    """
+    Coalesces catalog change notifications from writers that suppress the
+    per-row ones, and sends them every `interval` seconds in one statement.
+
+    Call `add` only after the change has committed, so a listener can't
+    reload the old row. Pending ids live only in this process: if it dies
+    before a flush, caches catch up at their TTL.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float) -> None:
+        self.interval = interval
+        self._engine = engine
+        self._pending: dict[str, set[int]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self.notifications = 0
+
+    def add(self, table: str, row_ids: Iterable[int]) -> None:
+        """Record changed rows of `table` for the next flush."""
+        self._pending.setdefault(table, set()).update(row_ids)
+
+    async def flush(self) -> int:
+        """Send everything recorded so far. Returns the number of notifications."""
+        pending, self._pending = self._pending, {}
+        payloads = [
+            payload
+            for table, row_ids in pending.items()
+            for payload in _payloads(table, row_ids)
+        ]
+        if not payloads:
+            return 0
+        try:
+            async with self._engine.begin() as connection:
+                await connection.execute(_NOTIFY_ALL, {"payloads": payloads})
+        except BaseException:
+            for table, row_ids in pending.items():
+                self.add(table, row_ids)
+            raise
+        self.notifications += len(payloads)
+        return len(payloads)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("Catalog change notification failed (%s)", e)
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and send whatever is still pending."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final catalog change notification failed")
+
+
+class _DelayedInvalidations:
+    """
+    Replays change notifications once more after a delay.
+
+    With read replicas, a request can reload an entry evicted by a
+    notification from a replica that hasn't applied the change yet. Evicting
+    again once replicas in rotation must have caught up bounds how long such
+    an entry can be served.
+    """
+
+    def __init__(self, cache: TTLCache, delay: float) -> None:
+        self._cache = cache
+        self._delay = delay
+        # payload -> deadline; re-adding moves a payload to the end, so the
+        # dict stays ordered by deadline
+        self._due: dict[str, float] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+    def add(self, payload: str) -> None:
+        self._due.pop(payload, None)
+        self._due[payload] = time.monotonic() + self._delay
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._delay, self._replay)
+
+    def _replay(self) -> None:
+        self._timer = None
+        now = time.monotonic()
+        while self._due:
+            payload, deadline = next(iter(self._due.items()))
+            if deadline > now:
+                self._timer = asyncio.get_running_loop().call_later(
+                    deadline - now, self._replay
+                )
+                return
+            del self._due[payload]
+            invalidate_for_change(self._cache, payload)
+
+    def cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._due.clear()
+
+
+async def _connect(config: AppConfig) -> psycopg.AsyncConnection:
+    password = config.db_password
+    if _is_oauth_mode():
+        password = await asyncio.to_thread(get_password_for_connection)
+    conninfo = make_conninfo(
+        host=config.db_host,
+        port=config.db_port,
+        dbname=config.db_name,
+        user=config.db_user,
+        password=password,
+        sslmode=config.db_sslmode,
+    )
+    return await psycopg.AsyncConnection.connect(conninfo, autocommit=True)
+
+
+async def listen_for_catalog_changes(
+    config: AppConfig, cache: TTLCache, replay_after: float | None = None
+) -> None:
+    """
+    Hold a dedicated connection LISTENing on CATALOG_CHANNEL and evict cache
+    entries as notifications arrive. Reconnects with exponential backoff and
+    clears the cache on every (re)connect, since changes may have been missed.
+    With `replay_after`, each eviction is repeated that many seconds later
+    (see _DelayedInvalidations). Runs until cancelled.
+    """
+    replays = _DelayedInvalidations(cache, replay_after) if replay_after else None
+    try:
+        await _listen(config, cache, replays)
+    finally:
+        if replays:
+            replays.cancel()
+
+
+async def _listen(
+    config: AppConfig, cache: TTLCache, replays: _DelayedInvalidations | None
+) -> None:
+    delay = 1.0
+    while True:
+        try:
+            async with await _connect(config) as conn:
+                await conn.execute(f"LISTEN {CATALOG_CHANNEL}")
+                cache.clear()
+                delay = 1.0
+                logger.info("Listening for catalog changes on %s", CATALOG_CHANNEL)
+                async for notify in conn.notifies():
+                    invalidate_for_change(cache, notify.payload)
+                    if replays:
+                        replays.add(notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "Catalog change listener disconnected (%s); retrying in %.0fs", e, delay
+            )
+        # Entries may go stale while we can't hear notifications
+        cache.clear()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _MAX_RECONNECT_DELAY_SECONDS)
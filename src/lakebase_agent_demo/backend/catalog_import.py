@@ -0,0 +1,341 @@
+"""Bulk catalog import through COPY.
+
+A CSV or Parquet file is read in chunks, each chunk is validated against the
+product/inventory schema and streamed into a temporary staging table with
+COPY, and the staged rows are then merged into categories, products and
+inventory with a few set-based statements, all in one transaction. Memory
+stays bounded by the chunk size whatever the file size; the database does
+the heavy lifting.
+
+Import file columns (header row for CSV):
+
+    category, name, description, price, image_url, quantity
+
+Categories are created by name as needed. Products are matched by name:
+existing ones are updated, new ones inserted; if a name appears more than
+once in a file the last row wins. `quantity` sets the stock level; leave it
+empty to keep the current one.
+
+Run from the command line with:
+
+    python -m lakebase_agent_demo.backend.catalog_import catalog.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import itertools
+import re
+import time
+from collections.abc import AsyncIterator, Iterator
+from decimal import Decimal
+from typing import Annotated, Any, BinaryIO, Literal
+
+from pydantic import Field, StringConstraints, TypeAdapter, ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .catalog_cache import CATALOG_CHANNEL
+from .config import AppConfig
+from .database import create_engine, create_session_maker, get_session
+from .models import CatalogImportOut
+
+ImportFormat = Literal["csv", "parquet"]
+
+COLUMNS = ("category", "name", "description", "price", "image_url", "quantity")
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Errors reported back before giving up on a file
+_MAX_REPORTED_ERRORS = 20
+
+
+# One import row, in COLUMNS order; constraints mirror the db_models columns.
+# Rows are validated as tuples rather than dicts: it's cheaper, and they
+# encode straight into COPY text.
+ImportRow = tuple[
+    Annotated[str, StringConstraints(min_length=1, max_length=100)],
+    Annotated[str, StringConstraints(min_length=1, max_length=200)],
+    str | None,
+    Annotated[Decimal, Field(ge=0, max_digits=10, decimal_places=2)],
+    Annotated[str, StringConstraints(max_length=500)] | None,
+    Annotated[int, Field(ge=0, le=2**31 - 1)] | None,
+]
+
+_rows_adapter = TypeAdapter(list[ImportRow])
+
+
+class CatalogImportError(ValueError):
+    """The import file is malformed or has rows that fail validation."""
+
+    def __init__(self, message: str, errors: list[dict[str, Any]] | None = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+# ============================================================================
+# Readers: yield chunks of raw row tuples (in COLUMNS order) from a binary file
+# ============================================================================
+
+
+def iter_csv_chunks(file: BinaryIO, chunk_size: int) -> Iterator[list[tuple]]:
+    """Read a CSV file with a header row in chunks of row tuples."""
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    header = next(reader, [])
+    missing = set(COLUMNS) - set(header)
+    if missing:
+        raise CatalogImportError(f"Missing column(s): {', '.join(sorted(missing))}")
+    positions = [header.index(column) for column in COLUMNS]
+    while chunk := list(itertools.islice(reader, chunk_size)):
+        try:
+            # CSV has no nulls; treat empty cells as missing values
+            yield [tuple(row[i] or None for i in positions) for row in chunk]
+        except IndexError:
+            raise CatalogImportError("Row with fewer cells than the header") from None
+
+
+def iter_parquet_chunks(file: BinaryIO, chunk_size: int) -> Iterator[list[tuple]]:
+    """Read a Parquet file in chunks of row tuples (needs pyarrow)."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise CatalogImportError(
+            "Parquet import requires pyarrow (the package's parquet extra)"
+        ) from e
+    parquet = pq.ParquetFile(file)
+    missing = set(COLUMNS) - set(parquet.schema_arrow.names)
+    if missing:
+        raise CatalogImportError(f"Missing column(s): {', '.join(sorted(missing))}")
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=list(COLUMNS)):
+        columns = batch.to_pydict()
+        yield list(zip(*(columns[column] for column in COLUMNS)))
+
+
+_READERS = {"csv": iter_csv_chunks, "parquet": iter_parquet_chunks}
+
+
+def _validate_chunk(chunk: list[tuple], first_row: int) -> list[ImportRow]:
+    try:
+        return _rows_adapter.validate_python(chunk)
+    except ValidationError as e:
+        errors = [
+            {
+                "row": first_row + error["loc"][0],
+                "column": COLUMNS[error["loc"][1]] if len(error["loc"]) > 1 else None,
+                "message": error["msg"],
+            }
+            for error in e.errors(include_url=False)[:_MAX_REPORTED_ERRORS]
+        ]
+        raise CatalogImportError(
+            f"{e.error_count()} invalid value(s) in rows "
+            f"{first_row}-{first_row + len(chunk) - 1}",
+            errors,
+        ) from None
+
+
+# COPY text format: tab-separated, \N for null, backslash escapes in text
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+_COPY_SPECIAL = re.compile(r"[\\\t\n\r]")
+_COPY_NULL = "\\N"
+
+
+def _copy_text(value: str | None) -> str:
+    if value is None:
+        return _COPY_NULL
+    # translate() is slow with multi-character replacements; most values
+    # have nothing to escape
+    return value.translate(_COPY_ESCAPES) if _COPY_SPECIAL.search(value) else value
+
+
+def _encode_chunk(chunk: list[ImportRow], first_row: int) -> bytes:
+    """Encode validated rows as COPY text, each prefixed with its line number."""
+    return "".join(
+        [
+            f"{line}\t{_copy_text(category)}\t{_copy_text(name)}"
+            f"\t{_copy_text(description)}\t{price}\t{_copy_text(image_url)}"
+            f"\t{_COPY_NULL if quantity is None else quantity}\n"
+            for line, (category, name, description, price, image_url, quantity) in enumerate(
+                chunk, first_row
+            )
+        ]
+    ).encode()
+
+
+async def _encoded_chunks(
+    file: BinaryIO, format: ImportFormat, chunk_size: int
+) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Parse, validate and encode chunks in a worker thread, so the event loop
+    stays free; yields (rows, COPY data) per chunk.
+    """
+    chunks = _READERS[format](file, chunk_size)
+
+    def next_chunk(first_row: int) -> tuple[int, bytes] | None:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return None
+        return len(chunk), _encode_chunk(_validate_chunk(chunk, first_row), first_row)
+
+    first_row = 1
+    while (encoded := await asyncio.to_thread(next_chunk, first_row)) is not None:
+        yield encoded
+        first_row += encoded[0]
+
+
+# ============================================================================
+# Load: COPY into staging, then merge
+# ============================================================================
+
+_CREATE_STAGING = """
+    CREATE TEMP TABLE catalog_import (
+        line bigint NOT NULL,
+        category text NOT NULL,
+        name text NOT NULL,
+        description text,
+        price numeric(10, 2) NOT NULL,
+        image_url text,
+        quantity integer
+    ) ON COMMIT DROP
+"""
+
+_COPY_STAGING = (
+    "COPY catalog_import (line, category, name, description, price, image_url, quantity)"
+    " FROM STDIN"
+)
+
+# Last row wins for a name that appears more than once
+_DEDUPLICATE = """
+    CREATE TEMP TABLE catalog_import_rows ON COMMIT DROP AS
+    SELECT DISTINCT ON (name) *
+    FROM catalog_import
+    ORDER BY name, line DESC
+"""
+
+_MERGE_CATEGORIES = """
+    INSERT INTO categories (name)
+    SELECT DISTINCT category FROM catalog_import_rows
+    ON CONFLICT (name) DO NOTHING
+"""
+
+_UPDATE_PRODUCTS = """
+    UPDATE products p
+    SET description = s.description,
+        price = s.price,
+        image_url = s.image_url,
+        category_id = c.id
+    FROM catalog_import_rows s
+    JOIN categories c ON c.name = s.category
+    WHERE p.name = s.name
+      AND (p.description, p.price, p.image_url, p.category_id)
+          IS DISTINCT FROM (s.description, s.price, s.image_url, c.id)
+"""
+
+_INSERT_PRODUCTS = """
+    INSERT INTO products (name, description, price, image_url, category_id)
+    SELECT s.name, s.description, s.price, s.image_url, c.id
+    FROM catalog_import_rows s
+    JOIN categories c ON c.name = s.category
+    WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.name = s.name)
+    ORDER BY s.line
+"""
+
+_MERGE_INVENTORY = """
+    INSERT INTO inventory (product_id, quantity)
+    SELECT p.id, s.quantity
+    FROM catalog_import_rows s
+    JOIN products p ON p.name = s.name
+    WHERE s.quantity IS NOT NULL
+    ORDER BY p.id
+    ON CONFLICT (product_id) DO UPDATE
+    SET quantity = excluded.quantity
+    WHERE inventory.quantity IS DISTINCT FROM excluded.quantity
+"""
+
+
+async def import_catalog(
+    session: AsyncSession,
+    file: BinaryIO,
+    format: ImportFormat = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> CatalogImportOut:
+    """
+    Import a catalog file within the session's transaction.
+
+    Raises CatalogImportError if the file is malformed or any row is
+    invalid; nothing is merged in that case (the caller rolls back).
+    """
+    started = time.perf_counter()
+    # Serialize imports: the products merge matches on name, which has no
+    # unique constraint to arbitrate concurrent inserts
+    await session.execute(text("SELECT pg_advisory_xact_lock(hashtext('catalog_import'))"))
+    # One catalog-wide notification at the end instead of one per row
+    # (see migration 008); listeners clear their caches on it
+    await session.execute(text("SET LOCAL app.suppress_catalog_notify = on"))
+    await session.execute(text(_CREATE_STAGING))
+
+    connection = await session.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+    rows = 0
+    async with raw.cursor() as cursor:
+        async with cursor.copy(_COPY_STAGING) as copy:
+            # One write per chunk: row-at-a-time write_row costs more than
+            # the COPY itself
+            async for count, data in _encoded_chunks(file, format, chunk_size):
+                await copy.write(data)
+                rows += count
+    copied = time.perf_counter()
+
+    await session.execute(text(_DEDUPLICATE))
+    categories = await session.execute(text(_MERGE_CATEGORIES))
+    updated = await session.execute(text(_UPDATE_PRODUCTS))
+    inserted = await session.execute(text(_INSERT_PRODUCTS))
+    inventory = await session.execute(text(_MERGE_INVENTORY))
+    await session.execute(
+        text("SELECT pg_notify(:channel, 'catalog_import')"),
+        {"channel": CATALOG_CHANNEL},
+    )
+    return CatalogImportOut(
+        rows=rows,
+        categories_created=categories.rowcount,
+        products_created=inserted.rowcount,
+        products_updated=updated.rowcount,
+        inventory_rows=inventory.rowcount,
+        seconds=time.perf_counter() - started,
+        copy_seconds=copied - started,
+    )
+
+
+async def _main(path: str, format: ImportFormat, chunk_size: int) -> None:
+    engine = create_engine(AppConfig())
+    try:
+        with open(path, "rb") as file:
+            async with get_session(create_session_maker(engine)) as session:
+                result = await import_catalog(session, file, format, chunk_size)
+    finally:
+        await engine.dispose()
+    print(
+        f"Imported {result.rows} rows in {result.seconds:.1f}s "
+        f"({result.rows / max(result.seconds, 1e-9):,.0f} rows/s, "
+        f"{result.copy_seconds:.1f}s of it COPY): "
+        f"{result.categories_created} categories created, "
+        f"{result.products_created} products created, "
+        f"{result.products_updated} updated, "
+        f"{result.inventory_rows} inventory rows written"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import a product catalog.")
+    parser.add_argument("path", help="CSV or Parquet file")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        help="File format (default: from the file extension)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    format = args.format or ("parquet" if args.path.endswith(".parquet") else "csv")
+    try:
+        asyncio.run(_main(args.path, format, args.chunk_size))
+    except CatalogImportError as e:
+        parser.exit(1, f"Import failed: {e}\n" + "".join(f"  {err}\n" for err in e.errors))
@@ -0,0 +1,167 @@
+"""Set-based stock reservation and order creation for checkout.
+
+A whole cart is reserved and recorded with a single statement, so a
+checkout costs one round trip (plus COMMIT) no matter how many lines it
+has, and hot inventory rows stay locked for no longer than that:
+
+    WITH requested AS (unnest(product_ids, quantities)),
+         locked   AS MATERIALIZED (SELECT ... ORDER BY product_id FOR UPDATE),
+         reserved AS (UPDATE inventory ... FROM requested
+                      WHERE quantity >= requested.quantity RETURNING ...),
+         new_order AS (INSERT INTO orders ... RETURNING ...)
+    INSERT INTO order_items ... RETURNING ...
+
+Correctness under contention comes from the database rather than
+application locks:
+
+- rows are locked in product_id order before they are updated, so carts
+  that share SKUs can't deadlock each other;
+- `quantity >= requested` is re-checked against the latest committed row
+  after waiting on a lock (READ COMMITTED re-evaluation), so stock can't be
+  oversold; the CHECK constraint from migration 007 backs this up.
+
+The statement also turns off the inventory trigger's per-row notifications
+for its transaction (migration 008): every NOTIFY takes a database-wide
+lock at commit, which would serialize all checkouts. The caller reports the
+reserved products to the CatalogChangeNotifier once committed instead.
+
+Deciding whether to keep a partially reserved cart is left to the caller,
+which rolls the transaction back to undo everything.
+"""
+
+from collections.abc import Mapping
+
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Row,
+    any_,
+    bindparam,
+    case,
+    func,
+    insert,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .db_models import Inventory, Order, OrderItem, Product
+
+# The statement is built once: constructing it per call costs more
+# client-side than the database spends executing it. It targets Core tables
+# because an ORM INSERT executed with a parameter dict is treated as a bulk
+# insert of that dict.
+_inventory = Inventory.__table__
+_orders = Order.__table__
+_order_items = OrderItem.__table__
+
+
+def _int_array(name: str):
+    return bindparam(name, type_=ARRAY(Integer))
+
+
+_requested = (
+    func.unnest(_int_array("product_ids"), _int_array("quantities"))
+    .table_valued("product_id", "quantity")
+    .render_derived(name="requested")
+)
+# set_config(..., true) is SET LOCAL. The AFTER ROW triggers of the UPDATE
+# below are queued until the end of the statement, by when this has run.
+_suppress_notify = (
+    select(func.set_config("app.suppress_catalog_notify", "on", True).label("done"))
+    .cte("suppress_notify")
+    .prefix_with("MATERIALIZED")
+)
+_locked = (
+    select(_inventory.c.product_id)
+    .where(_inventory.c.product_id == any_(_int_array("product_ids")))
+    .order_by(_inventory.c.product_id)
+    .with_for_update()
+    .cte("locked")
+    .prefix_with("MATERIALIZED")
+)
+_reserved = (
+    update(_inventory)
+    .values(quantity=_inventory.c.quantity - _requested.c.quantity)
+    .where(
+        _inventory.c.product_id == _requested.c.product_id,
+        _inventory.c.product_id.in_(select(_locked.c.product_id)),
+        _inventory.c.quantity >= _requested.c.quantity,
+    )
+    .returning(_inventory.c.product_id, _requested.c.quantity)
+    .cte("reserved")
+)
+_new_order = (
+    insert(_orders)
+    .from_select(
+        ["status"],
+        select(
+            case(
+                (
+                    func.count() == func.cardinality(_int_array("product_ids")),
+                    "reserved",
+                ),
+                else_="partially_reserved",
+            )
+        ).select_from(_reserved),
+    )
+    .returning(_orders.c.id, _orders.c.status, _orders.c.created_at)
+    .cte("new_order")
+)
+_CHECKOUT = (
+    insert(_order_items)
+    .from_select(
+        [
+            "order_id",
+            "product_id",
+            "quantity_requested",
+            "quantity_reserved",
+            "unit_price",
+        ],
+        select(
+            _new_order.c.id,
+            _requested.c.product_id,
+            _requested.c.quantity,
+            func.coalesce(_reserved.c.quantity, 0),
+            Product.price,
+        )
+        .select_from(_new_order)
+        .join(_suppress_notify, true())
+        .join(_requested, true())
+        .join(Product, Product.id == _requested.c.product_id)
+        .outerjoin(_reserved, _reserved.c.product_id == _requested.c.product_id)
+        .order_by(_requested.c.product_id),
+    )
+    .returning(
+        _order_items.c.order_id,
+        _order_items.c.product_id,
+        _order_items.c.quantity_requested,
+        _order_items.c.quantity_reserved,
+        _order_items.c.unit_price,
+        select(_new_order.c.status).scalar_subquery().label("status"),
+        select(_new_order.c.created_at).scalar_subquery().label("created_at"),
+    )
+)
+
+
+async def place_order(session: AsyncSession, quantities: Mapping[int, int]) -> list[Row]:
+    """
+    Reserve stock for every line that has enough of it and record the order.
+
+    `quantities` maps product_id to the (already aggregated) quantity wanted.
+    Returns one row per order line (order_id, product_id, quantity_requested,
+    quantity_reserved, unit_price, status, created_at); lines without enough
+    stock have quantity_reserved 0, and product_ids that don't exist get no
+    row, which is how the caller finds them. Roll back to release the
+    reservations.
+    """
+    product_ids = sorted(quantities)
+    result = await session.execute(
+        _CHECKOUT,
+        {
+            "product_ids": product_ids,
+            "quantities": [quantities[id_] for id_ in product_ids],
+        },
+    )
+    return list(result.all())
@@ -1,12 +1,12 @@
 import os
 from importlib import resources
 from pathlib import Path
-from typing import ClassVar
+from typing import Annotated, ClassVar, Literal
 from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
-from pydantic import Field, model_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 from .._metadata import app_name, app_slug
 
@@ -42,6 +42,80 @@ class AppConfig(BaseSettings):
     db_password: str = Field(default="")
     db_sslmode: str = Field(default="require")
 
+    # Connection pools. The budget is how many connections one app instance
+    # may hold on one endpoint, across all its worker processes; pool_size and
+    # max_overflow are derived from it unless set. Pre-ping "idle" only pings
+    # connections that sat in the pool longer than the idle threshold.
+    db_workers: int = Field(
+        default_factory=lambda: int(os.environ.get("WEB_CONCURRENCY", "1"))
+    )
+    db_connection_budget: int = Field(default=20)
+    db_pool_size: int | None = Field(default=None)
+    db_max_overflow: int | None = Field(default=None)
+    db_pool_timeout_seconds: float = Field(default=10.0)
+    db_pool_recycle_seconds: float = Field(default=1800.0)
+    db_pool_pre_ping: Literal["always", "idle", "never"] = Field(default="idle")
+    db_pool_pre_ping_idle_seconds: float = Field(default=30.0)
+
+    # psycopg prepares a statement on the server once a connection has run it
+    # this many times (0: on first use). Empty/unset disables server-side
+    # prepared statements, e.g. behind a transaction-mode connection pooler.
+    db_prepare_threshold: int | None = Field(default=5)
+
+    # Schema migrations at startup (see migrate.py). Turn off when migrations
+    # run as a separate step (python -m lakebase_agent_demo.backend.migrate).
+    # Processes wait up to the lock timeout for another one's migration.
+    run_migrations_on_startup: bool = Field(default=True)
+    migration_lock_timeout_seconds: float = Field(default=300.0)
+
+    # Startup warm-up (see prewarm.py): open each pool's pool_size connections
+    # and run the first catalog page queries; /api/ready reports 503 until done
+    db_prewarm_connections: bool = Field(default=True)
+    db_prewarm_catalog: bool = Field(default=True)
+    db_prewarm_timeout_seconds: float = Field(default=30.0)
+
+    # Read-only endpoints for catalog reads, comma-separated host[:port] (same
+    # database and credentials as the primary). Reads fall back to the primary
+    # when a replica lags by more than db_replica_max_lag_seconds or is down.
+    db_read_hosts: Annotated[list[str], NoDecode] = Field(default=[])
+    db_replica_max_lag_seconds: float = Field(default=5.0)
+    db_replica_check_interval_seconds: float = Field(default=2.0)
+
+    # In-process catalog cache (invalidated via LISTEN/NOTIFY; TTL is a safety net)
+    catalog_cache_enabled: bool = Field(default=True)
+    catalog_cache_ttl_seconds: float = Field(default=60.0)
+    catalog_cache_max_entries: int = Field(default=1024)
+    # How often coalesced change notifications from checkout and the
+    # inventory feed are sent (see catalog_cache.CatalogChangeNotifier)
+    catalog_notify_interval_seconds: float = Field(default=0.5)
+
+    # On-behalf-of-user SDK clients, cached per forwarded token (keyed by its
+    # SHA-256, never the token itself), and each user's /current-user profile
+    workspace_client_cache_size: int = Field(default=256)
+    workspace_client_ttl_seconds: float = Field(default=600.0)
+    current_user_ttl_seconds: float = Field(default=60.0)
+
+    # Write-behind inventory delta buffer: flush when this many products are
+    # pending or this many seconds have passed, whichever comes first. Batches
+    # are refused with 503 while inventory_max_buffered products are pending.
+    inventory_flush_max_pending: int = Field(default=1000)
+    inventory_flush_interval_seconds: float = Field(default=1.0)
+    inventory_max_buffered: int = Field(default=50_000)
+
+    # API request deadlines in seconds: request_deadlines by operation id,
+    # request_deadline_seconds for the rest (0 for none). Pool checkout and
+    # SQL count against the deadline; requests past it are cancelled with 504.
+    request_deadline_seconds: float = Field(default=15.0)
+    request_deadlines: dict[str, float] = Field(
+        default={"exportProducts": 300.0, "importProducts": 300.0}
+    )
+
+    # Log the number of SQL statements each API request ran
+    log_statement_counts: bool = Field(default=False)
+
+    # Rows fetched per server-side cursor round trip when streaming exports
+    export_fetch_size: int = Field(default=1000)
+
     @model_validator(mode="after")
     def resolve_db_credentials_for_oauth(self) -> "AppConfig":
         """When OAuth env vars are set, derive db_user/db_password from Databricks API."""
@@ -51,19 +125,57 @@ class AppConfig(BaseSettings):
             object.__setattr__(self, "db_password", password)
         return self
 
+    @field_validator("db_prepare_threshold", mode="before")
+    @classmethod
+    def empty_prepare_threshold(cls, value: object) -> object:
+        return None if value == "" else value
+
+    @field_validator("db_read_hosts", mode="before")
+    @classmethod
+    def split_read_hosts(cls, value: object) -> object:
+        if isinstance(value, str):
+            return [host.strip() for host in value.split(",") if host.strip()]
+        return value
+
     @property
     def static_assets_path(self) -> Path:
         return Path(str(resources.files(app_slug))).joinpath("__dist__")
 
+    @property
+    def db_pool_limits(self) -> tuple[int, int]:
+        """(pool_size, max_overflow) for each worker's engine, within the budget."""
+        per_worker = self.db_connection_budget // max(self.db_workers, 1)
+        if self.catalog_cache_enabled:
+            # Each worker also holds a LISTEN connection for the catalog cache
+            per_worker -= 1
+        per_worker = max(per_worker, 1)
+        pool_size = self.db_pool_size
+        if pool_size is None:
+            pool_size = max(per_worker // 2, 1)
+        max_overflow = self.db_max_overflow
+        if max_overflow is None:
+            max_overflow = max(per_worker - pool_size, 0)
+        return pool_size, max_overflow
+
     @property
     def database_url(self) -> str:
         """Build async PostgreSQL connection URL for SQLAlchemy."""
-        if not self.db_host or not self.db_user:
+        return self.database_url_for(self.db_host)
+
+    @property
+    def read_database_urls(self) -> list[str]:
+        """Async connection URLs for the read-only endpoints in db_read_hosts."""
+        return [self.database_url_for(host) for host in self.db_read_hosts]
+
+    def database_url_for(self, host: str) -> str:
+        """Build an async connection URL for `host` or `host:port` (default db_port)."""
+        if not host or not self.db_user:
             return ""
+        host, _, port = host.partition(":")
         password = quote_plus(self.db_password) if self.db_password else ""
         return (
             f"postgresql+psycopg://{self.db_user}:{password}"
-            f"@{self.db_host}:{self.db_port}/{self.db_name}"
+            f"@{host}:{port or self.db_port}/{self.db_name}"
             f"?sslmode={self.db_sslmode}"
         )
 
@@ -1,18 +1,26 @@
 """Async database connection management for Lakebase PostgreSQL."""
 
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 
-from sqlalchemy import event
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
 
 from .config import AppConfig
+from .deadlines import DeadlineExceeded, current_deadline, set_statement_timeout
 from .lakebase_credentials import _is_oauth_mode, get_password_for_connection
+from .metrics import Histogram
+from .models import PoolMetricsOut
+from .statement_count import install_statement_counter
 
 
 def _inject_oauth_password_on_connect(dialect: object, conn_rec: object, cargs: object, cparams: dict) -> None:
@@ -20,38 +28,184 @@ def _inject_oauth_password_on_connect(dialect: object, conn_rec: object, cargs:
     cparams["password"] = get_password_for_connection()
 
 
-def create_engine(config: AppConfig) -> AsyncEngine:
-    """Create an async SQLAlchemy engine for Lakebase PostgreSQL."""
-    if not config.database_url:
+# Seconds; most checkouts are immediate, so start well below a millisecond
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+@dataclass
+class PoolStats:
+    """Counters for an InstrumentedPool; kept across pool re-creation on dispose."""
+
+    checkout_wait: Histogram = field(default_factory=lambda: Histogram(POOL_WAIT_BUCKETS))
+    waiting: int = 0
+    timeouts: int = 0
+    pre_pings: int = 0
+    stale_connections: int = 0
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that times checkouts and pings connections that sat idle.
+
+    Checkout wait covers everything up to a usable connection: waiting for a
+    free slot, opening a new connection, and the pre-ping if one was due.
+    Connections idle in the pool for longer than `pre_ping_idle` seconds are
+    pinged before being handed out (0 pings every checkout, None never);
+    fresh connections never are. Inside a request with a deadline, checkout
+    waits no longer than the time left (see deadlines.py).
+    """
+
+    pre_ping_idle: float | None = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    @property
+    def _timeout(self) -> float:
+        # Read by QueuePool when waiting for a free slot
+        deadline = current_deadline()
+        if deadline is None:
+            return self._checkout_timeout
+        return max(min(self._checkout_timeout, deadline.remaining()), 0.0)
+
+    @_timeout.setter
+    def _timeout(self, value: float) -> None:
+        self._checkout_timeout = value
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool._timeout = self._checkout_timeout
+        pool.pre_ping_idle = self.pre_ping_idle
+        pool.stats = self.stats
+        return pool
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        deadline = current_deadline()
+        deadline_bound = deadline is not None and deadline.remaining() < self._checkout_timeout
+        self.stats.waiting += 1
+        try:
+            while True:
+                connection = super().connect()
+                if self._ping_if_idle(connection):
+                    return connection
+                # Drop it and check out another; new connections aren't pinged
+                connection.invalidate()
+        except exc.TimeoutError as e:
+            self.stats.timeouts += 1
+            if deadline_bound:
+                raise DeadlineExceeded(
+                    f"No connection within the request deadline of {deadline.seconds:g}s"
+                ) from e
+            raise
+        finally:
+            self.stats.waiting -= 1
+            self.stats.checkout_wait.observe(time.perf_counter() - started)
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        # info is cleared when a connection is replaced, so fresh ones have no entry
+        record.info["checked_in_at"] = time.monotonic()
+        super()._do_return_conn(record)
+
+    def _ping_if_idle(self, connection: PoolProxiedConnection) -> bool:
+        """Return False if the connection was due a ping and failed it."""
+        checked_in_at = connection.info.get("checked_in_at")
+        if (
+            self.pre_ping_idle is None
+            or checked_in_at is None
+            or time.monotonic() - checked_in_at < self.pre_ping_idle
+        ):
+            return True
+        self.stats.pre_pings += 1
+        try:
+            # The dialect pings in autocommit, so the connection isn't left
+            # INTRANS (autocommit read sessions couldn't switch it otherwise)
+            self._dialect.do_ping(connection.dbapi_connection)
+        except Exception:
+            self.stats.stale_connections += 1
+            return False
+        return True
+
+    def metrics(self, name: str) -> PoolMetricsOut:
+        return PoolMetricsOut(
+            name=name,
+            pool_size=self.size(),
+            max_overflow=self._max_overflow,
+            checked_out=self.checkedout(),
+            checked_in=self.checkedin(),
+            overflow=max(self.overflow(), 0),
+            waiting=self.stats.waiting,
+            timeouts=self.stats.timeouts,
+            pre_pings=self.stats.pre_pings,
+            stale_connections=self.stats.stale_connections,
+            checkout_wait_seconds=self.stats.checkout_wait.snapshot(),
+        )
+
+
+def create_engine(config: AppConfig, url: str | None = None) -> AsyncEngine:
+    """Create an async SQLAlchemy engine for Lakebase PostgreSQL (the primary by default)."""
+    url = url or config.database_url
+    if not url:
         raise ValueError(
             "Database URL not configured. "
             "Set LAKEBASE_AGENT_DEMO_DB_HOST and LAKEBASE_AGENT_DEMO_DB_USER environment variables."
         )
 
+    pool_size, max_overflow = config.db_pool_limits
     engine = create_async_engine(
-        config.database_url,
+        url,
         echo=False,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=config.db_pool_timeout_seconds,
+        pool_recycle=config.db_pool_recycle_seconds,
+        # Kept in the connect params, so every new connection (after recycling,
+        # invalidation, or an OAuth password refresh) gets the same threshold
+        connect_args={"prepare_threshold": config.db_prepare_threshold},
     )
+    engine.pool.pre_ping_idle = {
+        "always": 0.0,
+        "idle": config.db_pool_pre_ping_idle_seconds,
+        "never": None,
+    }[config.db_pool_pre_ping]
 
     if _is_oauth_mode():
         event.listens_for(engine.sync_engine, "do_connect")(_inject_oauth_password_on_connect)
 
+    install_statement_counter(engine)
+
     return engine
 
 
 def create_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
     """Create an async session maker bound to the engine."""
+    # Transactions begun during a request are held to its deadline
+    sync_session_maker = sessionmaker()
+    event.listen(sync_session_maker, "after_begin", set_statement_timeout)
     return async_sessionmaker(
         bind=engine,
         class_=AsyncSession,
+        sync_session_class=sync_session_maker,
         expire_on_commit=False,
         autoflush=False,
     )
 
 
+def create_read_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """
+    Create a session maker for read-only work.
+
+    Statements run in autocommit mode, so a request pays no BEGIN or COMMIT
+    round trip and there is nothing to commit; the session takes a pooled
+    connection on its first statement, and none if it never runs one. Each
+    statement sees its own snapshot: a handler that needs one across
+    statements, or a server-side cursor, opens a transaction explicitly.
+    """
+    return create_session_maker(engine.execution_options(isolation_level="AUTOCOMMIT"))
+
+
 @asynccontextmanager
 async def get_session(
     session_maker: async_sessionmaker[AsyncSession],
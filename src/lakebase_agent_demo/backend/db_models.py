@@ -3,12 +3,35 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, Text, func
+from sqlalchemy import (
+    CheckConstraint,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
+# Name outranks description in search results (weights A > B)
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
 class Base(DeclarativeBase):
-    """Base class for all ORM models."""
+    """Base class for all ORM models.
+
+    Relationships use lazy="raise": nothing is loaded unless the query asks
+    for it with an explicit loader option (selectinload, joinedload, ...).
+    """
 
     pass
 
@@ -24,10 +47,14 @@ class Category(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Indexed for the catalog-wide max(updated_at) in the version token
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True
+    )
 
     # Relationship to products
     products: Mapped[list["Product"]] = relationship(
-        "Product", back_populates="category", lazy="selectin"
+        "Product", back_populates="category", lazy="raise"
     )
 
 
@@ -35,6 +62,12 @@ class Product(Base):
     """Product for sale in the Data & Bricks Store."""
 
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination within a category (migration 003)
+        Index("ix_products_category_id_id", "category_id", "id"),
+        # Full-text search (migration 006)
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -45,14 +78,23 @@ class Product(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Indexed for the catalog-wide max(updated_at) in the version token
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True
+    )
+    # Full-text search document; deferred so it's only loaded when asked for
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
     )
 
     # Relationships
-    category: Mapped["Category"] = relationship("Category", back_populates="products")
+    category: Mapped["Category"] = relationship(
+        "Category", back_populates="products", lazy="raise"
+    )
     inventory: Mapped["Inventory | None"] = relationship(
-        "Inventory", back_populates="product", uselist=False, lazy="selectin"
+        "Inventory", back_populates="product", uselist=False, lazy="raise"
     )
 
 
@@ -60,15 +102,66 @@ class Inventory(Base):
     """Stock levels for products."""
 
     __tablename__ = "inventory"
+    __table_args__ = (
+        CheckConstraint("quantity >= 0", name="ck_inventory_quantity_nonnegative"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     product_id: Mapped[int] = mapped_column(
         ForeignKey("products.id"), unique=True, nullable=False
     )
     quantity: Mapped[int] = mapped_column(default=0, nullable=False)
+    # Indexed for the catalog-wide max(updated_at) in the version token
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True
     )
 
     # Relationship
-    product: Mapped["Product"] = relationship("Product", back_populates="inventory")
+    product: Mapped["Product"] = relationship(
+        "Product", back_populates="inventory", lazy="raise"
+    )
+
+
+class CatalogDeletion(Base):
+    """When rows were last deleted from a catalog table (kept by triggers, migration 009)."""
+
+    __tablename__ = "catalog_deletions"
+
+    table_name: Mapped[str] = mapped_column(Text, primary_key=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class Order(Base):
+    """A checked-out cart whose stock has been reserved."""
+
+    __tablename__ = "orders"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    items: Mapped[list["OrderItem"]] = relationship(
+        "OrderItem", back_populates="order", lazy="raise"
+    )
+
+
+class OrderItem(Base):
+    """One product line of an order, with how much of it could be reserved."""
+
+    __tablename__ = "order_items"
+    __table_args__ = (UniqueConstraint("order_id", "product_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    order_id: Mapped[int] = mapped_column(
+        ForeignKey("orders.id", ondelete="CASCADE"), nullable=False
+    )
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
+    quantity_requested: Mapped[int] = mapped_column(nullable=False)
+    quantity_reserved: Mapped[int] = mapped_column(nullable=False)
+    unit_price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+
+    order: Mapped["Order"] = relationship(
+        "Order", back_populates="items", lazy="raise"
+    )
@@ -0,0 +1,189 @@
+"""Per-request deadlines, and cancellation when the client goes away.
+
+DeadlineMiddleware gives every API request a deadline, either
+request_deadline_seconds or a per-endpoint value from request_deadlines
+(keyed by operation id). It runs the handler in its own task. The handler is
+cancelled when the deadline passes, and the client gets a 504 if no response
+has started. It is also cancelled when the client disconnects. When a task
+waiting on a query is cancelled, psycopg cancels the query on the server, so
+abandoned requests give their connection back instead of holding it until
+the query finishes.
+
+Inside a request, the deadline also caps:
+
+- pool checkout, which waits at most the time left (database.InstrumentedPool)
+- transactions, which get `SET LOCAL statement_timeout` set to the time left,
+  so the server stops a query even if the client-side cancel never arrives.
+  Autocommit read sessions have no transaction to scope it to; for those,
+  cancelling the task is what stops the query.
+"""
+
+import asyncio
+import time
+from collections.abc import Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from psycopg.errors import QueryCanceled
+from sqlalchemy import Connection
+from sqlalchemy.orm import Session, SessionTransaction
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .._metadata import api_prefix
+from .logger import logger
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time before it got a connection or a transaction."""
+
+
+@dataclass(frozen=True, slots=True)
+class Deadline:
+    seconds: float
+    expires_at: float  # time.monotonic()
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(seconds, time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def current_deadline() -> Deadline | None:
+    """The deadline of the request being handled in this context, if any."""
+    return _current_deadline.get()
+
+
+def set_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    """SessionEvents.after_begin: limit the transaction's statements to the time left."""
+    deadline = _current_deadline.get()
+    if (
+        deadline is None
+        or connection.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+    ):
+        return
+    remaining_ms = int(deadline.remaining() * 1000)
+    if remaining_ms <= 0:
+        raise DeadlineExceeded(f"Request deadline of {deadline.seconds:g}s exceeded")
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {remaining_ms}")
+
+
+def _is_deadline_error(error: Exception) -> bool:
+    # statement_timeout surfaces as QueryCanceled, wrapped in a SQLAlchemy DBAPIError
+    return isinstance(error, DeadlineExceeded) or isinstance(
+        getattr(error, "orig", None), QueryCanceled
+    )
+
+
+async def _forward_until_disconnect(receive: Receive, messages: asyncio.Queue[Message]) -> None:
+    """Pass request messages on to the handler; return once the client disconnects."""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        await messages.put(message)
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware enforcing request deadlines and cancelling on client disconnect.
+
+    `routes` are the API routes, matched to find a request's operation id.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Sequence[BaseRoute]) -> None:
+        self.app = app
+        self.routes = [route for route in routes if isinstance(route, APIRoute)]
+
+    def deadline_seconds(self, scope: Scope) -> float | None:
+        config = getattr(scope["app"].state, "config", None)
+        if config is None:
+            return None
+        for route in self.routes:
+            if route.matches(scope)[0] == Match.FULL:
+                return config.request_deadlines.get(
+                    route.operation_id, config.request_deadline_seconds
+                )
+        return config.request_deadline_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(api_prefix):
+            await self.app(scope, receive, send)
+            return
+        seconds = self.deadline_seconds(scope)
+        if not seconds:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = Deadline.after(seconds)
+        response_started = response_complete = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                response_complete = True
+            await send(message)
+
+        # A small queue, so request bodies still stream through with backpressure
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+        token = _current_deadline.set(deadline)
+        try:
+            handler = asyncio.create_task(self.app(scope, messages.get, send_tracking))
+        finally:
+            _current_deadline.reset(token)
+        disconnected = asyncio.create_task(_forward_until_disconnect(receive, messages))
+
+        try:
+            done, _ = await asyncio.wait(
+                {handler, disconnected},
+                timeout=deadline.remaining(),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if disconnected in done and response_complete and handler not in done:
+                # The client left after the whole response: let the handler clean up
+                done, _ = await asyncio.wait({handler}, timeout=deadline.remaining())
+        finally:
+            disconnected.cancel()
+            if not handler.done():
+                handler.cancel()
+                try:
+                    await handler
+                except asyncio.CancelledError:
+                    pass
+
+        method, path = scope["method"], scope["path"]
+        if handler in done:
+            try:
+                handler.result()
+            except Exception as e:
+                if response_started or not _is_deadline_error(e):
+                    raise
+                logger.warning("%s %s ran out of its %gs deadline: %s", method, path, seconds, e)
+                await _send_deadline_response(scope, send)
+        elif disconnected in done:
+            logger.info("%s %s cancelled: client disconnected", method, path)
+        else:
+            logger.warning("%s %s cancelled after its %gs deadline", method, path, seconds)
+            if not response_started:
+                await _send_deadline_response(scope, send)
+
+
+async def _send_deadline_response(scope: Scope, send: Send) -> None:
+    async def no_request_body() -> Message:
+        return {"type": "http.disconnect"}
+
+    response = JSONResponse({"detail": "Request deadline exceeded"}, status_code=504)
+    await response(scope, no_request_body, send)
@@ -1,13 +1,18 @@
+import asyncio
+import hashlib
 from collections.abc import AsyncGenerator
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
-from databricks.sdk import WorkspaceClient
 from fastapi import Depends, Header, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .config import AppConfig
+from .models import User
 from .runtime import Runtime
 
+if TYPE_CHECKING:
+    from databricks.sdk import WorkspaceClient
+
 
 def get_config(request: Request) -> AppConfig:
     """
@@ -41,12 +46,41 @@ def get_runtime(request: Request) -> Runtime:
 RuntimeDep = Annotated[Runtime, Depends(get_runtime)]
 
 
-def get_obo_ws(
-    token: Annotated[str | None, Header(alias="X-Forwarded-Access-Token")] = None,
-) -> WorkspaceClient:
+ForwardedTokenHeader = Annotated[str | None, Header(alias="X-Forwarded-Access-Token")]
+
+
+def _token_key(token: str) -> str:
+    # Cache keys are a hash of the token, so the token itself is never stored
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _obo_client(runtime: Runtime, token: str | None) -> tuple[str, "WorkspaceClient"]:
+    if not token:
+        # The caller's problem, not the server's: 401 rather than a 500
+        raise HTTPException(
+            status_code=401,
+            detail="OBO token is not provided in the header X-Forwarded-Access-Token",
+        )
+
+    key = _token_key(token)
+    ws = runtime.workspace_clients.get(key)
+    if ws is None:
+        from databricks.sdk import WorkspaceClient
+
+        # set pat explicitly to avoid issues with SP client
+        ws = WorkspaceClient(token=token, auth_type="pat")
+        runtime.workspace_clients.set(key, ws)
+    return key, ws
+
+
+async def get_obo_ws(runtime: RuntimeDep, token: ForwardedTokenHeader = None) -> "WorkspaceClient":
     """
     Returns a Databricks Workspace client with authentication behalf of user.
-    If the request contains an X-Forwarded-Access-Token header, on behalf of user authentication is used.
+    If the request contains an X-Forwarded-Access-Token header, on behalf of user authentication is used;
+    without one, the request fails with 401.
+
+    Clients are reused across requests with the same token, from an LRU pool
+    with TTL eviction (workspace_client_cache_size, workspace_client_ttl_seconds).
 
     Example usage:
     @api.get("/items/")
@@ -54,15 +88,22 @@ def get_obo_ws(
         # do something with the obo_ws
         ...
     """
+    return _obo_client(runtime, token)[1]
 
-    if not token:
-        raise ValueError(
-            "OBO token is not provided in the header X-Forwarded-Access-Token"
-        )
 
-    return WorkspaceClient(
-        token=token, auth_type="pat"
-    )  # set pat explicitly to avoid issues with SP client
+async def get_current_user(runtime: RuntimeDep, token: ForwardedTokenHeader = None) -> User:
+    """
+    Returns the calling user's profile, cached per token for current_user_ttl_seconds.
+
+    Concurrent misses for the same token share one current_user.me() call,
+    which runs in a worker thread since the SDK is blocking.
+    """
+    key, obo_ws = _obo_client(runtime, token)
+
+    def load() -> User:
+        return User.model_validate(obo_ws.current_user.me())
+
+    return await runtime.user_profiles.get_or_load(key, lambda: asyncio.to_thread(load))
 
 
 async def get_db_session(
@@ -96,3 +137,31 @@ async def get_db_session(
 
 
 DbSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
+
+
+async def get_read_db_session(
+    runtime: RuntimeDep,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Returns an async database session for read-only work.
+
+    Statements run in autocommit mode and nothing is committed (see
+    database.create_read_session_maker), which saves the BEGIN and COMMIT
+    round trips of get_db_session. The session is on a read replica when one
+    is in rotation (see replicas.py), otherwise on the primary, so it may see
+    data up to db_replica_max_lag_seconds old. Don't write through it.
+    """
+    if not runtime.has_database or runtime.read_router is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Database not configured. Run scripts/lakebase-branch.sh to set up your Lakebase branch.",
+        )
+
+    session = runtime.read_router.session_maker()()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+ReadDbSessionDep = Annotated[AsyncSession, Depends(get_read_db_session)]
@@ -0,0 +1,46 @@
+"""Version tokens and ETag helpers for conditional GETs on catalog endpoints."""
+
+import hashlib
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import __version__
+from .queries import catalog_version_statement
+
+
+async def catalog_version(
+    session: AsyncSession,
+    category_id: int | None = None,
+    product_id: int | None = None,
+) -> str:
+    """
+    Compute a weak ETag for the products (and their inventory) in scope.
+
+    Changes to any row bump its updated_at (see migration 005). Deletes are
+    caught by the scoped row count, or catalog-wide by the last deletion
+    time (migration 009), which keeps the unscoped token to a few index
+    lookups. The app version is mixed in so a deploy that
+    changes the response shape invalidates clients' copies.
+    """
+    scope = {
+        name: value
+        for name, value in (("category_id", category_id), ("product_id", product_id))
+        if value is not None
+    }
+    result = await session.execute(catalog_version_statement(tuple(scope)), scope)
+    parts = [__version__, *(str(value) for value in result.one())]
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
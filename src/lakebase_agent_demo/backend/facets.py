@@ -0,0 +1,91 @@
+"""Facet counts for the product list, computed in one statement.
+
+Every facet comes out of a single scan with GROUPING SETS, one grouping set
+per facet plus the empty set for the totals:
+
+    SELECT grouping(...), category, price_bucket,
+           count(*), count(*) FILTER (WHERE in_scope AND ...) ...
+    FROM categories LEFT JOIN products LEFT JOIN inventory
+    GROUP BY GROUPING SETS ((category), (price_bucket), ())
+
+The category filter is applied with FILTER aggregates rather than WHERE, so
+category counts still cover the whole catalog while the price and stock
+facets only count the products in scope.
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import Integer, bindparam, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .db_models import Category, Inventory, Product
+from .models import CategoryFacetOut, PriceRangeFacetOut, ProductFacetsOut
+
+# Lower bounds of the price ranges after the first, open-ended one
+PRICE_BUCKET_BOUNDS = tuple(Decimal(bound) for bound in (10, 25, 50, 100))
+
+_category_id = bindparam("category_id", type_=Integer)
+_in_scope = or_(_category_id.is_(None), Product.category_id == _category_id)
+_in_stock = func.coalesce(Inventory.quantity, 0) > 0
+# 0 below the first bound, len(PRICE_BUCKET_BOUNDS) at or above the last
+_price_bucket = func.width_bucket(
+    Product.price, literal(list(PRICE_BUCKET_BOUNDS), ARRAY(Product.price.type))
+).label("price_bucket")
+
+# Built once, like the checkout statement
+_FACETS = (
+    select(
+        func.grouping(Category.id, _price_bucket).label("grouping"),
+        Category.id,
+        Category.name,
+        _price_bucket,
+        func.count(Product.id).label("products"),
+        func.count(Product.id).filter(_in_scope).label("in_scope"),
+        func.count(Product.id).filter(_in_scope, _in_stock).label("in_stock"),
+    )
+    .select_from(Category)
+    .outerjoin(Product, Product.category_id == Category.id)
+    .outerjoin(Inventory, Inventory.product_id == Product.id)
+    .group_by(
+        func.grouping_sets(
+            tuple_(Category.id, Category.name), tuple_(_price_bucket), tuple_()
+        )
+    )
+    .order_by(Category.id)
+)
+
+# grouping() bitmasks: a set bit means that column is aggregated away
+_BY_CATEGORY = 0b01
+_BY_PRICE = 0b10
+_TOTALS = 0b11
+
+
+async def load_product_facets(
+    session: AsyncSession, category_id: int | None = None
+) -> ProductFacetsOut:
+    """Compute the product list facets, honouring the same filter as the list."""
+    categories = []
+    bucket_counts = [0] * (len(PRICE_BUCKET_BOUNDS) + 1)
+    in_scope = in_stock = 0
+    for row in await session.execute(_FACETS, {"category_id": category_id}):
+        if row.grouping == _BY_CATEGORY:
+            categories.append(CategoryFacetOut(id=row.id, name=row.name, count=row.products))
+        elif row.grouping == _BY_PRICE:
+            # Categories without products form a NULL bucket
+            if row.price_bucket is not None:
+                bucket_counts[row.price_bucket] = row.in_scope
+        elif row.grouping == _TOTALS:
+            in_scope, in_stock = row.in_scope, row.in_stock
+
+    bounds = [None, *PRICE_BUCKET_BOUNDS, None]
+    return ProductFacetsOut(
+        categories=categories,
+        price_ranges=[
+            PriceRangeFacetOut(min=low, max=high, count=count)
+            for low, high, count in zip(bounds, bounds[1:], bucket_counts)
+        ],
+        in_stock=in_stock,
+        out_of_stock=in_scope - in_stock,
+        total=in_scope,
+    )
@@ -0,0 +1,289 @@
+"""Write-behind buffer for bulk inventory deltas from the warehouse feed.
+
+Deltas are coalesced per product_id in memory and applied as one set-based
+statement when the buffer holds `max_pending` products or `flush_interval`
+seconds have passed, so tens of thousands of adjustments a minute cost a
+handful of statements instead of one round trip (and one pooled
+connection) each.
+
+Buffered deltas live only in this process until flushed: a crash loses at
+most one flush interval's worth, which the feed is expected to reconcile.
+The buffer holds at most `max_buffered` products; past that, batches are
+refused with InventoryBufferFull (503 from the API) until a flush catches
+up, rather than growing without bound while the database is slow or down.
+
+A flush suppresses the inventory trigger's per-row notifications
+(migration 008) and reports the products it wrote to the
+CatalogChangeNotifier, so one flush is one coalesced notification rather
+than one per product.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Iterable
+
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    any_,
+    bindparam,
+    func,
+    literal_column,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .catalog_cache import CatalogChangeNotifier
+from .database import get_session
+from .db_models import Inventory, Product
+from .logger import logger
+from .metrics import LATENCY_BUCKETS, Histogram
+from .models import InventoryIngestMetricsOut
+
+BATCH_SIZE_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000)
+
+_inventory = Inventory.__table__
+_products = Product.__table__
+
+
+def _int_array(name: str):
+    return bindparam(name, type_=ARRAY(Integer))
+
+
+# Unknown ids are refused when a batch is buffered, not silently dropped at
+# flush time
+_KNOWN_PRODUCTS = select(_products.c.id).where(
+    _products.c.id == any_(_int_array("product_ids"))
+)
+
+# Built once, like the checkout statement. Deltas for unknown products are
+# dropped, and stock is clamped at zero rather than failing the whole batch
+# on the CHECK constraint. Existing rows are locked in product_id order, the
+# same order checkout uses, so a flush can't deadlock with checkouts.
+_requested = (
+    func.unnest(_int_array("product_ids"), _int_array("deltas"))
+    .table_valued("product_id", "delta")
+    .render_derived(name="requested")
+)
+_suppress_notify = (
+    select(func.set_config("app.suppress_catalog_notify", "on", True).label("done"))
+    .cte("suppress_notify")
+    .prefix_with("MATERIALIZED")
+)
+# Every write reads its rows from here, so joining the set_config CTE in
+# guarantees it has run whenever anything is written, whichever branch
+_deltas = (
+    select(_requested.c.product_id, _requested.c.delta)
+    .join(_products, _products.c.id == _requested.c.product_id)
+    .join(_suppress_notify, true())
+    .cte("deltas")
+)
+_locked = (
+    select(_inventory.c.product_id)
+    .where(_inventory.c.product_id == any_(_int_array("product_ids")))
+    .order_by(_inventory.c.product_id)
+    .with_for_update()
+    .cte("locked")
+    .prefix_with("MATERIALIZED")
+)
+_updated = (
+    update(_inventory)
+    .values(quantity=func.greatest(_inventory.c.quantity + _deltas.c.delta, 0))
+    .where(
+        _inventory.c.product_id == _deltas.c.product_id,
+        _inventory.c.product_id.in_(select(_locked.c.product_id)),
+    )
+    .returning(_inventory.c.product_id)
+    .cte("updated")
+)
+# Products without an inventory row yet get one. If another worker's flush
+# inserted the row concurrently, the delta is applied to it instead, so it
+# still counts exactly once. That's the raw delta, clamped like the UPDATE;
+# excluded.quantity has already been clamped for a new row.
+_inserted = (
+    insert(_inventory)
+    .from_select(
+        ["product_id", "quantity"],
+        select(_deltas.c.product_id, func.greatest(_deltas.c.delta, 0))
+        .where(_deltas.c.product_id.not_in(select(_updated.c.product_id)))
+        .order_by(_deltas.c.product_id),
+    )
+    .on_conflict_do_update(
+        index_elements=["product_id"],
+        set_={
+            "quantity": func.greatest(
+                _inventory.c.quantity
+                + select(_deltas.c.delta)
+                # Spelled out: SQLAlchemy doesn't correlate into ON CONFLICT
+                .where(_deltas.c.product_id == literal_column("excluded.product_id"))
+                .scalar_subquery(),
+                0,
+            )
+        },
+    )
+    .returning(_inventory.c.product_id)
+    .cte("inserted")
+)
+# Like checkout, the per-row notifications of the UPDATE and INSERT are
+# suppressed by the set_config CTE, which has run by the end of the
+# statement, when their AFTER ROW triggers fire.
+_APPLY_DELTAS = select(_updated.c.product_id).union_all(select(_inserted.c.product_id))
+
+
+class InventoryBufferFull(Exception):
+    """A batch would take the buffer past max_buffered products."""
+
+
+async def unknown_product_ids(session: AsyncSession, product_ids: Iterable[int]) -> list[int]:
+    """The ids in `product_ids` that aren't in the catalog, sorted."""
+    requested = set(product_ids)
+    known = await session.scalars(_KNOWN_PRODUCTS, {"product_ids": sorted(requested)})
+    return sorted(requested.difference(known))
+
+
+async def apply_inventory_deltas(session: AsyncSession, deltas: dict[int, int]) -> list[int]:
+    """Apply coalesced per-product deltas in one statement. Returns the product_ids written."""
+    product_ids = sorted(deltas)
+    result = await session.scalars(
+        _APPLY_DELTAS,
+        {
+            "product_ids": product_ids,
+            "deltas": [deltas[id_] for id_ in product_ids],
+        },
+    )
+    return list(result.all())
+
+
+class InventoryDeltaBuffer:
+    """
+    Coalesces inventory deltas by product_id and flushes them in the background.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_pending: int,
+        flush_interval: float,
+        max_buffered: int,
+        notifier: CatalogChangeNotifier | None = None,
+    ) -> None:
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self._session_maker = session_maker
+        self._notifier = notifier
+        self._pending: dict[int, int] = {}
+        self._pending_deltas = 0
+        self._flush_requested = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.rows_flushed = 0
+        self.rejected_batches = 0
+        self.flush_latency = Histogram(LATENCY_BUCKETS)
+        self.flush_batch_size = Histogram(BATCH_SIZE_BUCKETS)
+
+    @property
+    def pending_products(self) -> int:
+        return len(self._pending)
+
+    def add(self, deltas: list[tuple[int, int]]) -> int:
+        """
+        Buffer (product_id, delta) pairs. Returns how many were added.
+
+        Raises InventoryBufferFull, and buffers none of them, if the new
+        products would take the buffer past `max_buffered`.
+        """
+        new_products = {product_id for product_id, _ in deltas} - self._pending.keys()
+        if len(self._pending) + len(new_products) > self.max_buffered:
+            self.rejected_batches += 1
+            self._flush_requested.set()
+            raise InventoryBufferFull(
+                f"{len(self._pending)} products already pending, limit {self.max_buffered}"
+            )
+        added = 0
+        for product_id, delta in deltas:
+            self._pending[product_id] = self._pending.get(product_id, 0) + delta
+            added += 1
+        self._pending_deltas += added
+        if len(self._pending) >= self.max_pending:
+            self._flush_requested.set()
+        return added
+
+    async def flush(self) -> int:
+        """Apply everything buffered so far. Returns rows written."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        batch_deltas, self._pending_deltas = self._pending_deltas, 0
+        started = time.perf_counter()
+        try:
+            async with get_session(self._session_maker) as session:
+                written = await apply_inventory_deltas(session, batch)
+        except BaseException:
+            # Put the batch back, merged with anything added meanwhile
+            for product_id, delta in batch.items():
+                self._pending[product_id] = self._pending.get(product_id, 0) + delta
+            self._pending_deltas += batch_deltas
+            self.failed_flushes += 1
+            raise
+        self.flush_latency.observe(time.perf_counter() - started)
+        self.flush_batch_size.observe(len(batch))
+        self.flushes += 1
+        self.rows_flushed += len(written)
+        if self._notifier:
+            # Committed by now
+            self._notifier.add("inventory", written)
+        return len(written)
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(
+                    "Inventory delta flush failed (%s); %d products pending",
+                    e,
+                    len(self._pending),
+                )
+                await asyncio.sleep(self.flush_interval)
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and flush whatever is still buffered."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception(
+                "Final inventory delta flush failed; %d products dropped",
+                len(self._pending),
+            )
+
+    def metrics(self) -> InventoryIngestMetricsOut:
+        return InventoryIngestMetricsOut(
+            pending_products=len(self._pending),
+            pending_deltas=self._pending_deltas,
+            flushes=self.flushes,
+            failed_flushes=self.failed_flushes,
+            rows_flushed=self.rows_flushed,
+            rejected_batches=self.rejected_batches,
+            flush_latency_seconds=self.flush_latency.snapshot(),
+            flush_batch_size=self.flush_batch_size.snapshot(),
+        )
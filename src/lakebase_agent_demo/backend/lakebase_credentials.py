@@ -1,15 +1,125 @@
 """Resolve Lakebase DB credentials: from env (local) or via Databricks OAuth (deployed app)."""
 
 import os
+import random
 import threading
 import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
 
 from .._metadata import app_slug
+from .logger import logger
 
-# Token cache for OAuth: (password, expiry_ts). Refreshed before expiry (e.g. 45 min TTL).
-_oauth_token_cache: tuple[str, float] | None = None
-_oauth_token_lock = threading.Lock()
-_OAUTH_TOKEN_TTL_SECONDS = 45 * 60  # 45 minutes; tokens expire in 1 hour
+# Tokens are valid for an hour; when the API doesn't say, assume that
+_DEFAULT_TOKEN_LIFETIME_SECONDS = 60 * 60
+
+
+@dataclass(frozen=True)
+class DatabaseToken:
+    password: str
+    expires_at: float  # Unix time
+
+
+# Mints a new token (blocking, typically an HTTPS call to the workspace)
+TokenProvider = Callable[[], DatabaseToken]
+
+
+class CredentialRefresher:
+    """
+    Keeps a current database token, renewing it ahead of expiry in a background thread.
+
+    `password()` only calls the provider itself when there is no usable token:
+    the first time, or if the token expired because every renewal since
+    failed. Otherwise it returns the cached token without blocking, so opening
+    connections never waits on the network. The renewal is scheduled after
+    `refresh_fraction` of the token's lifetime, minus up to `jitter_fraction`
+    of it at random so workers don't all renew at once. A failed renewal is
+    retried with exponential backoff (with jitter) between `min_backoff` and
+    `max_backoff` seconds, and the old token stays in use meanwhile.
+    """
+
+    def __init__(
+        self,
+        provider: TokenProvider,
+        *,
+        refresh_fraction: float = 0.75,
+        jitter_fraction: float = 0.1,
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ) -> None:
+        self._provider = provider
+        self.refresh_fraction = refresh_fraction
+        self.jitter_fraction = jitter_fraction
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._token: DatabaseToken | None = None
+        self._issued_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def password(self) -> str:
+        token = self._token
+        if token is None or time.time() >= token.expires_at:
+            with self._lock:
+                token = self._token
+                if token is None or time.time() >= token.expires_at:
+                    token = self._refresh()
+        self._start()
+        return token.password
+
+    def _refresh(self) -> DatabaseToken:
+        token = self._provider()
+        self._token, self._issued_at = token, time.time()
+        self.refreshes += 1
+        return token
+
+    def _start(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="lakebase-credential-refresher", daemon=True
+                    )
+                    self._thread.start()
+
+    def _next_refresh_in(self) -> float:
+        lifetime = self._token.expires_at - self._issued_at
+        jitter = random.uniform(0, lifetime * self.jitter_fraction)
+        return self._issued_at + lifetime * self.refresh_fraction - jitter - time.time()
+
+    def _run(self) -> None:
+        backoff = self.min_backoff
+        delay = self._next_refresh_in()
+        while not self._stop.wait(max(delay, 0)):
+            try:
+                with self._lock:
+                    self._refresh()
+            except Exception as e:
+                self.failures += 1
+                delay = random.uniform(backoff / 2, backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                logger.warning(
+                    "Lakebase credential refresh failed, retrying in %.1fs: %r", delay, e
+                )
+            else:
+                backoff = self.min_backoff
+                delay = self._next_refresh_in()
+
+    def stop(self) -> None:
+        """Stop the background renewal (it is restarted by the next password())."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+        self._stop.clear()
+
+
+_refresher: CredentialRefresher | None = None
+_refresher_lock = threading.Lock()
 
 
 def _is_oauth_mode() -> bool:
@@ -44,9 +154,20 @@ def _resolve_env_credentials() -> tuple[str, str]:
 
 
 def _resolve_oauth_credentials() -> tuple[str, str]:
-    """Mint OAuth token via Databricks SDK; return (client_id, token) as (user, password)."""
+    """Return (client_id, token) as (user, password), minting a token only if needed."""
+    return (os.environ.get("DATABRICKS_CLIENT_ID", ""), _get_refresher().password())
+
+
+@cache
+def _workspace_client(host: str, client_id: str, client_secret: str):
+    """One long-lived SDK client, so renewals reuse its OAuth session and HTTP connections."""
     from databricks.sdk import WorkspaceClient
 
+    return WorkspaceClient(host=host, client_id=client_id, client_secret=client_secret)
+
+
+def oauth_token_provider() -> TokenProvider:
+    """Token provider minting Lakebase credentials via postgres.generate_database_credential."""
     client_id = os.environ.get("DATABRICKS_CLIENT_ID", "")
     client_secret = os.environ.get("DATABRICKS_CLIENT_SECRET", "")
     host = os.environ.get("DATABRICKS_HOST", "")
@@ -68,28 +189,36 @@ def _resolve_oauth_credentials() -> tuple[str, str]:
     if not host.startswith("http"):
         host = f"https://{host}"
 
-    w = WorkspaceClient(host=host, client_id=client_id, client_secret=client_secret)
-    credential = w.postgres.generate_database_credential(endpoint=endpoint)
-    token = credential.token or ""
-    return (client_id, token)
+    def provide() -> DatabaseToken:
+        w = _workspace_client(host, client_id, client_secret)
+        credential = w.postgres.generate_database_credential(endpoint=endpoint)
+        if credential.expire_time is not None:
+            expires_at = float(credential.expire_time.ToSeconds())
+        else:
+            expires_at = time.time() + _DEFAULT_TOKEN_LIFETIME_SECONDS
+        return DatabaseToken(password=credential.token or "", expires_at=expires_at)
+
+    return provide
+
+
+def _get_refresher() -> CredentialRefresher:
+    global _refresher
+    if _refresher is None:
+        with _refresher_lock:
+            if _refresher is None:
+                _refresher = CredentialRefresher(oauth_token_provider())
+    return _refresher
 
 
 def get_password_for_connection() -> str:
     """
     Return the current DB password for use when opening a new connection.
 
-    In OAuth mode, returns a cached token and refreshes it if expired (or missing).
+    In OAuth mode, returns the token kept current by the background
+    CredentialRefresher; only the very first call waits for one to be minted.
     Call this from pool/dialect hooks (e.g. do_connect) so each new connection
     uses a valid token. Not for use in non-OAuth mode (caller should check _is_oauth_mode first).
     """
-    global _oauth_token_cache
     if not _is_oauth_mode():
         return ""
-    with _oauth_token_lock:
-        now = time.time()
-        if _oauth_token_cache is not None and now < _oauth_token_cache[1]:
-            return _oauth_token_cache[0]
-        _, password = _resolve_oauth_credentials()
-        expiry = now + _OAUTH_TOKEN_TTL_SECONDS
-        _oauth_token_cache = (password, expiry)
-        return password
+    return _get_refresher().password()
@@ -0,0 +1,39 @@
+"""Minimal in-process metrics for the internal metrics endpoints."""
+
+import math
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from .models import HistogramOut
+
+# Seconds; suits latencies from sub-millisecond queries up to slow flushes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with Prometheus-style cumulative bucket counts.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> HistogramOut:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*self.buckets, math.inf), self._counts):
+            cumulative += count
+            buckets["+Inf" if bound == math.inf else f"{bound:g}"] = cumulative
+        return HistogramOut(count=self.count, sum=self.sum, max=self.max, buckets=buckets)
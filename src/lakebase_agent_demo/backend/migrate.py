@@ -0,0 +1,181 @@
+"""Schema migrations at startup, skipped cheaply when there is nothing to do.
+
+Importing Alembic and loading its environment and revision scripts costs a
+few hundred milliseconds, and `alembic upgrade head` opens its own
+connection, on every boot. Nearly always the schema is already at head, so
+startup first reads alembic_version over the app's pool and compares it with
+the head revision of the packaged migrations, which is found by parsing the
+revision scripts rather than importing them. Alembic only runs when they
+differ, or when either can't be determined.
+
+Every worker process of every app instance does this at boot. So that only
+one of them migrates, Alembic runs under a Postgres advisory lock: the
+others wait for it, then find the schema at head and move on. Deployments
+can also migrate once, as a separate step, and turn startup migrations off:
+
+    python -m lakebase_agent_demo.backend.migrate
+    LAKEBASE_AGENT_DEMO_RUN_MIGRATIONS_ON_STARTUP=false
+"""
+
+import ast
+import asyncio
+import hashlib
+import logging
+import time
+from functools import cache
+from importlib import resources
+from importlib.abc import Traversable
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .._metadata import app_slug
+from .config import AppConfig
+from .database import create_engine
+from .logger import logger
+
+VERSION_TABLE_QUERY = text("SELECT version_num FROM alembic_version")
+
+# Advisory lock keys are a bigint shared by everything on the database, so
+# derive this app's from its name rather than picking a small number
+MIGRATION_LOCK_KEY = int.from_bytes(
+    hashlib.sha256(f"{app_slug}:migrations".encode()).digest()[:8], "big", signed=True
+)
+TRY_LOCK = text("SELECT pg_try_advisory_lock(:key)").bindparams(key=MIGRATION_LOCK_KEY)
+UNLOCK = text("SELECT pg_advisory_unlock(:key)").bindparams(key=MIGRATION_LOCK_KEY)
+LOCK_POLL_SECONDS = 0.5
+
+
+class MigrationLockTimeout(Exception):
+    """Another process held the migration lock for longer than migration_lock_timeout_seconds."""
+
+
+def _migrations_dir() -> Traversable:
+    return resources.files(app_slug).joinpath("backend", "migrations")
+
+
+def _revision_ids(source: str) -> tuple[str | None, tuple[str, ...]]:
+    """The `revision` and `down_revision` assigned at the top of a revision script."""
+    revision, down_revisions = None, ()
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            target, value = node.target, node.value
+        else:
+            continue
+        if not isinstance(target, ast.Name):
+            continue
+        if target.id == "revision":
+            revision = ast.literal_eval(value)
+        elif target.id == "down_revision":
+            down = ast.literal_eval(value)
+            down_revisions = (down,) if isinstance(down, str) else tuple(down or ())
+    return revision, down_revisions
+
+
+@cache
+def packaged_head() -> str | None:
+    """
+    Head revision of the packaged migrations, without importing Alembic.
+
+    None when there isn't exactly one head (a branch waiting for a merge
+    revision); Alembic then decides what to do.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for script in _migrations_dir().joinpath("versions").iterdir():
+        if not script.name.endswith(".py"):
+            continue
+        revision, down_revisions = _revision_ids(script.read_text())
+        if revision is not None:
+            revisions.add(revision)
+            parents.update(down_revisions)
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+async def database_revisions(connection: AsyncConnection) -> set[str]:
+    """Revisions recorded in alembic_version; empty if it doesn't exist yet."""
+    try:
+        revisions = set((await connection.scalars(VERSION_TABLE_QUERY)).all())
+    except ProgrammingError:
+        # UndefinedTable: a new database, never migrated
+        revisions = set()
+    # End the transaction, so nothing is held while waiting or migrating
+    await connection.rollback()
+    return revisions
+
+
+async def _wait_for_lock(connection: AsyncConnection, timeout: float) -> None:
+    """Take the session-level migration lock, polling so the event loop isn't blocked."""
+    give_up_at = time.monotonic() + timeout
+    while not await connection.scalar(TRY_LOCK):
+        await connection.rollback()
+        if time.monotonic() >= give_up_at:
+            raise MigrationLockTimeout(
+                f"Migration lock still held by another process after {timeout:g}s"
+            )
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+    await connection.rollback()
+
+
+def upgrade_to_head() -> None:
+    """Run `alembic upgrade head` on the configured database."""
+    # Imported here: only needed when the schema is behind
+    from alembic import command
+    from alembic.config import Config
+
+    alembic_cfg = Config()
+    alembic_cfg.set_main_option("script_location", str(_migrations_dir()))
+    command.upgrade(alembic_cfg, "head")
+
+
+async def migrate(config: AppConfig, engine: AsyncEngine) -> None:
+    """
+    Bring the schema to head when the DB is configured, skipping Alembic if it already is.
+
+    Concurrent callers, in any process, are serialized by an advisory lock;
+    those that waited re-check the version before running Alembic.
+    """
+    if not config.database_url_sync:
+        return
+    head = packaged_head()
+    async with engine.connect() as connection:
+        if head is not None and await database_revisions(connection) == {head}:
+            logger.info("Database schema is at head (%s), skipping migrations", head)
+            return
+        started = time.monotonic()
+        await _wait_for_lock(connection, config.migration_lock_timeout_seconds)
+        try:
+            if head is not None and await database_revisions(connection) == {head}:
+                logger.info(
+                    "Database schema migrated to %s by another process (waited %.1fs)",
+                    head,
+                    time.monotonic() - started,
+                )
+                return
+            upgrade_to_head()
+            logger.info("Alembic migrations applied successfully")
+        except Exception as e:
+            logger.exception("Alembic upgrade failed: %s", e)
+            raise
+        finally:
+            # Also released if the connection drops, e.g. this process dies
+            await connection.execute(UNLOCK)
+            await connection.commit()
+
+
+async def _main() -> None:
+    config = AppConfig()
+    engine = create_engine(config)
+    try:
+        await migrate(config, engine)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    asyncio.run(_main())
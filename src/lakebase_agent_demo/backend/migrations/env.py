@@ -9,6 +9,7 @@ from sqlalchemy.engine import create_engine
 # Import our modules (path is set via alembic.ini prepend_sys_path)
 from lakebase_agent_demo.backend.config import AppConfig
 from lakebase_agent_demo.backend.db_models import Base
+from lakebase_agent_demo.backend.online_migrations import CHECKPOINT_TABLE
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -25,6 +26,11 @@ target_metadata = Base.metadata
 app_config = AppConfig()
 
 
+def include_name(name, type_, parent_names) -> bool:
+    """Leave online_migrations' checkpoint table out of autogenerate."""
+    return not (type_ == "table" and name == CHECKPOINT_TABLE)
+
+
 def get_url() -> str:
     """Get the database URL from environment configuration."""
     url = app_config.database_url_sync
@@ -53,6 +59,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -71,7 +78,14 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        # One transaction per revision: online_migrations' autocommit blocks
+        # commit the work before them, so keep that to the current revision
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            transaction_per_migration=True,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -17,6 +17,17 @@ down_revision: Union[str, Sequence[str], None] = ${repr(down_revision)}
 branch_labels: Union[str, Sequence[str], None] = ${repr(branch_labels)}
 depends_on: Union[str, Sequence[str], None] = ${repr(depends_on)}
 
+# On large tables (products, inventory), don't hold locks for the length of
+# an index build or a rewrite; see lakebase_agent_demo.backend.online_migrations:
+#
+#   from lakebase_agent_demo.backend.online_migrations import (
+#       backfill, create_index_concurrently, with_lock_timeout,
+#   )
+#
+#   with_lock_timeout(lambda: op.add_column("products", sa.Column("sku", sa.Text())))
+#   backfill(revision, "products", "sku = 'P-' || id", "sku IS NULL")
+#   create_index_concurrently("ix_products_sku", "products", ["sku"], unique=True)
+
 
 def upgrade() -> None:
     """Upgrade schema."""
@@ -0,0 +1,33 @@
+"""Composite index backing keyset pagination of products by category.
+
+Revision ID: 003_products_keyset_index
+Revises: 002_seed_data
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from lakebase_agent_demo.backend.online_migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "003_products_keyset_index"
+down_revision: Union[str, None] = "002_seed_data"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves `WHERE category_id = ? AND id > ? ORDER BY category_id, id` (see
+    # queries.product_page_statement): an index range scan from the cursor.
+    # Built concurrently, so writes to products carry on meanwhile
+    create_index_concurrently(
+        "ix_products_category_id_id", "products", ["category_id", "id"]
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_products_category_id_id", "products")
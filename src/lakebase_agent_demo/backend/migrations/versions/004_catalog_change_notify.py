@@ -0,0 +1,60 @@
+"""NOTIFY on catalog changes so app caches can evict affected entries.
+
+Revision ID: 004_catalog_change_notify
+Revises: 003_products_keyset_index
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004_catalog_change_notify"
+down_revision: Union[str, None] = "003_products_keyset_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Table -> column identifying the product/category the row belongs to
+TABLES = {
+    "categories": "id",
+    "products": "id",
+    "inventory": "product_id",
+}
+
+
+def upgrade() -> None:
+    # Payload is "<table>:<id>"; identical payloads within a transaction are
+    # delivered once by Postgres, so repeated updates to a row stay cheap.
+    op.execute(
+        """
+        CREATE FUNCTION notify_catalog_change() RETURNS trigger AS $$
+        DECLARE
+            row_id text;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_id := to_jsonb(OLD) ->> TG_ARGV[0];
+            ELSE
+                row_id := to_jsonb(NEW) ->> TG_ARGV[0];
+            END IF;
+            PERFORM pg_notify('catalog_changes', TG_TABLE_NAME || ':' || row_id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, id_column in TABLES.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify_catalog_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_catalog_change('{id_column}')
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_catalog_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_catalog_change()")
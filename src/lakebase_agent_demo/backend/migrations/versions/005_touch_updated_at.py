@@ -0,0 +1,60 @@
+"""Keep updated_at current on every catalog write, including raw SQL.
+
+Conditional GETs derive their ETag from max(updated_at), so the column has
+to move on every UPDATE, not only on ORM writes that apply `onupdate`.
+
+Revision ID: 005_touch_updated_at
+Revises: 004_catalog_change_notify
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005_touch_updated_at"
+down_revision: Union[str, None] = "004_catalog_change_notify"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["categories", "products", "inventory"]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "categories",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        CREATE FUNCTION touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_touch_updated_at
+            BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION touch_updated_at()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_touch_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS touch_updated_at()")
+    op.drop_column("categories", "updated_at")
@@ -0,0 +1,56 @@
+"""Full-text search column and GIN index on products.
+
+Adding a stored generated column rewrites the whole products table, under
+an ACCESS EXCLUSIVE lock that blocks reads and writes until it's done:
+schedule this revision for a quiet window on a large catalog. The GIN index
+is built concurrently afterwards, so that part doesn't block writes.
+
+Revision ID: 006_product_search
+Revises: 005_touch_updated_at
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from lakebase_agent_demo.backend.online_migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "006_product_search"
+down_revision: Union[str, None] = "005_touch_updated_at"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "products",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    create_index_concurrently(
+        "ix_products_search_vector",
+        "products",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_products_search_vector", "products")
+    op.drop_column("products", "search_vector")
@@ -0,0 +1,53 @@
+"""Let bulk writers suppress per-row catalog change notifications.
+
+A transaction that sets `app.suppress_catalog_notify = on` (SET LOCAL)
+skips the per-row pg_notify and is expected to send a single catalog-wide
+notification itself, as the catalog import does. Per-row notifications
+would otherwise dominate the cost of loading large catalogs.
+
+Revision ID: 008_catalog_notify_suppress
+Revises: 007_orders
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008_catalog_notify_suppress"
+down_revision: Union[str, None] = "007_orders"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FUNCTION = """
+    CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS trigger AS $$
+    DECLARE
+        row_id text;
+    BEGIN
+        {suppress}
+        IF TG_OP = 'DELETE' THEN
+            row_id := to_jsonb(OLD) ->> TG_ARGV[0];
+        ELSE
+            row_id := to_jsonb(NEW) ->> TG_ARGV[0];
+        END IF;
+        PERFORM pg_notify('catalog_changes', TG_TABLE_NAME || ':' || row_id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+SUPPRESS = """
+        IF current_setting('app.suppress_catalog_notify', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+"""
+
+
+def upgrade() -> None:
+    op.execute(FUNCTION.format(suppress=SUPPRESS))
+
+
+def downgrade() -> None:
+    op.execute(FUNCTION.format(suppress=""))
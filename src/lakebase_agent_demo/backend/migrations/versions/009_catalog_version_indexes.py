@@ -0,0 +1,72 @@
+"""Index-backed catalog version token: updated_at indexes and deletion times.
+
+The catalog-wide ETag was max(updated_at) of three tables plus a product
+count, over a join of all of them: a full scan whenever the version cache
+was invalidated. With an index on each updated_at, each max() reads one
+index entry. The count was only there to notice deletes, which leave no
+updated_at behind; a statement-level trigger records when each table last
+had rows deleted instead.
+
+Revision ID: 009_catalog_version_indexes
+Revises: 008_catalog_notify_suppress
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from lakebase_agent_demo.backend.online_migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "009_catalog_version_indexes"
+down_revision: Union[str, None] = "008_catalog_notify_suppress"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["categories", "products", "inventory"]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_deletions",
+        sa.Column("table_name", sa.Text(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    op.execute(
+        """
+        CREATE FUNCTION record_catalog_deletion() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO catalog_deletions (table_name, deleted_at)
+            VALUES (TG_TABLE_NAME, now())
+            ON CONFLICT (table_name) DO UPDATE SET deleted_at = excluded.deleted_at;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_record_catalog_deletion
+            AFTER DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION record_catalog_deletion()
+            """
+        )
+    for table in TABLES:
+        create_index_concurrently(f"ix_{table}_updated_at", table, ["updated_at"])
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        drop_index_concurrently(f"ix_{table}_updated_at", table)
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_record_catalog_deletion ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS record_catalog_deletion()")
+    op.drop_table("catalog_deletions")
@@ -1,7 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .. import __version__
 
@@ -14,6 +16,69 @@ class VersionOut(BaseModel):
         return cls(version=__version__)
 
 
+class ReadinessOut(BaseModel):
+    """Whether startup warm-up is done, and what it warmed."""
+
+    ready: bool
+    connections: int
+    warmup_seconds: float | None = None
+
+
+# ============================================================================
+# User Models
+# ============================================================================
+# Mirrors of databricks.sdk.service.iam.User and its parts, with the same
+# schema names and fields, so the API doesn't import the SDK to declare them.
+
+
+class ComplexValue(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    display: str | None = None
+    primary: bool | None = None
+    ref: str | None = None
+    type: str | None = None
+    value: str | None = None
+
+
+class Name(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    family_name: str | None = None
+    given_name: str | None = None
+
+
+class UserSchema(str, Enum):
+    URN_IETF_PARAMS_SCIM_SCHEMAS_CORE_2_0_USER = "urn:ietf:params:scim:schemas:core:2.0:User"
+    URN_IETF_PARAMS_SCIM_SCHEMAS_EXTENSION_WORKSPACE_2_0_USER = (
+        "urn:ietf:params:scim:schemas:extension:workspace:2.0:User"
+    )
+
+
+class User(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    active: bool | None = None
+    display_name: str | None = None
+    emails: list[ComplexValue] | None = None
+    entitlements: list[ComplexValue] | None = None
+    external_id: str | None = None
+    groups: list[ComplexValue] | None = None
+    id: str | None = None
+    name: Name | None = None
+    roles: list[ComplexValue] | None = None
+    schemas: list[UserSchema] | None = None
+    user_name: str | None = None
+
+    @field_validator("schemas", mode="before")
+    @classmethod
+    def schema_values(cls, schemas: list | None) -> list | None:
+        # The SDK's UserSchema is a plain Enum, so match on its values
+        if schemas is None:
+            return None
+        return [getattr(schema, "value", schema) for schema in schemas]
+
+
 # ============================================================================
 # Category Models
 # ============================================================================
@@ -82,3 +147,207 @@ class ProductListOut(BaseModel):
     category_id: int
     category_name: str | None = None
     quantity: int | None = None
+
+
+class ProductBatchOut(BaseModel):
+    """Products for a batch of ids, in request order, plus ids that were not found."""
+
+    items: list[ProductOut]
+    missing: list[int]
+
+
+class CategoryWithProductsOut(CategoryOut):
+    """Category response model; products are only present when requested."""
+
+    products: list[ProductListOut] | None = None
+
+
+class ProductPageOut(BaseModel):
+    """One page of products with an opaque cursor for the next page."""
+
+    items: list[ProductListOut]
+    next_cursor: str | None = None
+    approximate_total: int
+
+
+class CategoryFacetOut(BaseModel):
+    """Number of products in one category."""
+
+    id: int
+    name: str
+    count: int
+
+
+class PriceRangeFacetOut(BaseModel):
+    """Number of products priced in [min, max); open-ended at either end when null."""
+
+    min: Decimal | None = None
+    max: Decimal | None = None
+    count: int
+
+
+class ProductFacetsOut(BaseModel):
+    """
+    Facet counts for the product list.
+
+    Category counts cover the whole catalog, so every filter option can show
+    its count; the other facets only cover the products matching the filter.
+    """
+
+    categories: list[CategoryFacetOut]
+    price_ranges: list[PriceRangeFacetOut]
+    in_stock: int
+    out_of_stock: int
+    total: int
+
+
+# ============================================================================
+# Checkout Models
+# ============================================================================
+
+
+class CheckoutItemIn(BaseModel):
+    """One cart line to reserve."""
+
+    product_id: int
+    quantity: int = Field(gt=0)
+
+
+class CheckoutIn(BaseModel):
+    """
+    Checkout request.
+
+    `all_or_nothing` fails the whole cart if any line can't be reserved in
+    full; `partial` reserves the lines that fit and leaves the rest at 0.
+    """
+
+    items: list[CheckoutItemIn] = Field(min_length=1, max_length=500)
+    mode: Literal["all_or_nothing", "partial"] = "all_or_nothing"
+
+
+class OrderItemOut(BaseModel):
+    """Order line response model."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    product_id: int
+    quantity_requested: int
+    quantity_reserved: int
+    unit_price: Decimal
+
+
+class OrderOut(BaseModel):
+    """Order response model."""
+
+    id: int
+    status: str
+    created_at: datetime
+    items: list[OrderItemOut]
+    total: Decimal
+
+
+# ============================================================================
+# Inventory Ingestion Models
+# ============================================================================
+
+
+class InventoryDeltaIn(BaseModel):
+    """A stock adjustment from the warehouse feed (positive or negative)."""
+
+    product_id: int
+    delta: int
+
+
+class InventoryDeltasIn(BaseModel):
+    """A batch of stock adjustments."""
+
+    deltas: list[InventoryDeltaIn] = Field(min_length=1, max_length=10_000)
+
+
+class InventoryDeltasAcceptedOut(BaseModel):
+    """Acknowledgement that a batch was buffered for the next flush."""
+
+    accepted: int
+    pending_products: int
+
+
+# ============================================================================
+# Catalog Import Models
+# ============================================================================
+
+
+class CatalogImportOut(BaseModel):
+    """Outcome of a bulk catalog import."""
+
+    rows: int
+    categories_created: int
+    products_created: int
+    products_updated: int
+    inventory_rows: int
+    seconds: float
+    # Of which reading, validating and COPYing the file into staging; the
+    # rest is the merge
+    copy_seconds: float
+
+
+# ============================================================================
+# Metrics Models
+# ============================================================================
+
+
+class HistogramOut(BaseModel):
+    """Histogram snapshot; `buckets` maps upper bound to cumulative count."""
+
+    count: int
+    sum: float
+    max: float
+    buckets: dict[str, int]
+
+
+class InventoryIngestMetricsOut(BaseModel):
+    """Write-behind inventory buffer metrics."""
+
+    pending_products: int
+    pending_deltas: int
+    flushes: int
+    failed_flushes: int
+    rows_flushed: int
+    rejected_batches: int
+    flush_latency_seconds: HistogramOut
+    flush_batch_size: HistogramOut
+
+
+class ReplicaStatusOut(BaseModel):
+    """Health and lag of one read-only endpoint, as of its last check."""
+
+    host: str
+    in_rotation: bool
+    lag_seconds: float | None = None
+    checked_at: datetime | None = None
+    error: str | None = None
+    sessions: int
+
+
+class ReadRoutingMetricsOut(BaseModel):
+    """Where read sessions are being routed, and why."""
+
+    max_lag_seconds: float
+    replicas: list[ReplicaStatusOut]
+    primary_sessions: int
+    replica_sessions: int
+
+
+class PoolMetricsOut(BaseModel):
+    """Live state of one connection pool."""
+
+    name: str
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    waiting: int
+    timeouts: int
+    pre_pings: int
+    stale_connections: int
+    checkout_wait_seconds: HistogramOut
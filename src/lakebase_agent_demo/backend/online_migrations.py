@@ -0,0 +1,252 @@
+"""Helpers for migrations that must not stall the storefront on large tables.
+
+Plain `op.create_index` and `op.execute` inside the migration's transaction
+are fine on small tables, but on products/inventory with millions of rows
+they hold locks that block checkout and imports for as long as they run.
+Revision scripts (see script.py.mako) can use instead:
+
+- create_index_concurrently / drop_index_concurrently: CREATE/DROP INDEX
+  CONCURRENTLY, outside the transaction. Writes carry on while the index
+  builds; a build that failed half way leaves an INVALID index, which is
+  dropped and rebuilt on the next run.
+- backfill: an UPDATE in short batches walked by primary key, each its own
+  transaction, with a pause between them. Progress is checkpointed in
+  online_migration_checkpoints, so a backfill that is interrupted resumes
+  where it stopped.
+- with_lock_timeout: run a DDL step with a short lock_timeout and retry it
+  with backoff, so a step queued behind a long transaction gives up quickly
+  instead of making every other query queue behind it.
+
+These need a live connection, so they don't work in offline (--sql) mode.
+"""
+
+import time
+from collections.abc import Callable, Sequence
+
+from alembic import op
+from psycopg.errors import LockNotAvailable
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import OperationalError
+
+from .catalog_cache import CATALOG_CHANNEL
+from .logger import logger
+
+DEFAULT_LOCK_TIMEOUT_MS = 2000
+DEFAULT_ATTEMPTS = 5
+DEFAULT_RETRY_DELAY_SECONDS = 1.0
+
+CHECKPOINT_TABLE = "online_migration_checkpoints"
+
+_CREATE_CHECKPOINTS = f"""
+    CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+        name text PRIMARY KEY,
+        last_key bigint NOT NULL,
+        rows_done bigint NOT NULL DEFAULT 0,
+        updated_at timestamptz NOT NULL DEFAULT now()
+    )
+"""
+_READ_CHECKPOINT = text(
+    f"SELECT last_key, rows_done FROM {CHECKPOINT_TABLE} WHERE name = :name"
+)
+_DELETE_CHECKPOINT = text(f"DELETE FROM {CHECKPOINT_TABLE} WHERE name = :name")
+_INVALID_INDEX = text(
+    "SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:name) AND NOT indisvalid"
+)
+
+
+def _is_autocommit(bind: Connection) -> bool:
+    return bind.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+
+
+def with_lock_timeout(
+    step: Callable[[], None],
+    *,
+    lock_timeout_ms: int = DEFAULT_LOCK_TIMEOUT_MS,
+    attempts: int = DEFAULT_ATTEMPTS,
+    retry_delay: float = DEFAULT_RETRY_DELAY_SECONDS,
+) -> None:
+    """
+    Run `step` with lock_timeout set, retrying when it times out waiting for a lock.
+
+    The delay doubles after each attempt. Inside the migration's transaction
+    each attempt runs in a savepoint, so a timed-out attempt is rolled back
+    without aborting the migration; in an autocommit block, the step must be
+    a single statement (as CREATE INDEX CONCURRENTLY is).
+    """
+    bind = op.get_bind()
+    for attempt in range(1, attempts + 1):
+        try:
+            if _is_autocommit(bind):
+                bind.exec_driver_sql(f"SET lock_timeout = {lock_timeout_ms}")
+                try:
+                    step()
+                finally:
+                    bind.exec_driver_sql("RESET lock_timeout")
+            else:
+                with bind.begin_nested():
+                    bind.exec_driver_sql(f"SET LOCAL lock_timeout = {lock_timeout_ms}")
+                    step()
+                    bind.exec_driver_sql("SET LOCAL lock_timeout = DEFAULT")
+            return
+        except OperationalError as e:
+            if not isinstance(e.orig, LockNotAvailable) or attempt == attempts:
+                raise
+            delay = retry_delay * 2 ** (attempt - 1)
+            logger.warning(
+                "Lock not available (attempt %d of %d), retrying in %.1fs: %s",
+                attempt,
+                attempts,
+                delay,
+                e.orig,
+            )
+            time.sleep(delay)
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: Sequence[str],
+    *,
+    lock_timeout_ms: int = DEFAULT_LOCK_TIMEOUT_MS,
+    attempts: int = DEFAULT_ATTEMPTS,
+    **kw,
+) -> None:
+    """
+    op.create_index with CONCURRENTLY, in an autocommit block.
+
+    Extra keyword arguments go to op.create_index (unique=, postgresql_where=,
+    postgresql_using=, ...). The build waits for transactions already running
+    on the table; `lock_timeout_ms` bounds each wait before a retry.
+    """
+    def build() -> None:
+        if op.get_bind().scalar(_INVALID_INDEX, {"name": index_name}):
+            logger.warning("Dropping invalid index %s left by a failed build", index_name)
+            op.drop_index(
+                index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True
+            )
+        op.create_index(
+            index_name,
+            table_name,
+            list(columns),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+    with op.get_context().autocommit_block():
+        with_lock_timeout(build, lock_timeout_ms=lock_timeout_ms, attempts=attempts)
+
+
+def drop_index_concurrently(
+    index_name: str,
+    table_name: str,
+    *,
+    lock_timeout_ms: int = DEFAULT_LOCK_TIMEOUT_MS,
+    attempts: int = DEFAULT_ATTEMPTS,
+) -> None:
+    """op.drop_index with CONCURRENTLY, in an autocommit block."""
+
+    def drop() -> None:
+        op.drop_index(
+            index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True
+        )
+
+    with op.get_context().autocommit_block():
+        with_lock_timeout(drop, lock_timeout_ms=lock_timeout_ms, attempts=attempts)
+
+
+def backfill(
+    name: str,
+    table_name: str,
+    assignments: str,
+    where: str = "true",
+    *,
+    key: str = "id",
+    batch_size: int = 1000,
+    pause_seconds: float = 0.1,
+    lock_timeout_ms: int = DEFAULT_LOCK_TIMEOUT_MS,
+    attempts: int = DEFAULT_ATTEMPTS,
+    log_every_seconds: float = 10.0,
+) -> int:
+    """
+    `UPDATE table_name SET assignments WHERE where`, in batches of `batch_size` keys.
+
+    `name` identifies the backfill's checkpoint; use the revision id. Batches
+    walk the integer primary key `key` in order, each a single statement that
+    also advances the checkpoint, so a backfill that is interrupted resumes
+    after the last batch that committed. `where` should exclude rows already
+    done (e.g. `new_col IS NULL`) so re-runs are cheap. Per-row catalog
+    notifications are suppressed (see migration 008); one catalog-wide
+    notification is sent at the end. Returns the number of rows updated,
+    including by earlier, interrupted runs.
+    """
+    next_upper_key = text(
+        f"SELECT max({key}) FROM (SELECT {key} FROM {table_name}"
+        f" WHERE {key} > :after ORDER BY {key} LIMIT :batch_size) AS batch"
+    )
+    update_batch = text(
+        f"""
+        WITH updated AS (
+            UPDATE {table_name} SET {assignments}
+            WHERE {key} > :after AND {key} <= :upto AND ({where})
+            RETURNING 1
+        )
+        INSERT INTO {CHECKPOINT_TABLE} AS checkpoint (name, last_key, rows_done)
+        SELECT :name, :upto, count(*) FROM updated
+        ON CONFLICT (name) DO UPDATE SET
+            last_key = excluded.last_key,
+            rows_done = checkpoint.rows_done + excluded.rows_done,
+            updated_at = now()
+        RETURNING rows_done
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        bind.exec_driver_sql(_CREATE_CHECKPOINTS)
+        checkpoint = bind.execute(_READ_CHECKPOINT, {"name": name}).first()
+        if checkpoint is not None:
+            after, rows_done = checkpoint
+            logger.info(
+                "Backfill %s resuming after %s=%s (%d rows done)", name, key, after, rows_done
+            )
+        else:
+            after, rows_done = bind.scalar(text(f"SELECT min({key}) - 1 FROM {table_name}")), 0
+
+        bind.exec_driver_sql("SET app.suppress_catalog_notify = on")
+        try:
+            started = last_logged = time.monotonic()
+            while after is not None:
+                upto = bind.scalar(next_upper_key, {"after": after, "batch_size": batch_size})
+                if upto is None:
+                    break
+
+                def run_batch() -> None:
+                    nonlocal rows_done
+                    rows_done = bind.scalar(
+                        update_batch, {"name": name, "after": after, "upto": upto}
+                    )
+
+                with_lock_timeout(run_batch, lock_timeout_ms=lock_timeout_ms, attempts=attempts)
+                after = upto
+                if time.monotonic() - last_logged >= log_every_seconds:
+                    last_logged = time.monotonic()
+                    logger.info(
+                        "Backfill %s: %d rows, up to %s=%s, %.0fs",
+                        name,
+                        rows_done,
+                        key,
+                        after,
+                        last_logged - started,
+                    )
+                time.sleep(pause_seconds)
+        finally:
+            bind.exec_driver_sql("RESET app.suppress_catalog_notify")
+
+        bind.execute(_DELETE_CHECKPOINT, {"name": name})
+        bind.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CATALOG_CHANNEL, "payload": f"backfill:{table_name}"},
+        )
+    logger.info("Backfill %s done: %d rows", name, rows_done)
+    return rows_done
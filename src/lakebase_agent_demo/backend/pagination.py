@@ -0,0 +1,64 @@
+"""Keyset (cursor) pagination helpers for list endpoints."""
+
+import base64
+import json
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import Dialect, Select
+from sqlalchemy.engine import Compiled
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(**key: int | float) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, **fields: type) -> dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    `fields` maps each expected key to its type, e.g. decode_cursor(c, id=int).
+    Raises ValueError if the cursor is malformed or its keys don't match.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(key, dict) or set(key) != set(fields):
+        raise ValueError("Malformed cursor")
+    for name, kind in fields.items():
+        value = key[name]
+        # JSON has one number type; accept ints where floats are expected
+        if kind is float and isinstance(value, int) and not isinstance(value, bool):
+            key[name] = float(value)
+        elif not isinstance(value, kind) or isinstance(value, bool):
+            raise ValueError("Malformed cursor")
+    return key
+
+
+@lru_cache(maxsize=64)
+def _compile_explain(query: Select, dialect: Dialect) -> tuple[str, Compiled]:
+    # Callers pass pre-built statements (see queries.py), so compile each once
+    compiled = query.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    return f"EXPLAIN (FORMAT JSON) {compiled}", compiled
+
+
+async def estimate_row_count(
+    session: AsyncSession, query: Select, params: dict[str, Any] | None = None
+) -> int:
+    """
+    Return the planner's row estimate for a query instead of running COUNT(*).
+
+    Cost is a single EXPLAIN (no table scan), so it stays constant as the
+    table grows. Accuracy depends on up-to-date statistics (ANALYZE).
+    `params` supplies values for the query's bound parameters.
+    """
+    sql, compiled = _compile_explain(query, session.get_bind().dialect)
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(sql, compiled.construct_params(params))
+    plan = result.scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
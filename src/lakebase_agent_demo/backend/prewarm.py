@@ -0,0 +1,61 @@
+"""Startup warm-up, so the first requests after a deploy don't pay for it.
+
+Opening a pooled connection costs TCP and TLS handshakes, authentication and,
+in OAuth mode, a token lookup (see database._inject_oauth_password_on_connect).
+A fresh worker would otherwise pay that on its first burst of requests, one
+connection at a time, while those requests wait. Instead, the pool's steady
+size is opened concurrently at startup. Running the first catalog page
+queries once also pulls their index and heap pages into Postgres's buffer
+cache and fills SQLAlchemy's compiled statement cache.
+
+Runtime runs this in the background and /api/ready reports 503 until it is
+done, so the load balancer only routes to warm workers.
+"""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker
+
+from .logger import logger
+from .queries import (
+    DEFAULT_PAGE_SIZE,
+    FIRST_PAGE_AFTER_ID,
+    categories_statement,
+    catalog_version_statement,
+    product_page_statement,
+)
+
+
+async def open_connections(engine: AsyncEngine, count: int) -> int:
+    """
+    Open up to `count` connections concurrently and check them back in.
+
+    They are all held until the last one opens, so each checkout creates a
+    new connection rather than reusing one just returned. Returns how many
+    opened.
+    """
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    opened = [result for result in results if isinstance(result, AsyncConnection)]
+    for connection in opened:
+        await connection.close()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        logger.warning(
+            "Opened %d of %d pooled connections: %s", len(opened), count, errors[0]
+        )
+    return len(opened)
+
+
+async def warm_catalog(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    """Run the catalog's first-page queries: categories, and products overall and per category."""
+    async with session_maker() as session:
+        categories = (await session.scalars(categories_statement(()))).all()
+        page = {"after_id": FIRST_PAGE_AFTER_ID, "limit": DEFAULT_PAGE_SIZE + 1}
+        await session.execute(catalog_version_statement(()))
+        await session.execute(product_page_statement(None, False), page)
+        for category in categories:
+            scope = {"category_id": category.id}
+            await session.execute(catalog_version_statement(("category_id",)), scope)
+            await session.execute(product_page_statement(None, True), {**page, **scope})
@@ -0,0 +1,257 @@
+"""Pre-built statements for the hot catalog queries.
+
+Building a select() with its joins and options, and computing its cache key
+so SQLAlchemy can find the compiled form, costs more client CPU per request
+than executing it. Statements here are built once, take every per-request
+value as a bound parameter, and are reused. The variants that depend on
+request shape (?fields=, ?include=, optional filters) are built on first
+use and memoized, so there is a small, fixed set of SQL strings, which is
+also what lets psycopg prepare them on the server (see
+AppConfig.db_prepare_threshold).
+"""
+
+from collections.abc import Collection
+from functools import lru_cache
+
+from sqlalchemy import (
+    ARRAY,
+    REAL,
+    Integer,
+    Select,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    func,
+    or_,
+    select,
+)
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from .db_models import CatalogDeletion, Category, Inventory, Product
+from .models import ProductListOut
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Cursor position before the first page: product ids are serial, from 1
+FIRST_PAGE_AFTER_ID = 0
+
+# Relationships a client may ask for via ?include=, mapped to their loader strategy.
+# Relationships default to lazy="raise", so anything not listed here is never loaded.
+CATEGORY_LOADERS = {
+    "products": selectinload(Category.products),
+}
+# Both are to-one, so joining them in keeps product detail to a single statement
+PRODUCT_LOADERS = {
+    "category": joinedload(Product.category),
+    "inventory": joinedload(Product.inventory),
+}
+PRODUCT_RELATED_FIELDS = frozenset(PRODUCT_LOADERS)
+
+# Columns behind each ProductListOut field, so ?fields= can narrow the SELECT
+PRODUCT_LIST_COLUMNS = {
+    "id": Product.id,
+    "name": Product.name,
+    "description": Product.description,
+    "price": Product.price,
+    "image_url": Product.image_url,
+    "category_id": Product.category_id,
+    "category_name": Category.name.label("category_name"),
+    "quantity": Inventory.quantity,
+}
+assert PRODUCT_LIST_COLUMNS.keys() == ProductListOut.model_fields.keys()
+
+
+def product_list_query(fields: Collection[str] | None = None) -> Select:
+    """
+    Base statement for product list rows (ProductListOut columns).
+
+    With `fields`, only those columns are selected, and categories/inventory
+    are only joined when one of their columns is needed.
+    """
+    names = list(PRODUCT_LIST_COLUMNS) if fields is None else fields
+    query = select(*(PRODUCT_LIST_COLUMNS[name] for name in names)).select_from(
+        Product
+    )
+    if "category_name" in names:
+        query = query.join(Category, Product.category_id == Category.id)
+    if "quantity" in names:
+        query = query.outerjoin(Inventory, Product.id == Inventory.product_id)
+    return query
+
+
+# ============================================================================
+# Categories
+# ============================================================================
+
+
+@lru_cache(maxsize=None)
+def categories_statement(include: tuple[str, ...]) -> Select:
+    """All categories. `include` is a sorted tuple of CATEGORY_LOADERS keys."""
+    return (
+        select(Category)
+        .order_by(Category.id)
+        .options(*(CATEGORY_LOADERS[name] for name in include))
+    )
+
+
+@lru_cache(maxsize=None)
+def category_statement(include: tuple[str, ...]) -> Select:
+    """One category by :category_id."""
+    return (
+        select(Category)
+        .where(Category.id == bindparam("category_id"))
+        .options(*(CATEGORY_LOADERS[name] for name in include))
+    )
+
+
+# ============================================================================
+# Products
+# ============================================================================
+
+
+@lru_cache(maxsize=256)
+def product_page_statement(fields: tuple[str, ...] | None, by_category: bool) -> Select:
+    """
+    One keyset page of products after :after_id, at most :limit rows.
+
+    With `by_category`, filtered on :category_id and ordered to match the
+    (category_id, id) index.
+    """
+    query = product_list_query(fields).where(Product.id > bindparam("after_id"))
+    if by_category:
+        query = query.where(Product.category_id == bindparam("category_id")).order_by(
+            Product.category_id, Product.id
+        )
+    else:
+        query = query.order_by(Product.id)
+    return query.limit(bindparam("limit", type_=Integer))
+
+
+PRODUCT_COUNT = select(Product.id)
+CATEGORY_PRODUCT_COUNT = select(Product.id).where(
+    Product.category_id == bindparam("category_id")
+)
+
+
+@lru_cache(maxsize=256)
+def product_detail_statement(
+    include: tuple[str, ...], fields: tuple[str, ...] | None
+) -> Select:
+    """
+    One product by :product_id with the `include` relationships loaded.
+
+    With `fields`, only those ProductOut columns are loaded (plus id).
+    """
+    query = (
+        select(Product)
+        .where(Product.id == bindparam("product_id"))
+        .options(*(PRODUCT_LOADERS[name] for name in include))
+    )
+    if fields is not None:
+        columns = [
+            getattr(Product, name) for name in fields if name not in PRODUCT_RELATED_FIELDS
+        ]
+        query = query.options(load_only(Product.id, *columns))
+    return query
+
+
+# One SQL string whatever the number of ids (IN would render one per count)
+PRODUCTS_BY_ID = (
+    select(Product)
+    .where(Product.id == any_(bindparam("ids", type_=ARRAY(Integer))))
+    .options(PRODUCT_LOADERS["category"], PRODUCT_LOADERS["inventory"])
+)
+
+
+# ============================================================================
+# Search
+# ============================================================================
+
+_ts_query = func.websearch_to_tsquery("english", bindparam("q"))
+SEARCH_RANK = func.ts_rank(Product.search_vector, _ts_query)
+_matches = Product.search_vector.op("@@")(_ts_query)
+
+
+@lru_cache(maxsize=None)
+def search_page_statement(by_category: bool, after: bool) -> Select:
+    """
+    One page of full-text matches for :q, best first, at most :limit rows.
+
+    Filtered on :category_id with `by_category`; with `after`, continues
+    after the (:after_rank, :after_id) cursor.
+    """
+    query = (
+        product_list_query()
+        .add_columns(SEARCH_RANK.label("rank"))
+        .where(_matches)
+        .order_by(SEARCH_RANK.desc(), Product.id)
+    )
+    if by_category:
+        query = query.where(Product.category_id == bindparam("category_id"))
+    if after:
+        # ts_rank is real, but psycopg sends a float as float8, which would
+        # promote the comparison to double: the cursor's rank would then never
+        # equal its own row's. Cast both sides so they compare as real.
+        rank = cast(SEARCH_RANK, REAL)
+        last_rank = cast(bindparam("after_rank"), REAL)
+        query = query.where(
+            or_(
+                rank < last_rank,
+                and_(rank == last_rank, Product.id > bindparam("after_id")),
+            )
+        )
+    return query.limit(bindparam("limit", type_=Integer))
+
+
+@lru_cache(maxsize=None)
+def search_count_statement(by_category: bool) -> Select:
+    """Matches for :q (optionally in :category_id), for the row estimate."""
+    query = select(Product.id).where(_matches)
+    if by_category:
+        query = query.where(Product.category_id == bindparam("category_id"))
+    return query
+
+
+# ============================================================================
+# Version tokens (etags.py)
+# ============================================================================
+
+
+# The whole catalog: one index entry per max() (migration 009), whatever its size
+CATALOG_VERSION = select(
+    select(func.max(Product.updated_at)).scalar_subquery(),
+    select(func.max(Inventory.updated_at)).scalar_subquery(),
+    select(func.max(Category.updated_at)).scalar_subquery(),
+    select(func.max(CatalogDeletion.deleted_at)).scalar_subquery(),
+)
+
+
+@lru_cache(maxsize=None)
+def catalog_version_statement(scope: tuple[str, ...]) -> Select:
+    """
+    Max updated_at of products, inventory and categories, and a deletion marker.
+
+    `scope` names the bound filters, a sorted subset of ("category_id", "product_id").
+    Unscoped, that's CATALOG_VERSION, with the last deletion time as the
+    marker. Scoped, it covers just those products (a category's, or one)
+    and the marker is their count.
+    """
+    if not scope:
+        return CATALOG_VERSION
+    query = (
+        select(
+            func.max(Product.updated_at),
+            func.max(Inventory.updated_at),
+            func.max(Category.updated_at),
+            func.count(Product.id),
+        )
+        .join(Category, Product.category_id == Category.id)
+        .outerjoin(Inventory, Product.id == Inventory.product_id)
+    )
+    if "category_id" in scope:
+        query = query.where(Product.category_id == bindparam("category_id"))
+    if "product_id" in scope:
+        query = query.where(Product.id == bindparam("product_id"))
+    return query
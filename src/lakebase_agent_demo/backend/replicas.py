@@ -0,0 +1,151 @@
+"""Route catalog reads to read-only Lakebase endpoints, with lag awareness.
+
+Each read-only endpoint gets its own engine (and connection pool). A
+background task measures every replica's replay lag; a read session goes to
+a replica only while its lag, plus the time since it was measured, is within
+`max_lag`, and to the primary otherwise. Adding the age of the measurement
+makes the bound conservative: a replica whose checks stop succeeding drops
+out of rotation on its own.
+
+Readers should expect data up to `max_lag` seconds old. Handlers that read
+their own writes, or write at all, keep using the primary session.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from .logger import logger
+from .models import ReadRoutingMetricsOut, ReplicaStatusOut
+
+# Zero when the replica has replayed everything it received: an idle primary
+# would otherwise look like a growing lag on pg_last_xact_replay_timestamp.
+# Also zero for an endpoint that isn't in recovery at all.
+_REPLAY_LAG = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+@dataclass
+class ReadReplica:
+    """A read-only endpoint and the outcome of its last lag check."""
+
+    host: str
+    engine: AsyncEngine
+    session_maker: async_sessionmaker[AsyncSession]
+    lag_seconds: float | None = None
+    checked_at: datetime | None = None
+    checked_monotonic: float | None = None
+    error: str | None = None
+    sessions: int = 0
+
+
+class ReadRouter:
+    """
+    Hands out session makers for read-only work: a replica in rotation, or the primary.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[ReadReplica],
+        max_lag: float,
+        check_interval: float,
+    ) -> None:
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._primary = primary
+        self._next = itertools.count()
+        self._task: asyncio.Task[None] | None = None
+        self.primary_sessions = 0
+
+    def in_rotation(self, replica: ReadReplica) -> bool:
+        if replica.error is not None or replica.lag_seconds is None:
+            return False
+        age = time.monotonic() - replica.checked_monotonic
+        return replica.lag_seconds + age <= self.max_lag
+
+    def session_maker(self) -> async_sessionmaker[AsyncSession]:
+        """Pick where the next read session goes (round robin over healthy replicas)."""
+        candidates = [replica for replica in self.replicas if self.in_rotation(replica)]
+        if not candidates:
+            self.primary_sessions += 1
+            return self._primary
+        replica = candidates[next(self._next) % len(candidates)]
+        replica.sessions += 1
+        return replica.session_maker
+
+    async def check(self, replica: ReadReplica) -> None:
+        """Measure one replica's replay lag, recording an error if it can't be reached."""
+        try:
+            async with asyncio.timeout(max(self.check_interval, 1.0)):
+                async with replica.engine.connect() as conn:
+                    lag = await conn.scalar(_REPLAY_LAG)
+        except Exception as e:
+            error = next(iter(str(e).splitlines()), "") or type(e).__name__
+            if replica.error is None:
+                logger.warning("Read replica %s out of rotation: %s", replica.host, error)
+            replica.error = error
+            replica.lag_seconds = None
+        else:
+            if replica.error is not None:
+                logger.info("Read replica %s reachable again", replica.host)
+            replica.error = None
+            replica.lag_seconds = None if lag is None else float(lag)
+        replica.checked_at = datetime.now(timezone.utc)
+        replica.checked_monotonic = time.monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        """Start the background lag checks (no-op without replicas)."""
+        if self.replicas:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def dispose(self) -> None:
+        """Close the replicas' connection pools."""
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def metrics(self) -> ReadRoutingMetricsOut:
+        return ReadRoutingMetricsOut(
+            max_lag_seconds=self.max_lag,
+            replicas=[
+                ReplicaStatusOut(
+                    host=replica.host,
+                    in_rotation=self.in_rotation(replica),
+                    lag_seconds=replica.lag_seconds,
+                    checked_at=replica.checked_at,
+                    error=replica.error,
+                    sessions=replica.sessions,
+                )
+                for replica in self.replicas
+            ],
+            primary_sessions=self.primary_sessions,
+            replica_sessions=sum(replica.sessions for replica in self.replicas),
+        )
@@ -1,18 +1,156 @@
-from typing import Annotated
+import csv
+import io
+import math
+import tempfile
+from collections.abc import AsyncIterator
+from decimal import Decimal
+from typing import Annotated, Literal, TypeVar
 
-from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.iam import User as UserOut
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Row, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .._metadata import api_prefix
-from .db_models import Category, Inventory, Product
-from .dependencies import DbSessionDep, get_obo_ws
-from .models import CategoryOut, ProductListOut, ProductOut, VersionOut
+from .catalog_cache import CATEGORIES_TAG, PRODUCT_LISTS_TAG, product_tag
+from .catalog_import import CatalogImportError, ImportFormat, import_catalog
+from .checkout import place_order
+from .db_models import Product
+from .dependencies import (
+    ConfigDep,
+    DbSessionDep,
+    ReadDbSessionDep,
+    RuntimeDep,
+    get_current_user,
+)
+from .etags import catalog_version, etag_matches
+from .facets import load_product_facets
+from .inventory_ingest import (
+    InventoryBufferFull,
+    InventoryDeltaBuffer,
+    unknown_product_ids,
+)
+from .models import (
+    CatalogImportOut,
+    CategoryOut,
+    CategoryWithProductsOut,
+    CheckoutIn,
+    InventoryDeltasAcceptedOut,
+    InventoryDeltasIn,
+    InventoryIngestMetricsOut,
+    InventoryOut,
+    OrderItemOut,
+    OrderOut,
+    PoolMetricsOut,
+    ProductBatchOut,
+    ProductFacetsOut,
+    ProductListOut,
+    ProductOut,
+    ProductPageOut,
+    ReadRoutingMetricsOut,
+    ReadinessOut,
+    User as UserOut,
+    VersionOut,
+)
+from .pagination import decode_cursor, encode_cursor, estimate_row_count
+from .queries import (
+    CATEGORY_PRODUCT_COUNT,
+    DEFAULT_PAGE_SIZE,
+    FIRST_PAGE_AFTER_ID,
+    MAX_PAGE_SIZE,
+    PRODUCT_COUNT,
+    PRODUCTS_BY_ID,
+    categories_statement,
+    category_statement,
+    product_detail_statement,
+    product_list_query,
+    product_page_statement,
+    search_count_statement,
+    search_page_statement,
+)
+from .runtime import Runtime
+from .serialization import (
+    encode_product_fields,
+    encode_product_page,
+    encode_product_row,
+    json_bytes_response,
+)
 
 api = APIRouter(prefix=api_prefix)
 
+MAX_BATCH_SIZE = 500
+
+# Relationships a client may ask for via ?include= (see queries.py for loaders)
+CategoryInclude = Literal["products"]
+ProductInclude = Literal["category", "inventory"]
+
+_PRODUCT_RELATED_MODELS = {"category": CategoryOut, "inventory": InventoryOut}
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _category_tags(include: list[str]) -> list[str]:
+    """Cache tags for a category response, which embeds product lists if included."""
+    if "products" in include:
+        return [CATEGORIES_TAG, PRODUCT_LISTS_TAG]
+    return [CATEGORIES_TAG]
+
+
+async def _check_etag(
+    request: Request,
+    response: Response,
+    runtime: Runtime,
+    session: AsyncSession,
+    tags: list[str],
+    **scope: int | None,
+) -> Response | None:
+    """
+    Attach the ETag for the products in scope to the response.
+
+    Returns a ready 304 response if the client's If-None-Match is current, so
+    the handler can skip loading and serializing rows. The version token is
+    cached under the same tags as the data it describes.
+    """
+    etag = await runtime.catalog_cache.get_or_load(
+        ("etag", *sorted(scope.items())),
+        lambda: catalog_version(session, **scope),
+        tags,
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def _parse_fields(fields: str | None, model: type[BaseModel]) -> list[str] | None:
+    """Parse a comma-separated ?fields= value against a response model's fields."""
+    if fields is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",")))
+    names = [name for name in names if name]
+    if not names:
+        raise HTTPException(status_code=400, detail="fields must not be empty")
+    unknown = [name for name in names if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}"
+        )
+    return names
+
+
+def _to_model(model: type[ModelT], obj: object) -> ModelT:
+    """Validate an ORM object into a response model, skipping unloaded relationships."""
+    unloaded = inspect(obj).unloaded
+    return model.model_validate(
+        {
+            name: getattr(obj, name)
+            for name in model.model_fields
+            if name not in unloaded and hasattr(obj, name)
+        }
+    )
+
 
 # ============================================================================
 # System Endpoints
@@ -24,9 +162,27 @@ async def version():
     return VersionOut.from_metadata()
 
 
+@api.get(
+    "/ready",
+    response_model=ReadinessOut,
+    operation_id="ready",
+    responses={503: {"model": ReadinessOut, "description": "Still warming up"}},
+)
+async def ready(runtime: RuntimeDep, response: Response):
+    """
+    Readiness probe: 503 until startup warm-up (see prewarm.py) is done, then 200.
+
+    Point the load balancer's health check here so new workers only get
+    traffic once their connection pools are open.
+    """
+    if not runtime.ready:
+        response.status_code = 503
+    return runtime.readiness()
+
+
 @api.get("/current-user", response_model=UserOut, operation_id="currentUser")
-def me(obo_ws: Annotated[WorkspaceClient, Depends(get_obo_ws)]):
-    return obo_ws.current_user.me()
+async def me(user: Annotated[UserOut, Depends(get_current_user)]):
+    return user
 
 
 # ============================================================================
@@ -34,23 +190,61 @@ def me(obo_ws: Annotated[WorkspaceClient, Depends(get_obo_ws)]):
 # ============================================================================
 
 
-@api.get("/categories", response_model=list[CategoryOut], operation_id="getCategories")
-async def get_categories(session: DbSessionDep):
+@api.get(
+    "/categories",
+    response_model=list[CategoryWithProductsOut],
+    operation_id="getCategories",
+)
+async def get_categories(
+    session: ReadDbSessionDep,
+    runtime: RuntimeDep,
+    include: Annotated[
+        list[CategoryInclude], Query(description="Relationships to load")
+    ] = [],
+):
     """Get all product categories."""
-    result = await session.execute(select(Category).order_by(Category.id))
-    return result.scalars().all()
+    include = sorted(set(include))
+
+    async def load():
+        result = await session.execute(categories_statement(tuple(include)))
+        return [
+            _to_model(CategoryWithProductsOut, category)
+            for category in result.scalars().all()
+        ]
+
+    return await runtime.catalog_cache.get_or_load(
+        ("categories", *include), load, _category_tags(include)
+    )
 
 
 @api.get(
-    "/categories/{category_id}", response_model=CategoryOut, operation_id="getCategory"
+    "/categories/{category_id}",
+    response_model=CategoryWithProductsOut,
+    operation_id="getCategory",
 )
-async def get_category(category_id: int, session: DbSessionDep):
+async def get_category(
+    category_id: int,
+    session: ReadDbSessionDep,
+    runtime: RuntimeDep,
+    include: Annotated[
+        list[CategoryInclude], Query(description="Relationships to load")
+    ] = [],
+):
     """Get a specific category by ID."""
-    result = await session.execute(select(Category).where(Category.id == category_id))
-    category = result.scalar_one_or_none()
-    if not category:
-        raise HTTPException(status_code=404, detail="Category not found")
-    return category
+    include = sorted(set(include))
+
+    async def load():
+        result = await session.execute(
+            category_statement(tuple(include)), {"category_id": category_id}
+        )
+        category = result.scalar_one_or_none()
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        return _to_model(CategoryWithProductsOut, category)
+
+    return await runtime.catalog_cache.get_or_load(
+        ("category", category_id, *include), load, _category_tags(include)
+    )
 
 
 # ============================================================================
@@ -58,60 +252,509 @@ async def get_category(category_id: int, session: DbSessionDep):
 # ============================================================================
 
 
-@api.get("/products", response_model=list[ProductListOut], operation_id="getProducts")
+@api.get("/products", response_model=ProductPageOut, operation_id="getProducts")
 async def get_products(
-    session: DbSessionDep,
+    request: Request,
+    response: Response,
+    session: ReadDbSessionDep,
+    runtime: RuntimeDep,
     category_id: Annotated[int | None, Query(description="Filter by category")] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_PAGE_SIZE, description="Page size")
+    ] = DEFAULT_PAGE_SIZE,
+    after: Annotated[
+        str | None, Query(description="Cursor from the previous page's next_cursor")
+    ] = None,
+    fields: Annotated[
+        str | None, Query(description="Comma-separated fields to return per item")
+    ] = None,
 ):
-    """Get all products, optionally filtered by category."""
-    query = (
-        select(
-            Product.id,
-            Product.name,
-            Product.description,
-            Product.price,
-            Product.image_url,
-            Product.category_id,
-            Category.name.label("category_name"),
-            Inventory.quantity,
+    """
+    Get a page of products, optionally filtered by category.
+
+    Pages are keyset-paginated on id (or (category_id, id) when filtering),
+    so fetching a deep page costs the same as fetching the first one.
+    `fields` narrows both the selected columns and the items in the response.
+    """
+    selected = _parse_fields(fields, ProductListOut)
+    # The cursor is built from id (and category_id), so always select them
+    columns = selected and tuple(dict.fromkeys([*selected, "id", "category_id"]))
+    query = product_page_statement(columns, category_id is not None)
+    params = {"category_id": category_id, "after_id": FIRST_PAGE_AFTER_ID}
+    count_query = PRODUCT_COUNT if category_id is None else CATEGORY_PRODUCT_COUNT
+
+    if after is not None:
+        try:
+            if category_id is not None:
+                key = decode_cursor(after, category_id=int, id=int)
+                if key["category_id"] != category_id:
+                    raise ValueError("Cursor belongs to a different category")
+            else:
+                key = decode_cursor(after, id=int)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        params["after_id"] = key["id"]
+
+    not_modified = await _check_etag(
+        request,
+        response,
+        runtime,
+        session,
+        [PRODUCT_LISTS_TAG],
+        category_id=category_id,
+    )
+    if not_modified:
+        return not_modified
+
+    # Rows are encoded straight to JSON bytes (see serialization.py) and the
+    # encoded page is what gets cached
+    async def load():
+        # Fetch one extra row to learn whether another page exists
+        result = await session.execute(query, {**params, "limit": limit + 1})
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            if category_id is not None:
+                next_cursor = encode_cursor(category_id=last.category_id, id=last.id)
+            else:
+                next_cursor = encode_cursor(id=last.id)
+
+        return encode_product_page(
+            rows,
+            next_cursor,
+            await estimate_row_count(session, count_query, params),
+            fields=selected,
         )
-        .join(Category, Product.category_id == Category.id)
-        .outerjoin(Inventory, Product.id == Inventory.product_id)
-        .order_by(Product.id)
+
+    body = await runtime.catalog_cache.get_or_load(
+        ("products", category_id, limit, after, selected and tuple(selected)),
+        load,
+        [PRODUCT_LISTS_TAG],
     )
+    return json_bytes_response(body, response)
 
-    if category_id is not None:
-        query = query.where(Product.category_id == category_id)
 
-    result = await session.execute(query)
+@api.get(
+    "/products/facets", response_model=ProductFacetsOut, operation_id="getProductFacets"
+)
+async def get_product_facets(
+    request: Request,
+    response: Response,
+    session: ReadDbSessionDep,
+    runtime: RuntimeDep,
+    category_id: Annotated[int | None, Query(description="Filter by category")] = None,
+):
+    """
+    Get category counts, price ranges and stock totals for the product list.
+
+    All facets come from a single aggregate query (see facets.py). Category
+    counts span the whole catalog, so the ETag covers all of it too.
+    """
+    not_modified = await _check_etag(
+        request, response, runtime, session, [PRODUCT_LISTS_TAG]
+    )
+    if not_modified:
+        return not_modified
+
+    # Keyed by the version token as well, so a changed updated_at means a
+    # fresh entry even if the change notification was missed
+    return await runtime.catalog_cache.get_or_load(
+        ("facets", category_id, response.headers["ETag"]),
+        lambda: load_product_facets(session, category_id),
+        [PRODUCT_LISTS_TAG],
+    )
+
+
+@api.get(
+    "/products/search", response_model=ProductPageOut, operation_id="searchProducts"
+)
+async def search_products(
+    session: ReadDbSessionDep,
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Search text")],
+    category_id: Annotated[int | None, Query(description="Filter by category")] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_PAGE_SIZE, description="Page size")
+    ] = DEFAULT_PAGE_SIZE,
+    after: Annotated[
+        str | None, Query(description="Cursor from the previous page's next_cursor")
+    ] = None,
+):
+    """
+    Full-text search over product names and descriptions, best matches first.
+
+    Matches come from the GIN index on products.search_vector (name weighted
+    above description); pages are keyset-paginated on (rank, id).
+    """
+    params = {"q": q, "category_id": category_id}
+    if after is not None:
+        try:
+            key = decode_cursor(after, rank=float, id=int)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        params.update(after_rank=key["rank"], after_id=key["id"])
+    query = search_page_statement(category_id is not None, after is not None)
+    count_query = search_count_statement(category_id is not None)
+
+    # Fetch one extra row to learn whether another page exists
+    result = await session.execute(query, {**params, "limit": limit + 1})
     rows = result.all()
 
-    return [
-        ProductListOut(
-            id=row.id,
-            name=row.name,
-            description=row.description,
-            price=row.price,
-            image_url=row.image_url,
-            category_id=row.category_id,
-            category_name=row.category_name,
-            quantity=row.quantity,
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rank=rows[-1].rank, id=rows[-1].id)
+
+    return json_bytes_response(
+        encode_product_page(
+            rows, next_cursor, await estimate_row_count(session, count_query, params)
         )
-        for row in rows
-    ]
+    )
+
+
+_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def _encode_export(
+    partitions: AsyncIterator[list[Row]], format: Literal["ndjson", "csv"]
+) -> AsyncIterator[str | bytes]:
+    """Encode each fetched partition of product rows as one chunk of NDJSON or CSV."""
+    fields = list(ProductListOut.model_fields)
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue()
+    async for rows in partitions:
+        if format == "ndjson":
+            yield b"".join(encode_product_row(row) + b"\n" for row in rows)
+        else:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows([getattr(row, field) for field in fields] for row in rows)
+            yield buffer.getvalue()
+
+
+@api.get(
+    "/products/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media: {} for media in _EXPORT_MEDIA_TYPES.values()}}},
+    operation_id="exportProducts",
+)
+async def export_products(
+    session: ReadDbSessionDep,
+    config: ConfigDep,
+    format: Annotated[
+        Literal["ndjson", "csv"], Query(description="Output format")
+    ] = "ndjson",
+    category_id: Annotated[int | None, Query(description="Filter by category")] = None,
+    fetch_size: Annotated[
+        int | None, Query(ge=1, le=10_000, description="Rows per server round trip")
+    ] = None,
+):
+    """
+    Stream the whole catalog (or one category) as NDJSON or CSV.
+
+    Rows are read through a server-side cursor `fetch_size` at a time and
+    written out as they arrive, so memory stays flat regardless of catalog
+    size and the first bytes go out before the query has finished.
+    """
+    query = product_list_query().order_by(Product.id)
+    if category_id is not None:
+        query = query.where(Product.category_id == category_id)
+    fetch_size = fetch_size or config.export_fetch_size
+
+    # Server-side cursors need a transaction, which read sessions don't open
+    # by default; this one also gives the whole export a single snapshot
+    await session.connection(
+        execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+    )
+    result = await session.stream(query.execution_options(yield_per=fetch_size))
+    return StreamingResponse(
+        _encode_export(result.partitions(), format),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="products.{format}"'
+        },
+    )
+
+
+# Request bodies up to this size are spooled in memory, larger ones to disk
+_IMPORT_SPOOL_BYTES = 16 * 1024 * 1024
+
+
+@api.post(
+    "/products/import",
+    response_model=CatalogImportOut,
+    operation_id="importProducts",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media: {"schema": {"type": "string", "format": "binary"}}
+                for media in ("text/csv", "application/vnd.apache.parquet")
+            },
+        }
+    },
+)
+async def import_products(
+    request: Request,
+    session: DbSessionDep,
+    format: Annotated[ImportFormat, Query(description="Request body format")] = "csv",
+):
+    """
+    Bulk import a catalog file sent as the raw request body.
+
+    The file is validated in chunks, COPYed into staging tables and merged
+    into categories, products and inventory in one transaction; any invalid
+    row fails the whole import with 422 (see catalog_import.py for the
+    expected columns).
+    """
+    with tempfile.SpooledTemporaryFile(max_size=_IMPORT_SPOOL_BYTES) as file:
+        async for chunk in request.stream():
+            file.write(chunk)
+        file.seek(0)
+        try:
+            result = await import_catalog(session, file, format)
+        except CatalogImportError as e:
+            raise HTTPException(
+                status_code=422, detail={"message": str(e), "errors": e.errors}
+            )
+    # Committed here rather than by the dependency, whose commit runs after
+    # the response is sent: a failed commit must not be reported as imported
+    await session.commit()
+    return result
+
+
+@api.get(
+    "/products:batch", response_model=ProductBatchOut, operation_id="getProductsBatch"
+)
+async def get_products_batch(
+    session: ReadDbSessionDep,
+    ids: Annotated[
+        list[int],
+        Query(min_length=1, max_length=MAX_BATCH_SIZE, description="Product IDs"),
+    ],
+):
+    """
+    Get many products by ID in one round trip.
+
+    Replaces N parallel /products/{id} calls: one joined statement loads the
+    products with their category and inventory. Items come back in request
+    order (duplicates collapsed); unknown ids are listed in `missing`.
+    """
+    requested = list(dict.fromkeys(ids))
+    result = await session.execute(PRODUCTS_BY_ID, {"ids": requested})
+    found = {product.id: product for product in result.scalars()}
+    return ProductBatchOut(
+        items=[_to_model(ProductOut, found[id_]) for id_ in requested if id_ in found],
+        missing=[id_ for id_ in requested if id_ not in found],
+    )
 
 
 @api.get(
     "/products/{product_id}", response_model=ProductOut, operation_id="getProduct"
 )
-async def get_product(product_id: int, session: DbSessionDep):
-    """Get a specific product by ID with full details."""
-    result = await session.execute(
-        select(Product)
-        .where(Product.id == product_id)
-        .options(selectinload(Product.category), selectinload(Product.inventory))
-    )
-    product = result.scalar_one_or_none()
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return product
+async def get_product(
+    request: Request,
+    response: Response,
+    product_id: int,
+    session: ReadDbSessionDep,
+    runtime: RuntimeDep,
+    include: Annotated[
+        list[ProductInclude], Query(description="Relationships to load")
+    ] = ["category", "inventory"],
+    fields: Annotated[
+        str | None, Query(description="Comma-separated fields to return")
+    ] = None,
+):
+    """
+    Get a specific product by ID with full details.
+
+    `fields` narrows the response (and the columns loaded) to the named
+    ProductOut fields; category/inventory are only loaded if both listed
+    in `fields` and in `include`.
+    """
+    selected = _parse_fields(fields, ProductOut)
+    if selected is not None:
+        include = [name for name in include if name in selected]
+    include = sorted(set(include))
+    tags = [product_tag(product_id), CATEGORIES_TAG]
+
+    not_modified = await _check_etag(
+        request, response, runtime, session, tags, product_id=product_id
+    )
+    if not_modified:
+        return not_modified
+
+    async def load():
+        result = await session.execute(
+            product_detail_statement(tuple(include), selected and tuple(selected)),
+            {"product_id": product_id},
+        )
+        product = result.scalar_one_or_none()
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        if selected is None:
+            return _to_model(ProductOut, product)
+
+        item = {}
+        for name in selected:
+            model = _PRODUCT_RELATED_MODELS.get(name)
+            value = getattr(product, name) if model is None or name in include else None
+            if model is not None and value is not None:
+                value = _to_model(model, value)
+            item[name] = value
+        return encode_product_fields(item)
+
+    body = await runtime.catalog_cache.get_or_load(
+        ("product", product_id, *include, selected and tuple(selected)), load, tags
+    )
+    if isinstance(body, bytes):
+        return json_bytes_response(body, response)
+    return body
+
+
+# ============================================================================
+# Order Endpoints
+# ============================================================================
+
+
+@api.post("/checkout", response_model=OrderOut, status_code=201, operation_id="checkout")
+async def checkout(runtime: RuntimeDep, session: DbSessionDep, cart: CheckoutIn):
+    """
+    Reserve stock for a whole cart and record the order.
+
+    One statement regardless of cart size (see checkout.py). In
+    `all_or_nothing` mode any short line fails the checkout with 409 and
+    nothing is reserved; in `partial` mode short lines are recorded with
+    quantity_reserved 0, and 409 is only returned if no line fits. Carts
+    naming products that don't exist are refused with 422. Cached
+    catalog entries for the reserved products are evicted by a coalesced
+    notification shortly after the commit.
+    """
+    quantities: dict[int, int] = {}
+    for item in cart.items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+
+    lines = await place_order(session, quantities)
+    # Every known product gets a line, reserved or not; checked from the
+    # result rather than with a query up front, as nothing is committed yet
+    unknown = sorted(set(quantities).difference(line.product_id for line in lines))
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "Unknown products", "product_ids": unknown[:100]},
+        )
+    reserved = {line.product_id for line in lines if line.quantity_reserved}
+    unavailable = sorted(set(quantities) - reserved)
+    if not reserved or (unavailable and cart.mode == "all_or_nothing"):
+        # Raising rolls back the session, releasing any reservations made
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Insufficient stock", "unavailable": unavailable},
+        )
+
+    # Committed here rather than by the dependency, so the notification can't
+    # reach a listener before the new stock levels are visible
+    await session.commit()
+    if runtime.catalog_notifier:
+        runtime.catalog_notifier.add("inventory", reserved)
+
+    return OrderOut(
+        id=lines[0].order_id,
+        status=lines[0].status,
+        created_at=lines[0].created_at,
+        items=[OrderItemOut.model_validate(line) for line in lines],
+        total=sum(
+            (line.unit_price * line.quantity_reserved for line in lines), Decimal(0)
+        ),
+    )
+
+
+# ============================================================================
+# Inventory Endpoints
+# ============================================================================
+
+
+def _inventory_buffer(runtime: Runtime) -> InventoryDeltaBuffer:
+    if runtime.inventory_buffer is None:
+        raise HTTPException(status_code=503, detail="Database not configured")
+    return runtime.inventory_buffer
+
+
+@api.post(
+    "/inventory/deltas",
+    response_model=InventoryDeltasAcceptedOut,
+    status_code=202,
+    operation_id="ingestInventoryDeltas",
+)
+async def ingest_inventory_deltas(
+    runtime: RuntimeDep, session: DbSessionDep, batch: InventoryDeltasIn
+):
+    """
+    Buffer a batch of stock adjustments from the warehouse feed.
+
+    Deltas are coalesced per product and written behind in the background
+    (see inventory_ingest.py), so this returns before they are applied.
+    Batches naming products that don't exist are refused with 422, and
+    batches the buffer has no room for with 503 and Retry-After.
+    """
+    buffer = _inventory_buffer(runtime)
+    deltas = [(delta.product_id, delta.delta) for delta in batch.deltas]
+    unknown = await unknown_product_ids(session, (product_id for product_id, _ in deltas))
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "Unknown products", "product_ids": unknown[:100]},
+        )
+    try:
+        accepted = buffer.add(deltas)
+    except InventoryBufferFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Inventory buffer full: {e}",
+            headers={"Retry-After": str(math.ceil(buffer.flush_interval))},
+        ) from e
+    return InventoryDeltasAcceptedOut(
+        accepted=accepted, pending_products=buffer.pending_products
+    )
+
+
+@api.get(
+    "/metrics/inventory-ingest",
+    response_model=InventoryIngestMetricsOut,
+    operation_id="inventoryIngestMetrics",
+)
+async def inventory_ingest_metrics(runtime: RuntimeDep):
+    """Flush latency, batch sizes and backlog depth of the inventory delta buffer."""
+    return _inventory_buffer(runtime).metrics()
+
+
+# ============================================================================
+# Database Endpoints
+# ============================================================================
+
+
+@api.get(
+    "/metrics/read-routing",
+    response_model=ReadRoutingMetricsOut,
+    operation_id="readRoutingMetrics",
+)
+async def read_routing_metrics(runtime: RuntimeDep):
+    """Replica lag and health, and how many read sessions went where."""
+    if runtime.read_router is None:
+        raise HTTPException(status_code=503, detail="Database not configured")
+    return runtime.read_router.metrics()
+
+
+@api.get(
+    "/metrics/pools", response_model=list[PoolMetricsOut], operation_id="poolMetrics"
+)
+async def pool_metrics(runtime: RuntimeDep):
+    """Connection pool usage, waiters and checkout wait times, per endpoint."""
+    if not runtime.has_database:
+        raise HTTPException(status_code=503, detail="Database not configured")
+    return runtime.pool_metrics()
@@ -1,9 +1,23 @@
-from databricks.sdk import WorkspaceClient
+import asyncio
+import contextlib
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING
+
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from .cache import TTLCache
+from .catalog_cache import CatalogChangeNotifier, listen_for_catalog_changes
 from .config import AppConfig
-from .database import create_engine, create_session_maker
+from .database import create_engine, create_read_session_maker, create_session_maker
+from .inventory_ingest import InventoryDeltaBuffer
 from .logger import logger
+from .models import PoolMetricsOut, ReadinessOut
+from .prewarm import open_connections, warm_catalog
+from .replicas import ReadReplica, ReadRouter
+
+if TYPE_CHECKING:
+    from databricks.sdk import WorkspaceClient
 
 
 class Runtime:
@@ -11,11 +25,38 @@ class Runtime:
         self.config = config
         self._engine: AsyncEngine | None = None
         self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._catalog_listener: asyncio.Task[None] | None = None
+        self.catalog_notifier: CatalogChangeNotifier | None = None
+        self.inventory_buffer: InventoryDeltaBuffer | None = None
+        self.read_router: ReadRouter | None = None
+        self._prewarm: asyncio.Task[None] | None = None
+        self.ready = False
+        self.warm_connections = 0
+        self.warmup_seconds: float | None = None
+        self.catalog_cache = TTLCache(
+            maxsize=config.catalog_cache_max_entries
+            if config.catalog_cache_enabled
+            else 0,
+            ttl=config.catalog_cache_ttl_seconds,
+        )
+        # Keyed by token hash (see dependencies.get_obo_ws)
+        self.workspace_clients = TTLCache(
+            maxsize=config.workspace_client_cache_size,
+            ttl=config.workspace_client_ttl_seconds,
+        )
+        self.user_profiles = TTLCache(
+            maxsize=config.workspace_client_cache_size,
+            ttl=config.current_user_ttl_seconds,
+        )
 
-    @property
-    def ws(self) -> WorkspaceClient:
+    @cached_property
+    def ws(self) -> "WorkspaceClient":
         # note - this workspace client is usually an SP-based client
-        # in development it usually uses the DATABRICKS_CONFIG_PROFILE
+        # in development it usually uses the DATABRICKS_CONFIG_PROFILE.
+        # Built once: it refreshes its own OAuth token as needed
+        # The SDK is slow to import, so it's imported on first use
+        from databricks.sdk import WorkspaceClient
+
         return WorkspaceClient()
 
     def init_database(self) -> None:
@@ -23,16 +64,169 @@ class Runtime:
         if self.config.database_url:
             self._engine = create_engine(self.config)
             self._session_maker = create_session_maker(self._engine)
+            self.catalog_notifier = CatalogChangeNotifier(
+                self._engine, self.config.catalog_notify_interval_seconds
+            )
+            self.inventory_buffer = InventoryDeltaBuffer(
+                self._session_maker,
+                max_pending=self.config.inventory_flush_max_pending,
+                flush_interval=self.config.inventory_flush_interval_seconds,
+                max_buffered=self.config.inventory_max_buffered,
+                notifier=self.catalog_notifier,
+            )
+            self.read_router = ReadRouter(
+                create_read_session_maker(self._engine),
+                [
+                    self._create_read_replica(host, url)
+                    for host, url in zip(
+                        self.config.db_read_hosts, self.config.read_database_urls
+                    )
+                ],
+                max_lag=self.config.db_replica_max_lag_seconds,
+                check_interval=self.config.db_replica_check_interval_seconds,
+            )
             logger.info(f"Database initialized: {self.config.db_host}")
+            if self.config.db_read_hosts:
+                logger.info(
+                    f"Read replicas: {', '.join(self.config.db_read_hosts)}"
+                )
         else:
             logger.warning("Database not configured - API endpoints will be unavailable")
 
+    def _create_read_replica(self, host: str, url: str) -> ReadReplica:
+        engine = create_engine(self.config, url)
+        return ReadReplica(
+            host=host, engine=engine, session_maker=create_read_session_maker(engine)
+        )
+
     async def close_database(self) -> None:
-        """Close database connection pool."""
+        """Close database connection pools."""
+        if self.read_router:
+            await self.read_router.dispose()
         if self._engine:
             await self._engine.dispose()
             logger.info("Database connection pool closed")
 
+    def start_prewarm(self) -> None:
+        """Warm the connection pools and catalog in the background; `ready` is set when done."""
+        if not self.has_database:
+            self.ready = True
+            return
+        self._prewarm = asyncio.create_task(self._run_prewarm())
+
+    async def _run_prewarm(self) -> None:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.config.db_prewarm_timeout_seconds):
+                await self._prewarm_database()
+        except Exception as e:
+            # Warm-up only saves latency; don't keep the worker out of rotation over it
+            logger.warning("Warm-up incomplete, reporting ready anyway: %r", e)
+        self.warmup_seconds = time.perf_counter() - started
+        self.ready = True
+        logger.info(
+            f"Warm-up done in {self.warmup_seconds:.2f}s "
+            f"({self.warm_connections} connections opened)"
+        )
+
+    async def _prewarm_database(self) -> None:
+        replicas = self.read_router.replicas if self.read_router else []
+        if self.config.db_prewarm_connections:
+            pool_size, _ = self.config.db_pool_limits
+            opened = await asyncio.gather(
+                *(
+                    open_connections(engine, pool_size)
+                    for engine in [self._engine, *(replica.engine for replica in replicas)]
+                )
+            )
+            self.warm_connections = sum(opened)
+        if self.config.db_prewarm_catalog:
+            session_makers = [
+                ("primary", self._session_maker),
+                *((replica.host, replica.session_maker) for replica in replicas),
+            ]
+            results = await asyncio.gather(
+                *(warm_catalog(session_maker) for _, session_maker in session_makers),
+                return_exceptions=True,
+            )
+            for (name, _), result in zip(session_makers, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Catalog warm-up on {name} failed: {result!r}")
+
+    async def stop_prewarm(self) -> None:
+        if self._prewarm:
+            self._prewarm.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._prewarm
+            self._prewarm = None
+
+    def readiness(self) -> ReadinessOut:
+        return ReadinessOut(
+            ready=self.ready,
+            connections=self.warm_connections,
+            warmup_seconds=self.warmup_seconds,
+        )
+
+    def start_catalog_listener(self) -> None:
+        """Start the background task that evicts catalog cache entries on change."""
+        if self.has_database and self.config.catalog_cache_enabled:
+            # With replicas, evict again once they've had time to catch up
+            replay_after = (
+                self.config.db_replica_max_lag_seconds
+                if self.config.db_read_hosts
+                else None
+            )
+            self._catalog_listener = asyncio.create_task(
+                listen_for_catalog_changes(
+                    self.config, self.catalog_cache, replay_after
+                )
+            )
+
+    async def stop_catalog_listener(self) -> None:
+        """Stop the catalog change listener, if running."""
+        if self._catalog_listener:
+            self._catalog_listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._catalog_listener
+            self._catalog_listener = None
+
+    def start_catalog_notifier(self) -> None:
+        """Start sending the catalog change notifications that writers coalesce."""
+        # Also without a local cache: other instances may have one
+        if self.catalog_notifier:
+            self.catalog_notifier.start()
+
+    async def stop_catalog_notifier(self) -> None:
+        """Stop the catalog change notifier, sending what is still pending."""
+        if self.catalog_notifier:
+            await self.catalog_notifier.stop()
+
+    def start_inventory_ingest(self) -> None:
+        """Start the background flush loop for buffered inventory deltas."""
+        if self.inventory_buffer:
+            self.inventory_buffer.start()
+
+    async def stop_inventory_ingest(self) -> None:
+        """Stop the inventory delta flush loop, flushing what is still buffered."""
+        if self.inventory_buffer:
+            await self.inventory_buffer.stop()
+
+    def start_replica_monitor(self) -> None:
+        """Start the background replica lag checks that drive read routing."""
+        if self.read_router:
+            self.read_router.start()
+
+    async def stop_replica_monitor(self) -> None:
+        if self.read_router:
+            await self.read_router.stop()
+
+    def pool_metrics(self) -> list[PoolMetricsOut]:
+        """Live stats for the primary's pool and each read replica's."""
+        engines = [("primary", self._engine)] if self._engine else []
+        if self.read_router:
+            engines += [(replica.host, replica.engine) for replica in self.read_router.replicas]
+        return [engine.pool.metrics(name) for name, engine in engines]
+
     @property
     def engine(self) -> AsyncEngine | None:
         return self._engine
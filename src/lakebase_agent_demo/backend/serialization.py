@@ -0,0 +1,115 @@
+"""Fast-path JSON encoding for large list responses.
+
+Building a ProductListOut per row and then letting FastAPI validate and
+serialize each one again through `response_model` dominates CPU on big
+pages. Here rows go straight from SQLAlchemy row mappings to JSON bytes
+through precompiled TypeAdapters over TypedDicts that mirror the response
+models, with no validation pass.
+
+Handlers keep their `response_model` (so the OpenAPI schema and generated
+TS client are unchanged) and return the bytes in a plain Response.
+"""
+
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+from typing_extensions import TypedDict
+
+from .models import (
+    CategoryOut,
+    InventoryOut,
+    ProductListOut,
+    ProductOut,
+    ProductPageOut,
+)
+
+
+class ProductListRow(TypedDict):
+    """Serialization mirror of ProductListOut."""
+
+    id: int
+    name: str
+    description: str | None
+    price: Decimal
+    image_url: str | None
+    category_id: int
+    category_name: str | None
+    quantity: int | None
+
+
+class ProductPageRow(TypedDict):
+    """Serialization mirror of ProductPageOut."""
+
+    items: list[ProductListRow]
+    next_cursor: str | None
+    approximate_total: int
+
+
+class ProductDetailRow(TypedDict, total=False):
+    """Partial serialization mirror of ProductOut; any subset of keys may be present."""
+
+    id: int
+    name: str
+    description: str | None
+    price: Decimal
+    image_url: str | None
+    category_id: int
+    created_at: datetime
+    updated_at: datetime
+    category: CategoryOut | None
+    inventory: InventoryOut | None
+
+
+# The mirrors must track the response models field for field
+assert ProductListRow.__annotations__.keys() == ProductListOut.model_fields.keys()
+assert ProductPageRow.__annotations__.keys() == ProductPageOut.model_fields.keys()
+assert ProductDetailRow.__annotations__.keys() == ProductOut.model_fields.keys()
+
+_product_row_adapter = TypeAdapter(ProductListRow)
+_product_page_adapter = TypeAdapter(ProductPageRow)
+_product_detail_adapter = TypeAdapter(ProductDetailRow)
+
+
+def encode_product_row(row: Row) -> bytes:
+    """Encode one product list row as JSON. Extra columns are ignored."""
+    return _product_row_adapter.dump_json(row._asdict())
+
+
+def encode_product_page(
+    rows: Iterable[Row],
+    next_cursor: str | None,
+    approximate_total: int,
+    fields: Sequence[str] | None = None,
+) -> bytes:
+    """
+    Encode a page of product list rows in the ProductPageOut shape.
+
+    With `fields`, each item only carries those keys (sparse fieldsets).
+    """
+    if fields is None:
+        items = [row._asdict() for row in rows]
+    else:
+        items = [{name: row._mapping[name] for name in fields} for row in rows]
+    return _product_page_adapter.dump_json(
+        {
+            "items": items,
+            "next_cursor": next_cursor,
+            "approximate_total": approximate_total,
+        }
+    )
+
+
+def encode_product_fields(product: dict[str, Any]) -> bytes:
+    """Encode a subset of ProductOut fields (sparse fieldsets on the detail endpoint)."""
+    return _product_detail_adapter.dump_json(product)
+
+
+def json_bytes_response(body: bytes, response: Response | None = None) -> Response:
+    """Wrap pre-encoded JSON, carrying over any headers already set on `response`."""
+    headers = dict(response.headers) if response is not None else None
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,93 @@
+"""Per-request SQL statement counting.
+
+An engine `before_cursor_execute` listener bumps whichever StatementCounter
+is active in the current context, and those of enclosing blocks. Wrap a unit
+of work in `count_statements()` to measure how many round trips it makes,
+e.g. to assert on an endpoint's statement budget (scripts/check_statement_budget.py)
+or to log it per request (StatementCountMiddleware).
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .logger import logger
+
+
+@dataclass(slots=True)
+class StatementCounter:
+    count: int = 0
+    parent: "StatementCounter | None" = None
+
+
+_current_counter: ContextVar[StatementCounter | None] = ContextVar(
+    "statement_counter", default=None
+)
+
+
+@contextmanager
+def count_statements() -> Iterator[StatementCounter]:
+    """
+    Count the SQL statements executed in this context until the block exits.
+
+    Blocks nest: statements also count toward every enclosing block.
+    """
+    counter = StatementCounter(parent=_current_counter.get())
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def _on_before_cursor_execute(
+    conn: object,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: object,
+    executemany: bool,
+) -> None:
+    """ConnectionEvents.before_cursor_execute: bump the active counter, if any."""
+    counter = _current_counter.get()
+    while counter is not None:
+        counter.count += 1
+        counter = counter.parent
+
+
+def install_statement_counter(engine: AsyncEngine) -> None:
+    """Attach the statement counting listener to an engine."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _on_before_cursor_execute)
+
+
+class StatementCountMiddleware:
+    """
+    Count SQL statements per request; logged when config.log_statement_counts is set.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which runs the rest of the app
+    in a separate task: cancelling a request (see deadlines.py) has to reach
+    the task waiting on the query for psycopg to cancel it on the server.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with count_statements() as statements:
+            await self.app(scope, receive, send)
+        config = getattr(scope["app"].state, "config", None)
+        if config is not None and config.log_statement_counts and statements.count:
+            logger.info(
+                "%s %s ran %d SQL statement(s)",
+                scope["method"],
+                scope["path"],
+                statements.count,
+            )
@@ -25,6 +25,8 @@ def add_not_found_handler(app: FastAPI):
                 # Let the SPA router handle it
                 return FileResponse(dist_dir / "index.html")
         # Default: return the original HTTP error (JSON 404 for API, etc.)
-        return JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+        return JSONResponse(
+            {"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers
+        )
 
     app.exception_handler(StarletteHTTPException)(http_exception_handler)
@@ -9,13 +9,20 @@ interface CategoryFilterProps {
   categories: Category[];
   selectedCategoryId: number | null;
   onSelectCategory: (categoryId: number | null) => void;
+  /** Product count per category id, shown next to each name when known */
+  counts?: Record<number, number>;
 }
 
 export function CategoryFilter({
   categories,
   selectedCategoryId,
   onSelectCategory,
+  counts,
 }: CategoryFilterProps) {
+  const total = counts
+    ? Object.values(counts).reduce((sum, count) => sum + count, 0)
+    : undefined;
+
   return (
     <div className="flex flex-wrap gap-2">
       <Button
@@ -29,6 +36,7 @@ export function CategoryFilter({
         }
       >
         All Products
+        {total !== undefined && <span className="opacity-70">({total})</span>}
       </Button>
       {categories.map((category) => (
         <Button
@@ -43,6 +51,9 @@ export function CategoryFilter({
           }
         >
           {category.name}
+          {counts?.[category.id] !== undefined && (
+            <span className="opacity-70">({counts[category.id]})</span>
+          )}
         </Button>
       ))}
     </div>
@@ -1,5 +1,21 @@
-import { useQuery, useSuspenseQuery } from "@tanstack/react-query";
-import type { UseQueryOptions, UseSuspenseQueryOptions } from "@tanstack/react-query";
+import { useMutation, useQuery, useSuspenseInfiniteQuery, useSuspenseQuery } from "@tanstack/react-query";
+import type { InfiniteData, UseMutationOptions, UseQueryOptions, UseSuspenseInfiniteQueryOptions, UseSuspenseQueryOptions } from "@tanstack/react-query";
+
+export interface CatalogImportOut {
+  categories_created: number;
+  copy_seconds: number;
+  inventory_rows: number;
+  products_created: number;
+  products_updated: number;
+  rows: number;
+  seconds: number;
+}
+
+export interface CategoryFacetOut {
+  count: number;
+  id: number;
+  name: string;
+}
 
 export interface CategoryOut {
   created_at: string;
@@ -8,6 +24,24 @@ export interface CategoryOut {
   name: string;
 }
 
+export interface CategoryWithProductsOut {
+  created_at: string;
+  description?: string | null;
+  id: number;
+  name: string;
+  products?: ProductListOut[] | null;
+}
+
+export interface CheckoutIn {
+  items: CheckoutItemIn[];
+  mode?: "all_or_nothing" | "partial";
+}
+
+export interface CheckoutItemIn {
+  product_id: number;
+  quantity: number;
+}
+
 export interface ComplexValue {
   display?: string | null;
   primary?: boolean | null;
@@ -20,6 +54,37 @@ export interface HTTPValidationError {
   detail?: ValidationError[];
 }
 
+export interface HistogramOut {
+  buckets: Record<string, number>;
+  count: number;
+  max: number;
+  sum: number;
+}
+
+export interface InventoryDeltaIn {
+  delta: number;
+  product_id: number;
+}
+
+export interface InventoryDeltasAcceptedOut {
+  accepted: number;
+  pending_products: number;
+}
+
+export interface InventoryDeltasIn {
+  deltas: InventoryDeltaIn[];
+}
+
+export interface InventoryIngestMetricsOut {
+  failed_flushes: number;
+  flush_batch_size: HistogramOut;
+  flush_latency_seconds: HistogramOut;
+  flushes: number;
+  pending_deltas: number;
+  pending_products: number;
+  rows_flushed: number;
+}
+
 export interface InventoryOut {
   id: number;
   product_id: number;
@@ -32,6 +97,54 @@ export interface Name {
   given_name?: string | null;
 }
 
+export interface OrderItemOut {
+  product_id: number;
+  quantity_reserved: number;
+  quantity_requested: number;
+  unit_price: string;
+}
+
+export interface OrderOut {
+  created_at: string;
+  id: number;
+  items: OrderItemOut[];
+  status: string;
+  total: string;
+}
+
+export interface PoolMetricsOut {
+  checked_in: number;
+  checked_out: number;
+  checkout_wait_seconds: HistogramOut;
+  max_overflow: number;
+  name: string;
+  overflow: number;
+  pool_size: number;
+  pre_pings: number;
+  stale_connections: number;
+  timeouts: number;
+  waiting: number;
+}
+
+export interface PriceRangeFacetOut {
+  count: number;
+  max?: string | null;
+  min?: string | null;
+}
+
+export interface ProductBatchOut {
+  items: ProductOut[];
+  missing: number[];
+}
+
+export interface ProductFacetsOut {
+  categories: CategoryFacetOut[];
+  in_stock: number;
+  out_of_stock: number;
+  price_ranges: PriceRangeFacetOut[];
+  total: number;
+}
+
 export interface ProductListOut {
   category_id: number;
   category_name?: string | null;
@@ -56,6 +169,34 @@ export interface ProductOut {
   updated_at: string;
 }
 
+export interface ProductPageOut {
+  approximate_total: number;
+  items: ProductListOut[];
+  next_cursor?: string | null;
+}
+
+export interface ReadRoutingMetricsOut {
+  max_lag_seconds: number;
+  primary_sessions: number;
+  replica_sessions: number;
+  replicas: ReplicaStatusOut[];
+}
+
+export interface ReadinessOut {
+  connections: number;
+  ready: boolean;
+  warmup_seconds?: number | null;
+}
+
+export interface ReplicaStatusOut {
+  checked_at?: string | null;
+  error?: string | null;
+  host: string;
+  in_rotation: boolean;
+  lag_seconds?: number | null;
+  sessions: number;
+}
+
 export interface User {
   active?: boolean | null;
   display_name?: string | null;
@@ -87,8 +228,13 @@ export interface VersionOut {
   version: string;
 }
 
+export interface GetCategoriesParams {
+  include?: "products"[];
+}
+
 export interface GetCategoryParams {
   category_id: number;
+  include?: "products"[];
 }
 
 export interface CurrentUserParams {
@@ -97,10 +243,34 @@ export interface CurrentUserParams {
 
 export interface GetProductsParams {
   category_id?: number | null;
+  limit?: number;
+  after?: string | null;
+  fields?: string | null;
+}
+
+export interface GetProductFacetsParams {
+  category_id?: number | null;
+}
+
+export interface SearchProductsParams {
+  q: string;
+  category_id?: number | null;
+  limit?: number;
+  after?: string | null;
+}
+
+export interface ImportProductsParams {
+  format?: "csv" | "parquet";
+}
+
+export interface GetProductsBatchParams {
+  ids: number[];
 }
 
 export interface GetProductParams {
   product_id: number;
+  include?: ("category" | "inventory")[];
+  fields?: string | null;
 }
 
 export class ApiError extends Error {
@@ -117,8 +287,12 @@ export class ApiError extends Error {
   }
 }
 
-export const getCategories = async (options?: RequestInit): Promise<{ data: CategoryOut[] }> => {
-  const res = await fetch("/api/categories", { ...options, method: "GET" });
+export const getCategories = async (params?: GetCategoriesParams, options?: RequestInit): Promise<{ data: CategoryWithProductsOut[] }> => {
+  const searchParams = new URLSearchParams();
+  if (params?.include != null) params.include.forEach((v) => searchParams.append("include", String(v)));
+  const queryString = searchParams.toString();
+  const url = queryString ? `/api/categories?${queryString}` : `/api/categories`;
+  const res = await fetch(url, { ...options, method: "GET" });
   if (!res.ok) {
     const body = await res.text();
     let parsed: unknown;
@@ -128,20 +302,24 @@ export const getCategories = async (options?: RequestInit): Promise<{ data: Cate
   return { data: await res.json() };
 };
 
-export const getCategoriesKey = () => {
-  return ["/api/categories"] as const;
+export const getCategoriesKey = (params?: GetCategoriesParams) => {
+  return ["/api/categories", params] as const;
 };
 
-export function useGetCategories<TData = { data: CategoryOut[] }>(options?: { query?: Omit<UseQueryOptions<{ data: CategoryOut[] }, ApiError, TData>, "queryKey" | "queryFn"> }) {
-  return useQuery({ queryKey: getCategoriesKey(), queryFn: () => getCategories(), ...options?.query });
+export function useGetCategories<TData = { data: CategoryWithProductsOut[] }>(options?: { params?: GetCategoriesParams; query?: Omit<UseQueryOptions<{ data: CategoryWithProductsOut[] }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useQuery({ queryKey: getCategoriesKey(options?.params), queryFn: () => getCategories(options?.params), ...options?.query });
 }
 
-export function useGetCategoriesSuspense<TData = { data: CategoryOut[] }>(options?: { query?: Omit<UseSuspenseQueryOptions<{ data: CategoryOut[] }, ApiError, TData>, "queryKey" | "queryFn"> }) {
-  return useSuspenseQuery({ queryKey: getCategoriesKey(), queryFn: () => getCategories(), ...options?.query });
+export function useGetCategoriesSuspense<TData = { data: CategoryWithProductsOut[] }>(options?: { params?: GetCategoriesParams; query?: Omit<UseSuspenseQueryOptions<{ data: CategoryWithProductsOut[] }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useSuspenseQuery({ queryKey: getCategoriesKey(options?.params), queryFn: () => getCategories(options?.params), ...options?.query });
 }
 
-export const getCategory = async (params: GetCategoryParams, options?: RequestInit): Promise<{ data: CategoryOut }> => {
-  const res = await fetch(`/api/categories/${params.category_id}`, { ...options, method: "GET" });
+export const getCategory = async (params: GetCategoryParams, options?: RequestInit): Promise<{ data: CategoryWithProductsOut }> => {
+  const searchParams = new URLSearchParams();
+  if (params?.include != null) params.include.forEach((v) => searchParams.append("include", String(v)));
+  const queryString = searchParams.toString();
+  const url = queryString ? `/api/categories/${params.category_id}?${queryString}` : `/api/categories/${params.category_id}`;
+  const res = await fetch(url, { ...options, method: "GET" });
   if (!res.ok) {
     const body = await res.text();
     let parsed: unknown;
@@ -155,14 +333,29 @@ export const getCategoryKey = (params?: GetCategoryParams) => {
   return ["/api/categories/{category_id}", params] as const;
 };
 
-export function useGetCategory<TData = { data: CategoryOut }>(options: { params: GetCategoryParams; query?: Omit<UseQueryOptions<{ data: CategoryOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+export function useGetCategory<TData = { data: CategoryWithProductsOut }>(options: { params: GetCategoryParams; query?: Omit<UseQueryOptions<{ data: CategoryWithProductsOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
   return useQuery({ queryKey: getCategoryKey(options.params), queryFn: () => getCategory(options.params), ...options?.query });
 }
 
-export function useGetCategorySuspense<TData = { data: CategoryOut }>(options: { params: GetCategoryParams; query?: Omit<UseSuspenseQueryOptions<{ data: CategoryOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+export function useGetCategorySuspense<TData = { data: CategoryWithProductsOut }>(options: { params: GetCategoryParams; query?: Omit<UseSuspenseQueryOptions<{ data: CategoryWithProductsOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
   return useSuspenseQuery({ queryKey: getCategoryKey(options.params), queryFn: () => getCategory(options.params), ...options?.query });
 }
 
+export const checkout = async (data: CheckoutIn, options?: RequestInit): Promise<{ data: OrderOut }> => {
+  const res = await fetch("/api/checkout", { ...options, method: "POST", headers: { "Content-Type": "application/json", ...options?.headers }, body: JSON.stringify(data) });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export function useCheckout(options?: { mutation?: Omit<UseMutationOptions<{ data: OrderOut }, ApiError, CheckoutIn>, "mutationFn"> }) {
+  return useMutation({ mutationFn: (data: CheckoutIn) => checkout(data), ...options?.mutation });
+}
+
 export const currentUser = async (params?: CurrentUserParams, options?: RequestInit): Promise<{ data: User }> => {
   const res = await fetch("/api/current-user", { ...options, method: "GET", headers: { ...(params?.["X-Forwarded-Access-Token"] != null && { "X-Forwarded-Access-Token": params["X-Forwarded-Access-Token"] }), ...options?.headers } });
   if (!res.ok) {
@@ -186,9 +379,96 @@ export function useCurrentUserSuspense<TData = { data: User }>(options?: { param
   return useSuspenseQuery({ queryKey: currentUserKey(options?.params), queryFn: () => currentUser(options?.params), ...options?.query });
 }
 
-export const getProducts = async (params?: GetProductsParams, options?: RequestInit): Promise<{ data: ProductListOut[] }> => {
+export const ingestInventoryDeltas = async (data: InventoryDeltasIn, options?: RequestInit): Promise<{ data: InventoryDeltasAcceptedOut }> => {
+  const res = await fetch("/api/inventory/deltas", { ...options, method: "POST", headers: { "Content-Type": "application/json", ...options?.headers }, body: JSON.stringify(data) });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export function useIngestInventoryDeltas(options?: { mutation?: Omit<UseMutationOptions<{ data: InventoryDeltasAcceptedOut }, ApiError, InventoryDeltasIn>, "mutationFn"> }) {
+  return useMutation({ mutationFn: (data: InventoryDeltasIn) => ingestInventoryDeltas(data), ...options?.mutation });
+}
+
+export const inventoryIngestMetrics = async (options?: RequestInit): Promise<{ data: InventoryIngestMetricsOut }> => {
+  const res = await fetch("/api/metrics/inventory-ingest", { ...options, method: "GET" });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export const inventoryIngestMetricsKey = () => {
+  return ["/api/metrics/inventory-ingest"] as const;
+};
+
+export function useInventoryIngestMetrics<TData = { data: InventoryIngestMetricsOut }>(options?: { query?: Omit<UseQueryOptions<{ data: InventoryIngestMetricsOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useQuery({ queryKey: inventoryIngestMetricsKey(), queryFn: () => inventoryIngestMetrics(), ...options?.query });
+}
+
+export function useInventoryIngestMetricsSuspense<TData = { data: InventoryIngestMetricsOut }>(options?: { query?: Omit<UseSuspenseQueryOptions<{ data: InventoryIngestMetricsOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useSuspenseQuery({ queryKey: inventoryIngestMetricsKey(), queryFn: () => inventoryIngestMetrics(), ...options?.query });
+}
+
+export const poolMetrics = async (options?: RequestInit): Promise<{ data: PoolMetricsOut[] }> => {
+  const res = await fetch("/api/metrics/pools", { ...options, method: "GET" });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export const poolMetricsKey = () => {
+  return ["/api/metrics/pools"] as const;
+};
+
+export function usePoolMetrics<TData = { data: PoolMetricsOut[] }>(options?: { query?: Omit<UseQueryOptions<{ data: PoolMetricsOut[] }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useQuery({ queryKey: poolMetricsKey(), queryFn: () => poolMetrics(), ...options?.query });
+}
+
+export function usePoolMetricsSuspense<TData = { data: PoolMetricsOut[] }>(options?: { query?: Omit<UseSuspenseQueryOptions<{ data: PoolMetricsOut[] }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useSuspenseQuery({ queryKey: poolMetricsKey(), queryFn: () => poolMetrics(), ...options?.query });
+}
+
+export const readRoutingMetrics = async (options?: RequestInit): Promise<{ data: ReadRoutingMetricsOut }> => {
+  const res = await fetch("/api/metrics/read-routing", { ...options, method: "GET" });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export const readRoutingMetricsKey = () => {
+  return ["/api/metrics/read-routing"] as const;
+};
+
+export function useReadRoutingMetrics<TData = { data: ReadRoutingMetricsOut }>(options?: { query?: Omit<UseQueryOptions<{ data: ReadRoutingMetricsOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useQuery({ queryKey: readRoutingMetricsKey(), queryFn: () => readRoutingMetrics(), ...options?.query });
+}
+
+export function useReadRoutingMetricsSuspense<TData = { data: ReadRoutingMetricsOut }>(options?: { query?: Omit<UseSuspenseQueryOptions<{ data: ReadRoutingMetricsOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useSuspenseQuery({ queryKey: readRoutingMetricsKey(), queryFn: () => readRoutingMetrics(), ...options?.query });
+}
+
+export const getProducts = async (params?: GetProductsParams, options?: RequestInit): Promise<{ data: ProductPageOut }> => {
   const searchParams = new URLSearchParams();
   if (params?.category_id != null) searchParams.set("category_id", String(params?.category_id));
+  if (params?.limit != null) searchParams.set("limit", String(params?.limit));
+  if (params?.after != null) searchParams.set("after", String(params?.after));
+  if (params?.fields != null) searchParams.set("fields", String(params?.fields));
   const queryString = searchParams.toString();
   const url = queryString ? `/api/products?${queryString}` : `/api/products`;
   const res = await fetch(url, { ...options, method: "GET" });
@@ -205,16 +485,132 @@ export const getProductsKey = (params?: GetProductsParams) => {
   return ["/api/products", params] as const;
 };
 
-export function useGetProducts<TData = { data: ProductListOut[] }>(options?: { params?: GetProductsParams; query?: Omit<UseQueryOptions<{ data: ProductListOut[] }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+export function useGetProducts<TData = { data: ProductPageOut }>(options?: { params?: GetProductsParams; query?: Omit<UseQueryOptions<{ data: ProductPageOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
   return useQuery({ queryKey: getProductsKey(options?.params), queryFn: () => getProducts(options?.params), ...options?.query });
 }
 
-export function useGetProductsSuspense<TData = { data: ProductListOut[] }>(options?: { params?: GetProductsParams; query?: Omit<UseSuspenseQueryOptions<{ data: ProductListOut[] }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+export function useGetProductsSuspense<TData = { data: ProductPageOut }>(options?: { params?: GetProductsParams; query?: Omit<UseSuspenseQueryOptions<{ data: ProductPageOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
   return useSuspenseQuery({ queryKey: getProductsKey(options?.params), queryFn: () => getProducts(options?.params), ...options?.query });
 }
 
+export const getProductsInfiniteKey = (params?: Omit<GetProductsParams, "after">) => {
+  return ["/api/products", "infinite", params] as const;
+};
+
+export function useGetProductsInfiniteSuspense<TData = InfiniteData<{ data: ProductPageOut }, string | null>>(options?: { params?: Omit<GetProductsParams, "after">; query?: Omit<UseSuspenseInfiniteQueryOptions<{ data: ProductPageOut }, ApiError, TData, ReturnType<typeof getProductsInfiniteKey>, string | null>, "queryKey" | "queryFn" | "initialPageParam" | "getNextPageParam"> }) {
+  return useSuspenseInfiniteQuery({ queryKey: getProductsInfiniteKey(options?.params), queryFn: ({ pageParam }) => getProducts({ ...options?.params, after: pageParam ?? undefined }), initialPageParam: null as string | null, getNextPageParam: (lastPage) => lastPage.data.next_cursor ?? null, ...options?.query });
+}
+
+export const getProductFacets = async (params?: GetProductFacetsParams, options?: RequestInit): Promise<{ data: ProductFacetsOut }> => {
+  const searchParams = new URLSearchParams();
+  if (params?.category_id != null) searchParams.set("category_id", String(params?.category_id));
+  const queryString = searchParams.toString();
+  const url = queryString ? `/api/products/facets?${queryString}` : `/api/products/facets`;
+  const res = await fetch(url, { ...options, method: "GET" });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export const getProductFacetsKey = (params?: GetProductFacetsParams) => {
+  return ["/api/products/facets", params] as const;
+};
+
+export function useGetProductFacets<TData = { data: ProductFacetsOut }>(options?: { params?: GetProductFacetsParams; query?: Omit<UseQueryOptions<{ data: ProductFacetsOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useQuery({ queryKey: getProductFacetsKey(options?.params), queryFn: () => getProductFacets(options?.params), ...options?.query });
+}
+
+export function useGetProductFacetsSuspense<TData = { data: ProductFacetsOut }>(options?: { params?: GetProductFacetsParams; query?: Omit<UseSuspenseQueryOptions<{ data: ProductFacetsOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useSuspenseQuery({ queryKey: getProductFacetsKey(options?.params), queryFn: () => getProductFacets(options?.params), ...options?.query });
+}
+
+export const searchProducts = async (params: SearchProductsParams, options?: RequestInit): Promise<{ data: ProductPageOut }> => {
+  const searchParams = new URLSearchParams();
+  if (params?.q != null) searchParams.set("q", String(params?.q));
+  if (params?.category_id != null) searchParams.set("category_id", String(params?.category_id));
+  if (params?.limit != null) searchParams.set("limit", String(params?.limit));
+  if (params?.after != null) searchParams.set("after", String(params?.after));
+  const queryString = searchParams.toString();
+  const url = queryString ? `/api/products/search?${queryString}` : `/api/products/search`;
+  const res = await fetch(url, { ...options, method: "GET" });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export const searchProductsKey = (params?: SearchProductsParams) => {
+  return ["/api/products/search", params] as const;
+};
+
+export function useSearchProducts<TData = { data: ProductPageOut }>(options: { params: SearchProductsParams; query?: Omit<UseQueryOptions<{ data: ProductPageOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useQuery({ queryKey: searchProductsKey(options.params), queryFn: () => searchProducts(options.params), ...options?.query });
+}
+
+export function useSearchProductsSuspense<TData = { data: ProductPageOut }>(options: { params: SearchProductsParams; query?: Omit<UseSuspenseQueryOptions<{ data: ProductPageOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useSuspenseQuery({ queryKey: searchProductsKey(options.params), queryFn: () => searchProducts(options.params), ...options?.query });
+}
+
+export const importProducts = async (data: Blob, params?: ImportProductsParams, options?: RequestInit): Promise<{ data: CatalogImportOut }> => {
+  const searchParams = new URLSearchParams();
+  if (params?.format != null) searchParams.set("format", String(params?.format));
+  const queryString = searchParams.toString();
+  const url = queryString ? `/api/products/import?${queryString}` : `/api/products/import`;
+  const res = await fetch(url, { ...options, method: "POST", body: data });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export function useImportProducts(options?: { mutation?: Omit<UseMutationOptions<{ data: CatalogImportOut }, ApiError, { data: Blob; params?: ImportProductsParams }>, "mutationFn"> }) {
+  return useMutation({ mutationFn: (vars: { data: Blob; params?: ImportProductsParams }) => importProducts(vars.data, vars.params), ...options?.mutation });
+}
+
+export const getProductsBatch = async (params: GetProductsBatchParams, options?: RequestInit): Promise<{ data: ProductBatchOut }> => {
+  const searchParams = new URLSearchParams();
+  if (params?.ids != null) params.ids.forEach((v) => searchParams.append("ids", String(v)));
+  const queryString = searchParams.toString();
+  const url = queryString ? `/api/products:batch?${queryString}` : `/api/products:batch`;
+  const res = await fetch(url, { ...options, method: "GET" });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export const getProductsBatchKey = (params?: GetProductsBatchParams) => {
+  return ["/api/products:batch", params] as const;
+};
+
+export function useGetProductsBatch<TData = { data: ProductBatchOut }>(options: { params: GetProductsBatchParams; query?: Omit<UseQueryOptions<{ data: ProductBatchOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useQuery({ queryKey: getProductsBatchKey(options.params), queryFn: () => getProductsBatch(options.params), ...options?.query });
+}
+
+export function useGetProductsBatchSuspense<TData = { data: ProductBatchOut }>(options: { params: GetProductsBatchParams; query?: Omit<UseSuspenseQueryOptions<{ data: ProductBatchOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useSuspenseQuery({ queryKey: getProductsBatchKey(options.params), queryFn: () => getProductsBatch(options.params), ...options?.query });
+}
+
 export const getProduct = async (params: GetProductParams, options?: RequestInit): Promise<{ data: ProductOut }> => {
-  const res = await fetch(`/api/products/${params.product_id}`, { ...options, method: "GET" });
+  const searchParams = new URLSearchParams();
+  if (params?.include != null) params.include.forEach((v) => searchParams.append("include", String(v)));
+  if (params?.fields != null) searchParams.set("fields", String(params?.fields));
+  const queryString = searchParams.toString();
+  const url = queryString ? `/api/products/${params.product_id}?${queryString}` : `/api/products/${params.product_id}`;
+  const res = await fetch(url, { ...options, method: "GET" });
   if (!res.ok) {
     const body = await res.text();
     let parsed: unknown;
@@ -236,6 +632,29 @@ export function useGetProductSuspense<TData = { data: ProductOut }>(options: { p
   return useSuspenseQuery({ queryKey: getProductKey(options.params), queryFn: () => getProduct(options.params), ...options?.query });
 }
 
+export const ready = async (options?: RequestInit): Promise<{ data: ReadinessOut }> => {
+  const res = await fetch("/api/ready", { ...options, method: "GET" });
+  if (!res.ok) {
+    const body = await res.text();
+    let parsed: unknown;
+    try { parsed = JSON.parse(body); } catch { parsed = body; }
+    throw new ApiError(res.status, res.statusText, parsed);
+  }
+  return { data: await res.json() };
+};
+
+export const readyKey = () => {
+  return ["/api/ready"] as const;
+};
+
+export function useReady<TData = { data: ReadinessOut }>(options?: { query?: Omit<UseQueryOptions<{ data: ReadinessOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useQuery({ queryKey: readyKey(), queryFn: () => ready(), ...options?.query });
+}
+
+export function useReadySuspense<TData = { data: ReadinessOut }>(options?: { query?: Omit<UseSuspenseQueryOptions<{ data: ReadinessOut }, ApiError, TData>, "queryKey" | "queryFn"> }) {
+  return useSuspenseQuery({ queryKey: readyKey(), queryFn: () => ready(), ...options?.query });
+}
+
 export const version = async (options?: RequestInit): Promise<{ data: VersionOut }> => {
   const res = await fetch("/api/version", { ...options, method: "GET" });
   if (!res.ok) {
@@ -9,11 +9,9 @@ export const Route = createFileRoute("/")({
 });
 
 function FeaturedProducts() {
-  const { data } = useGetProductsSuspense();
-  const products: ProductListOut[] = data.data;
-
   // Show first 6 products as featured
-  const featuredProducts = products.slice(0, 6);
+  const { data } = useGetProductsSuspense({ params: { limit: 6 } });
+  const featuredProducts: ProductListOut[] = data.data.items;
 
   return (
     <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-6">
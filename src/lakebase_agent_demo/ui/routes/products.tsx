@@ -1,8 +1,9 @@
 import { createFileRoute, useNavigate } from "@tanstack/react-router";
 import { Suspense, useState, useEffect } from "react";
 import {
-  useGetProductsSuspense,
+  useGetProductsInfiniteSuspense,
   useGetCategoriesSuspense,
+  useGetProductFacets,
   type ProductListOut,
   type CategoryOut,
 } from "@/lib/api";
@@ -11,6 +12,7 @@ import {
   ProductCardSkeleton,
   CategoryFilter,
 } from "@/components/store";
+import { Button } from "@/components/ui/button";
 import { Skeleton } from "@/components/ui/skeleton";
 
 interface ProductsSearch {
@@ -39,13 +41,34 @@ function CategoriesAndProducts({
   const { data: categoriesData } = useGetCategoriesSuspense();
   const categories: CategoryOut[] = categoriesData.data;
 
-  const { data: productsData } = useGetProductsSuspense({
+  // Keyset-paginated: each "Load more" follows the last page's next_cursor
+  const {
+    data: productsData,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useGetProductsInfiniteSuspense({
     params:
       selectedCategoryId !== null
         ? { category_id: selectedCategoryId }
         : undefined,
   });
-  const products: ProductListOut[] = productsData.data;
+  const products: ProductListOut[] = productsData.pages.flatMap(
+    (page) => page.data.items
+  );
+
+  // Counts are a nice-to-have, so don't suspend the page on them
+  const { data: facetsData } = useGetProductFacets({
+    params:
+      selectedCategoryId !== null
+        ? { category_id: selectedCategoryId }
+        : undefined,
+  });
+  const facets = facetsData?.data;
+  const categoryCounts = facets
+    ? Object.fromEntries(facets.categories.map((c) => [c.id, c.count]))
+    : undefined;
+  const productCount = facets?.total ?? products.length;
 
   // Sync URL with selected category
   useEffect(() => {
@@ -67,9 +90,13 @@ function CategoriesAndProducts({
           categories={categories}
           selectedCategoryId={selectedCategoryId}
           onSelectCategory={setSelectedCategoryId}
+          counts={categoryCounts}
         />
         <p className="text-stone-400 text-sm">
-          {products.length} product{products.length !== 1 ? "s" : ""} found
+          {productCount} product{productCount !== 1 ? "s" : ""} found
+          {facets && facets.out_of_stock > 0 && (
+            <> &middot; {facets.in_stock} in stock</>
+          )}
         </p>
       </div>
 
@@ -96,6 +123,19 @@ function CategoriesAndProducts({
           </p>
         </div>
       )}
+
+      {hasNextPage && (
+        <div className="flex justify-center">
+          <Button
+            variant="outline"
+            className="border-amber-700/50 text-amber-200 hover:bg-amber-900/30"
+            disabled={isFetchingNextPage}
+            onClick={() => fetchNextPage()}
+          >
+            {isFetchingNextPage ? "Loading…" : "Load more"}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }